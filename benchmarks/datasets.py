@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Datasets sintéticos para benchmarks
+                                 A QGIS plugin
+ Generador reproducible (con semilla) de CSV, XLSX y capas de parcelas
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import csv
+import math
+import os
+import random
+
+# Origen de las parcelas sintéticas (UTM 18S, zona de Lima)
+ORIGIN_E = 280000.0
+ORIGIN_N = 8660000.0
+CRS_AUTHID = 'EPSG:32718'
+
+
+def parcel_ring(rng, center_e, center_n, num_vertices, radius):
+    """
+    Genera un anillo de parcela irregular pero simple (en estrella desde su centro)
+
+    :param rng: Generador aleatorio con semilla
+    :type rng: random.Random
+
+    :param num_vertices: Número de vértices del anillo (sin cierre)
+    :type num_vertices: int
+
+    :param radius: Radio medio de la parcela en metros
+    :type radius: float
+
+    :returns: Lista de (este, norte)
+    :rtype: list of tuple
+    """
+    angles = sorted(rng.uniform(0, 2 * math.pi) for _ in range(num_vertices))
+    ring = []
+    for angle in angles:
+        r = radius * rng.uniform(0.7, 1.0)
+        ring.append((center_e + r * math.sin(angle), center_n + r * math.cos(angle)))
+    return ring
+
+
+def write_parcel_csv(path, num_vertices, seed=42):
+    """
+    Escribe un CSV de una parcela con num_vertices puntos (columnas PUNTO, ESTE, NORTE)
+
+    :returns: Ruta del archivo
+    :rtype: str
+    """
+    rng = random.Random(seed)
+    # El radio crece con los vértices para que los lados no queden degenerados
+    radius = max(50.0, math.sqrt(num_vertices) * 10.0)
+    ring = parcel_ring(rng, ORIGIN_E, ORIGIN_N, num_vertices, radius)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['PUNTO', 'ESTE', 'NORTE'])
+        for i, (e, n) in enumerate(ring, start=1):
+            writer.writerow([f'P{i}', f'{e:.4f}', f'{n:.4f}'])
+    return path
+
+
+def write_parcel_xlsx(path, num_rows, seed=42):
+    """
+    Escribe un libro XLSX con num_rows puntos de parcela (requiere pandas y openpyxl)
+
+    :returns: Ruta del archivo
+    :rtype: str
+    """
+    import pandas as pd
+
+    rng = random.Random(seed)
+    radius = max(50.0, math.sqrt(num_rows) * 10.0)
+    ring = parcel_ring(rng, ORIGIN_E, ORIGIN_N, num_rows, radius)
+    df = pd.DataFrame({
+        'PUNTO': [f'P{i}' for i in range(1, num_rows + 1)],
+        'ESTE': [round(e, 4) for e, _ in ring],
+        'NORTE': [round(n, 4) for _, n in ring]
+    })
+    df.to_excel(path, index=False)
+    return path
+
+
+def build_parcel_layer(num_parcels, vertices_per_parcel=40, seed=42, name='Parcelas'):
+    """
+    Crea una capa de polígonos en memoria con parcelas en cuadrícula (requiere QGIS iniciado)
+
+    :returns: Capa de polígonos
+    :rtype: QgsVectorLayer
+    """
+    from qgis.core import QgsVectorLayer, QgsFeature, QgsGeometry, QgsPointXY, QgsField
+    from PyQt5.QtCore import QVariant
+
+    rng = random.Random(seed)
+    layer = QgsVectorLayer(f'Polygon?crs={CRS_AUTHID}', name, 'memory')
+    provider = layer.dataProvider()
+    provider.addAttributes([QgsField('ID', QVariant.Int)])
+    layer.updateFields()
+
+    columns = max(1, int(math.ceil(math.sqrt(num_parcels))))
+    spacing = 120.0
+    features = []
+    for i in range(num_parcels):
+        row, col = divmod(i, columns)
+        ring = parcel_ring(
+            rng, ORIGIN_E + col * spacing, ORIGIN_N + row * spacing, vertices_per_parcel, 50.0
+        )
+        feature = QgsFeature(layer.fields())
+        feature.setGeometry(QgsGeometry.fromPolygonXY([[QgsPointXY(e, n) for e, n in ring]]))
+        feature.setAttributes([i + 1])
+        features.append(feature)
+    provider.addFeatures(features)
+    layer.updateExtents()
+    return layer
+
+
+def build_vertex_table_layer(num_features, seed=42):
+    """
+    Crea una capa de puntos con la estructura de la tabla "Vertices" (requiere QGIS iniciado)
+
+    :returns: Capa de puntos
+    :rtype: QgsVectorLayer
+    """
+    from qgis.core import QgsVectorLayer, QgsFeature, QgsGeometry, QgsPointXY, QgsField
+    from PyQt5.QtCore import QVariant
+
+    rng = random.Random(seed)
+    layer = QgsVectorLayer(f'Point?crs={CRS_AUTHID}', 'Vertices', 'memory')
+    provider = layer.dataProvider()
+    provider.addAttributes([
+        QgsField('ID_Poligono', QVariant.Int),
+        QgsField('ID_Vertice', QVariant.Int),
+        QgsField('LADO', QVariant.String),
+        QgsField('Este', QVariant.Double),
+        QgsField('Norte', QVariant.Double),
+        QgsField('Distancia', QVariant.Double),
+        QgsField('Azimut', QVariant.Double)
+    ])
+    layer.updateFields()
+
+    features = []
+    for i in range(num_features):
+        parcel, vertex = divmod(i, 40)
+        e = ORIGIN_E + rng.uniform(0, 10000)
+        n = ORIGIN_N + rng.uniform(0, 10000)
+        feature = QgsFeature(layer.fields())
+        feature.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(e, n)))
+        feature.setAttributes([
+            parcel + 1, vertex + 1, f'V{vertex + 1} a V{vertex + 2}',
+            round(e, 6), round(n, 6), round(rng.uniform(1, 100), 4), round(rng.uniform(0, 360), 1)
+        ])
+        features.append(feature)
+    provider.addFeatures(features)
+    layer.updateExtents()
+    return layer
+
+
+def write_layer_gpkg(layer, path):
+    """
+    Guarda una capa en un GeoPackage para reutilizarla entre casos (requiere QGIS iniciado)
+
+    :returns: Ruta del GeoPackage
+    :rtype: str
+    """
+    from qgis.core import QgsVectorFileWriter, QgsProject
+
+    options = QgsVectorFileWriter.SaveVectorOptions()
+    options.driverName = 'GPKG'
+    options.layerName = layer.name()
+    error, message, _, _ = QgsVectorFileWriter.writeAsVectorFormatV3(
+        layer, path, QgsProject.instance().transformContext(), options
+    )
+    if error != QgsVectorFileWriter.NoError:
+        raise RuntimeError(f"No se pudo guardar {path}: {message}")
+    return path
+
+
+def load_memory_layer(path, name):
+    """
+    Copia a memoria la capa de un GeoPackage generado con write_layer_gpkg
+    (las herramientas se miden sobre capas en memoria, como al generarlas)
+
+    :rtype: QgsVectorLayer
+    """
+    from qgis.core import QgsVectorLayer, QgsFeatureRequest
+
+    source = QgsVectorLayer(path, name, 'ogr')
+    if not source.isValid():
+        raise RuntimeError(f"No se pudo abrir {path}")
+    layer = source.materialize(QgsFeatureRequest())
+    layer.setName(name)
+    return layer
+
+
+def dataset_path(data_dir, name):
+    """Ruta de un archivo de datos, creando el directorio si hace falta."""
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, name)
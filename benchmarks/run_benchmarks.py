@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Benchmarks de YF Tools Plus
+                                 A QGIS plugin
+ Ejecuta cada herramienta sin interfaz sobre datos sintéticos
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+
+Uso (con el Python de QGIS):
+
+    python benchmarks/run_benchmarks.py run --profile small --output resultados.json
+    python benchmarks/run_benchmarks.py compare base.json resultados.json --threshold 0.15
+
+Cada caso se ejecuta en un subproceso propio con QGIS en modo offscreen, de
+modo que el pico de memoria (RSS) medido corresponde solo a ese caso. Los
+datos se generan antes en otro subproceso: el pico es un máximo histórico del
+proceso y, si la generación ocurriera en el del caso, se mezclaría con el de
+la herramienta (y cambiaría según los datos ya estuvieran o no en disco).
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PLUGIN_DIR = os.path.dirname(BENCH_DIR)
+
+# Tamaños por herramienta: filas/vértices para las herramientas de archivos,
+# parcelas (de 40 vértices) para el segmentador
+PROFILES = {
+    'small': {
+        'excel_to_csv': [10, 1000],
+        'polygon_creator': [10, 1000],
+        'segmentator': [1, 100],
+        'excel_exporter': [10, 1000]
+    },
+    'medium': {
+        'excel_to_csv': [10, 1000, 100000],
+        'polygon_creator': [10, 1000, 100000],
+        'segmentator': [1, 100, 5000],
+        'excel_exporter': [10, 1000, 100000]
+    },
+    'full': {
+        'excel_to_csv': [10, 1000, 100000, 1000000],
+        'polygon_creator': [10, 1000, 100000, 1000000],
+        'segmentator': [1, 100, 5000, 50000],
+        'excel_exporter': [10, 1000, 100000, 1000000]
+    }
+}
+
+VERTICES_PER_PARCEL = 40
+
+
+def peak_rss_mb():
+    """Pico de memoria residente del proceso en MB (None si no se puede medir)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa en KB, macOS en bytes
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+        except (ImportError, AttributeError):
+            return None
+
+
+def start_qgis():
+    """Inicia una aplicación QGIS sin interfaz gráfica."""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from qgis.core import QgsApplication
+    app = QgsApplication([], False)
+    app.initQgis()
+    return app
+
+
+# Archivo de datos de cada herramienta
+DATA_FILES = {
+    'excel_to_csv': 'parcela_{size}_{seed}.xlsx',
+    'polygon_creator': 'parcela_{size}_{seed}.csv',
+    'segmentator': 'parcelas_{size}_{seed}.gpkg',
+    'excel_exporter': 'vertices_{size}_{seed}.gpkg'
+}
+
+
+def data_file(tool, size, data_dir, seed):
+    """Ruta del archivo de datos de un caso."""
+    if tool not in DATA_FILES:
+        raise ValueError(f"Herramienta desconocida: {tool}")
+    return os.path.join(data_dir, DATA_FILES[tool].format(size=size, seed=seed))
+
+
+def generate_data(tool, size, data_dir, seed):
+    """Genera el archivo de datos de un caso si aún no existe (subproceso 'data')."""
+    import datasets
+
+    path = data_file(tool, size, data_dir, seed)
+    if os.path.exists(path):
+        return path
+    os.makedirs(data_dir, exist_ok=True)
+    if tool == 'excel_to_csv':
+        return datasets.write_parcel_xlsx(path, size, seed)
+    if tool == 'polygon_creator':
+        return datasets.write_parcel_csv(path, size, seed)
+
+    app = start_qgis()
+    try:
+        if tool == 'segmentator':
+            layer = datasets.build_parcel_layer(size, VERTICES_PER_PARCEL, seed)
+        else:
+            layer = datasets.build_vertex_table_layer(size, seed)
+        return datasets.write_layer_gpkg(layer, path)
+    finally:
+        app.exitQgis()
+
+
+def ensure_data(tool, size, data_dir, seed):
+    """
+    Deja listo el archivo de datos de un caso, generándolo en un subproceso
+    para que no cuente en el pico de memoria del caso
+    """
+    path = data_file(tool, size, data_dir, seed)
+    if not os.path.exists(path):
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), 'data', tool, str(size),
+             '--data-dir', data_dir, '--seed', str(seed)],
+            check=True
+        )
+    return path
+
+
+def prepare_case(tool, size, data_dir, seed):
+    """
+    Carga los datos (ya generados por ensure_data) y devuelve una función sin
+    argumentos que ejecuta la herramienta, junto con el número de elementos
+    procesados
+    """
+    import datasets
+
+    path = data_file(tool, size, data_dir, seed)
+
+    if tool == 'excel_to_csv':
+        from modules.excel_to_csv import ExcelToCsv
+        output = os.path.join(data_dir, f'salida_{size}.csv')
+        return lambda: ExcelToCsv().convert(path, output), size
+
+    if tool == 'polygon_creator':
+        from modules.polygon_creator import PolygonCreator
+        return (
+            lambda: PolygonCreator().create_polygon(path, 'ESTE', 'NORTE', datasets.CRS_AUTHID),
+            size
+        )
+
+    if tool == 'segmentator':
+        from modules.segmentator import Segmentator
+        layer = datasets.load_memory_layer(path, 'Parcelas')
+        # Sin poblado progresivo: se mide la segmentación, no los redibujados
+        options = {'poblado_progresivo': False}
+        return lambda: Segmentator().segment_polygon(layer, options), size * VERTICES_PER_PARCEL
+
+    if tool == 'excel_exporter':
+        from modules.excel_exporter import ExcelExporter
+        layer = datasets.load_memory_layer(path, 'Vertices')
+        output = os.path.join(data_dir, f'vertices_{size}.xlsx')
+        return lambda: ExcelExporter().export_to_excel(layer, output, open_file=False), size
+
+    raise ValueError(f"Herramienta desconocida: {tool}")
+
+
+def run_case(tool, size, data_dir, seed):
+    """Ejecuta un caso en el proceso actual y devuelve su resultado."""
+    sys.path.insert(0, PLUGIN_DIR)
+    sys.path.insert(0, BENCH_DIR)
+    ensure_data(tool, size, data_dir, seed)
+    app = start_qgis()
+
+    action, items = prepare_case(tool, size, data_dir, seed)
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    result = action()
+    wall = time.perf_counter() - start
+    rss_peak = peak_rss_mb()
+
+    # Algunas herramientas devuelven False/None en lugar de lanzar excepciones
+    ok = result is not False and not (tool == 'polygon_creator' and result is None)
+    app.exitQgis()
+    return {
+        'tool': tool,
+        'size': size,
+        'items': items,
+        'ok': ok,
+        'wall_s': round(wall, 4),
+        'features_per_s': round(items / wall, 1) if wall > 0 else None,
+        'rss_before_mb': round(rss_before, 1) if rss_before is not None else None,
+        'peak_rss_mb': round(rss_peak, 1) if rss_peak is not None else None
+    }
+
+
+def run_suite(profile, tools, data_dir, seed, output):
+    """Ejecuta todos los casos del perfil, cada uno en su subproceso."""
+    results = []
+    for tool, sizes in PROFILES[profile].items():
+        if tools and tool not in tools:
+            continue
+        for size in sizes:
+            print(f"{tool} [{size}] ...", end=' ', flush=True)
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), 'case', tool, str(size),
+                 '--data-dir', data_dir, '--seed', str(seed)],
+                capture_output=True, text=True
+            )
+            if proc.returncode != 0:
+                print("ERROR")
+                results.append({'tool': tool, 'size': size, 'ok': False, 'error': proc.stderr[-2000:]})
+                continue
+            # La última línea de la salida es el resultado en JSON
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(f"{result['wall_s']:.3f} s, {result['peak_rss_mb']} MB")
+            results.append(result)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'profile': profile,
+            'seed': seed,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'qgis': qgis_version()
+        },
+        'results': results
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {output}")
+    return report
+
+
+def qgis_version():
+    """Versión de QGIS disponible, sin iniciar la aplicación."""
+    try:
+        from qgis.core import Qgis
+        return Qgis.QGIS_VERSION
+    except ImportError:
+        return None
+
+
+def compare(base_path, new_path, threshold):
+    """
+    Compara dos archivos de resultados y marca como regresión todo caso cuyo
+    tiempo crezca más que threshold (fracción, p. ej. 0.15 = 15 %)
+
+    :returns: Número de regresiones
+    :rtype: int
+    """
+    with open(base_path, encoding='utf-8') as f:
+        base = {(r['tool'], r['size']): r for r in json.load(f)['results'] if r.get('ok')}
+    with open(new_path, encoding='utf-8') as f:
+        new = {(r['tool'], r['size']): r for r in json.load(f)['results'] if r.get('ok')}
+
+    regressions = 0
+    print(f"{'herramienta':<18}{'tamaño':>10}{'base s':>12}{'nuevo s':>12}{'cambio':>10}{'RSS MB':>16}")
+    for key in sorted(set(base) & set(new)):
+        b, n = base[key], new[key]
+        change = (n['wall_s'] - b['wall_s']) / b['wall_s'] if b['wall_s'] else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  << REGRESIÓN'
+            regressions += 1
+        rss = f"{b.get('peak_rss_mb')} → {n.get('peak_rss_mb')}"
+        print(f"{key[0]:<18}{key[1]:>10}{b['wall_s']:>12.3f}{n['wall_s']:>12.3f}{change:>+10.1%}{rss:>16}{flag}")
+
+    for key in sorted(set(base) ^ set(new)):
+        print(f"{key[0]:<18}{key[1]:>10}  (solo en {'base' if key in base else 'nuevo'})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de YF Tools Plus")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help="Ejecuta la batería de benchmarks")
+    run.add_argument('--profile', choices=sorted(PROFILES), default='small')
+    run.add_argument('--tools', nargs='*', help="Limitar a estas herramientas")
+    run.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'yf_tools_bench'))
+    run.add_argument('--seed', type=int, default=42)
+    run.add_argument('--output', default='bench_results.json')
+
+    case = sub.add_parser('case', help="Ejecuta un único caso (uso interno)")
+    case.add_argument('tool')
+    case.add_argument('size', type=int)
+    case.add_argument('--data-dir', required=True)
+    case.add_argument('--seed', type=int, default=42)
+
+    data = sub.add_parser('data', help="Genera los datos de un caso (uso interno)")
+    data.add_argument('tool')
+    data.add_argument('size', type=int)
+    data.add_argument('--data-dir', required=True)
+    data.add_argument('--seed', type=int, default=42)
+
+    cmp_parser = sub.add_parser('compare', help="Compara dos archivos de resultados")
+    cmp_parser.add_argument('base')
+    cmp_parser.add_argument('new')
+    cmp_parser.add_argument('--threshold', type=float, default=0.15)
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        run_suite(args.profile, args.tools, args.data_dir, args.seed, args.output)
+        return 0
+    if args.command == 'case':
+        print(json.dumps(run_case(args.tool, args.size, args.data_dir, args.seed)))
+        return 0
+    if args.command == 'data':
+        sys.path.insert(0, BENCH_DIR)
+        generate_data(args.tool, args.size, args.data_dir, args.seed)
+        return 0
+    return 1 if compare(args.base, args.new, args.threshold) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ BatchManifest
+                                 A QGIS plugin
+ Manifiesto reanudable de los lotes de entregas (sin dependencias de QGIS)
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class BatchManifest:
+    """Manifiesto JSON de un lote: hash del archivo → estado, salida y tiempos"""
+
+    FILE_NAME = 'yf_manifiesto.json'
+
+    def __init__(self, path):
+        """
+        Constructor. Carga el manifiesto existente si lo hay.
+
+        :param path: Ruta del archivo de manifiesto
+        :type path: str
+        """
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        # Motivo por el que no se pudo leer un manifiesto existente (lo registra quien lo usa)
+        self.load_error = None
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.entries = json.load(f).get('entries', {})
+            except (ValueError, OSError) as e:
+                self.load_error = str(e)
+
+    def is_done(self, digest):
+        """Indica si el archivo ya se procesó bien y su salida sigue existiendo."""
+        entry = self.entries.get(digest)
+        return bool(entry) and entry['status'] == 'ok' and os.path.exists(entry['output'] or '')
+
+    def record(self, digest, result):
+        """
+        Registra el resultado de un archivo y guarda el manifiesto
+
+        :param digest: Hash del archivo de entrada
+        :type digest: str
+
+        :param result: Resultado de DeliveryPipeline.run
+        :type result: dict
+        """
+        profile = result['profile'].to_dict()
+        with self._lock:
+            self.entries[digest] = {
+                'input': result['input'],
+                'status': 'ok' if result['ok'] else 'error',
+                'output': result['output'],
+                'error': result['error'],
+                'finished': datetime.now().isoformat(timespec='seconds'),
+                'total_s': profile['total_s'],
+                'stages': {stage['name']: stage['seconds'] for stage in profile['stages']}
+            }
+            self.save()
+
+    def save(self):
+        """Escribe el manifiesto de forma atómica (un corte no lo deja a medias)."""
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'entries': self.entries}, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.path)
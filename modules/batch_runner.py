@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ BatchRunner
+                                 A QGIS plugin
+ Procesamiento por lotes de carpetas de entregas con manifiesto reanudable
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from qgis.core import (
+    QgsTask, QgsProject, QgsVectorLayer, QgsVectorFileWriter, QgsField,
+    QgsCoordinateTransformContext, QgsMessageLog, Qgis
+)
+from PyQt5.QtCore import QCoreApplication, QVariant
+
+from .delivery_pipeline import DeliveryPipeline
+from .conversion_cache import file_hash
+from .batch_manifest import BatchManifest
+
+
+class BatchTask(QgsTask):
+    """Tarea que procesa una carpeta de entregas con un grupo de hilos de trabajo"""
+
+    # Nombre base del GeoPackage de salida combinada
+    COMBINED_NAME = 'entregas'
+
+    # Capas de la salida combinada, en el orden de result['layers']
+    COMBINED_LAYERS = ('poligonos', 'segmentos', 'vertices')
+
+    def __init__(self, inputs, options=None, workers=4, combined=False, resume=True,
+                 manifest_dir=None, add_layers=True, on_finished=None):
+        """
+        Constructor.
+
+        :param inputs: Archivos de entrada
+        :type inputs: list of str
+
+        :param options: Opciones del flujo (ver DeliveryPipeline.DEFAULT_OPTIONS)
+        :type options: dict
+
+        :param workers: Número de hilos de trabajo
+        :type workers: int
+
+        :param combined: Una salida combinada (GeoPackage + Excel) en lugar de una por archivo
+        :type combined: bool
+
+        :param resume: Saltar los archivos que el manifiesto da por terminados
+        :type resume: bool
+
+        :param manifest_dir: Carpeta del manifiesto y de la salida combinada
+        :type manifest_dir: str
+
+        :param add_layers: Añadir las capas resultantes al proyecto al terminar
+        :type add_layers: bool
+
+        :param on_finished: Función llamada en el hilo principal con (resultados, saltados, cancelado)
+        :type on_finished: callable
+        """
+        super(BatchTask, self).__init__(
+            f"YF Tools Plus - Lote ({len(inputs)} archivo(s))", QgsTask.CanCancel
+        )
+        self.inputs = list(inputs)
+        self.options = options or {}
+        self.workers = max(1, int(workers))
+        self.combined = combined
+        self.resume = resume
+        self.add_layers = add_layers
+        self.on_finished = on_finished
+        self.trace_memory = False
+
+        manifest_dir = manifest_dir or self.options.get('output_dir') or os.path.dirname(self.inputs[0])
+        os.makedirs(manifest_dir, exist_ok=True)
+        self.manifest = BatchManifest(os.path.join(manifest_dir, BatchManifest.FILE_NAME))
+        if self.manifest.load_error:
+            QgsMessageLog.logMessage(
+                f"Manifiesto ilegible, se empieza de cero: {self.manifest.load_error}",
+                "YF Tools Plus",
+                Qgis.Warning
+            )
+        self.combined_path = os.path.join(manifest_dir, f"{self.COMBINED_NAME}.gpkg")
+        self.combined_xlsx = os.path.join(manifest_dir, f"{self.COMBINED_NAME}_vertices.xlsx")
+
+        self.results = []
+        self.skipped = []
+        self._main_thread = QCoreApplication.instance().thread()
+        self._local = threading.local()
+
+    def process(self, input_path):
+        """Procesa un archivo en un hilo de trabajo (un flujo por hilo)."""
+        pipeline = getattr(self._local, 'pipeline', None)
+        if pipeline is None:
+            pipeline = self._local.pipeline = DeliveryPipeline()
+            pipeline.trace_memory = self.trace_memory
+        if self.isCanceled():
+            return None
+
+        options = dict(self.options)
+        if self.combined:
+            # Solo la salida combinada: sin Excel por archivo
+            options['export'] = False
+        result = pipeline.run(input_path, options)
+        for layer in result['layers']:
+            layer.moveToThread(self._main_thread)
+        return result
+
+    def append_combined(self, result):
+        """
+        Añade las capas de una entrega al GeoPackage combinado, con el nombre
+        del archivo en el campo ARCHIVO. Solo lo llama el hilo de la tarea.
+        """
+        stem = os.path.splitext(os.path.basename(result['input']))[0]
+        for layer, name in zip(result['layers'], self.COMBINED_LAYERS):
+            provider = layer.dataProvider()
+            provider.addAttributes([QgsField("ARCHIVO", QVariant.String)])
+            layer.updateFields()
+            index = layer.fields().indexOf("ARCHIVO")
+            provider.changeAttributeValues({fid: {index: stem} for fid in layer.allFeatureIds()})
+
+            options = QgsVectorFileWriter.SaveVectorOptions()
+            options.driverName = "GPKG"
+            options.layerName = name
+            if not os.path.exists(self.combined_path):
+                options.actionOnExistingFile = QgsVectorFileWriter.CreateOrOverwriteFile
+            elif QgsVectorLayer(f"{self.combined_path}|layername={name}", name, "ogr").isValid():
+                options.actionOnExistingFile = QgsVectorFileWriter.AppendToLayerNoNewFields
+            else:
+                options.actionOnExistingFile = QgsVectorFileWriter.CreateOrOverwriteLayer
+            error = QgsVectorFileWriter.writeAsVectorFormatV3(
+                layer, self.combined_path, QgsCoordinateTransformContext(), options
+            )
+            if error[0] != QgsVectorFileWriter.NoError:
+                raise Exception(f"Error al escribir {name} en {self.combined_path}: {error[1]}")
+        result['output'] = self.combined_path
+
+    def run(self):
+        if self.combined and not self.resume and os.path.exists(self.combined_path):
+            # Sin reanudar, la salida combinada se rehace desde cero
+            os.remove(self.combined_path)
+
+        pending = []
+        for input_path in self.inputs:
+            digest = file_hash(input_path)
+            if self.resume and self.manifest.is_done(digest):
+                self.skipped.append(input_path)
+            else:
+                pending.append((digest, input_path))
+
+        total = len(self.inputs)
+        done = len(self.skipped)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.process, path): digest for digest, path in pending}
+            for future in as_completed(futures):
+                result = future.result()
+                if result is None:
+                    continue
+                # Único escritor: el GeoPackage combinado y el manifiesto
+                if self.combined and result['ok']:
+                    try:
+                        self.append_combined(result)
+                    except Exception as e:
+                        result.update(ok=False, error=str(e))
+                self.manifest.record(futures[future], result)
+                if not self.add_layers or self.combined:
+                    result['layers'] = []
+                self.results.append(result)
+                done += 1
+                self.setProgress(100.0 * done / total)
+                if self.isCanceled():
+                    for pending_future in futures:
+                        pending_future.cancel()
+
+        if self.combined and os.path.exists(self.combined_path):
+            vertices = QgsVectorLayer(f"{self.combined_path}|layername=vertices", "vertices", "ogr")
+            if vertices.isValid():
+                DeliveryPipeline().excel_exporter.export_to_excel(vertices, self.combined_xlsx, open_file=False)
+        return not self.isCanceled()
+
+    def finished(self, result):
+        project = QgsProject.instance()
+        for item in self.results:
+            for layer in item['layers']:
+                project.addMapLayer(layer)
+        if self.combined and self.add_layers and os.path.exists(self.combined_path):
+            for name in self.COMBINED_LAYERS:
+                layer = QgsVectorLayer(f"{self.combined_path}|layername={name}", f"Entregas - {name}", "ogr")
+                if layer.isValid():
+                    project.addMapLayer(layer)
+        if self.on_finished:
+            self.on_finished(self.results, self.skipped, self.isCanceled())
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ ColumnProfiler
+                                 A QGIS plugin
+ Detección de columnas X/Y a partir de una muestra acotada del archivo
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+from .coordinate_parser import CoordinateParser
+
+# Palabras de cabecera que sugieren cada eje (coincidencia por palabra completa)
+_X_NAMES = re.compile(r'^(X|E|ESTE|EAST|EASTING|COORD_?X|LON|LONG|LONGITUD|LONGITUDE|LNG)$')
+_Y_NAMES = re.compile(r'^(Y|N|NORTE|NORTH|NORTHING|COORD_?Y|LAT|LATITUD|LATITUDE)$')
+
+
+class ColumnProfiler:
+    """Clase para puntuar columnas como coordenadas leyendo solo las primeras filas"""
+
+    # Filas leídas como máximo
+    SAMPLE_ROWS = 200
+
+    # Rangos de valores (mínimo, máximo)
+    UTM_EASTING = (100000.0, 900000.0)
+    UTM_NORTHING = (0.0, 10000000.0)
+    LONGITUDE = (-180.0, 180.0)
+    LATITUDE = (-90.0, 90.0)
+
+    # Fracción mínima de valores numéricos para considerar una columna
+    MIN_NUMERIC = 0.8
+
+    def __init__(self, sample_rows=SAMPLE_ROWS):
+        """
+        Constructor.
+
+        :param sample_rows: Número de filas de la muestra
+        :type sample_rows: int
+        """
+        self.sample_rows = sample_rows
+        self.parser = CoordinateParser()
+
+    def read_sample(self, path, sheet_name=0):
+        """
+        Lee solo las primeras filas del CSV o libro, todas como texto
+
+        :param path: Ruta del archivo
+        :type path: str
+
+        :param sheet_name: Hoja (solo para libros)
+        :type sheet_name: str or int
+
+        :rtype: pandas.DataFrame
+        """
+        if path.lower().endswith('.csv'):
+            self.parser.sniff(path)
+            return pd.read_csv(
+                path, sep=self.parser.delimiter, encoding=self.parser.encoding,
+                dtype=str, nrows=self.sample_rows, keep_default_na=False
+            )
+
+        if path.lower().endswith(('.xlsx', '.xlsm')):
+            # Lectura en streaming: openpyxl no carga el resto de la hoja
+            from openpyxl import load_workbook
+            workbook = load_workbook(path, read_only=True, data_only=True)
+            try:
+                sheet = (
+                    workbook.worksheets[sheet_name] if isinstance(sheet_name, int)
+                    else workbook[sheet_name]
+                )
+                rows = sheet.iter_rows(max_row=self.sample_rows + 1, values_only=True)
+                header = next(rows, None) or ()
+                data = [list(row) for row in rows]
+            finally:
+                workbook.close()
+            columns = [str(name).strip() if name is not None else f"Columna{i + 1}" for i, name in enumerate(header)]
+            return pd.DataFrame(data, columns=columns).astype(str)
+
+        return pd.read_excel(path, sheet_name=sheet_name, nrows=self.sample_rows, dtype=str)
+
+    @staticmethod
+    def fraction_in(values, bounds):
+        """Fracción de valores dentro del rango [mínimo, máximo]."""
+        if len(values) == 0:
+            return 0.0
+        return float(np.mean((values >= bounds[0]) & (values <= bounds[1])))
+
+    def profile_column(self, name, series):
+        """
+        Estadísticas de una columna de la muestra
+
+        :rtype: dict
+        """
+        text = series[series.str.strip().ne('') & series.ne('None') & series.ne('nan')]
+        values = self.parser.to_numeric(text).to_numpy()
+        numeric = values[~np.isnan(values)]
+        ratio = len(numeric) / len(text) if len(text) else 0.0
+        header = str(name).strip().upper()
+        return {
+            'name': name,
+            'numeric_ratio': ratio,
+            'min': float(numeric.min()) if len(numeric) else None,
+            'max': float(numeric.max()) if len(numeric) else None,
+            'mean_abs': float(np.abs(numeric).mean()) if len(numeric) else None,
+            # Columnas de identificadores (1, 2, 3...) no son coordenadas
+            'integers': bool(len(numeric)) and bool(np.all(numeric == np.round(numeric))) and numeric.max() < 100000,
+            'easting': self.fraction_in(numeric, self.UTM_EASTING),
+            # Norte UTM: por encima de la banda del este es inequívoco
+            'northing': self.fraction_in(numeric, self.UTM_NORTHING) * (1.0 if len(numeric) and numeric.min() > self.UTM_EASTING[1] else 0.6),
+            'longitude': self.fraction_in(numeric, self.LONGITUDE),
+            'latitude': self.fraction_in(numeric, self.LATITUDE),
+            'x_name': bool(_X_NAMES.match(header)),
+            'y_name': bool(_Y_NAMES.match(header))
+        }
+
+    def detect(self, path, sheet_name=0):
+        """
+        Propone las columnas X e Y de un archivo
+
+        :param path: Ruta del CSV o libro
+        :type path: str
+
+        :returns: Diccionario con x, y (nombres o None), kind ('utm', 'geographic' o None) y columns
+        :rtype: dict
+        """
+        sample = self.read_sample(path, sheet_name)
+        stats = [self.profile_column(name, sample[name].astype(str)) for name in sample.columns]
+        candidates = [s for s in stats if s['numeric_ratio'] >= self.MIN_NUMERIC and not s['integers']]
+
+        result = {'x': None, 'y': None, 'kind': None, 'columns': stats}
+        x, y = self.best_pair(candidates, 'easting', 'northing')
+        if x and y:
+            result.update(x=x['name'], y=y['name'], kind='utm')
+            return result
+
+        x, y = self.best_pair(candidates, 'longitude', 'latitude')
+        if x and y:
+            # Si ninguna supera ±90 ni el nombre lo aclara, la longitud suele tener
+            # mayor valor absoluto en la región de trabajo (p. ej. Perú: -77 / -12)
+            if not x['x_name'] and not y['y_name'] and x['max'] <= 90 and x['min'] >= -90:
+                if y['mean_abs'] > x['mean_abs']:
+                    x, y = y, x
+            result.update(x=x['name'], y=y['name'], kind='geographic')
+        return result
+
+    @staticmethod
+    def best_pair(candidates, x_key, y_key):
+        """
+        Mejor par de columnas distintas para los rangos dados (o (None, None))
+
+        :rtype: tuple
+        """
+        best, best_score = (None, None), 0.0
+        for x in candidates:
+            for y in candidates:
+                if x is y or x[x_key] < 0.9 or y[y_key] < 0.5:
+                    continue
+                score = (
+                    x['numeric_ratio'] * x[x_key] + y['numeric_ratio'] * y[y_key]
+                    + 0.25 * (x['x_name'] + y['y_name'])
+                )
+                if score > best_score:
+                    best, best_score = (x, y), score
+        return best
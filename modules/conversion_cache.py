@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ ConversionCache
+                                 A QGIS plugin
+ Caché en disco de conversiones Excel → CSV por contenido del libro
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """
+    Hash SHA-256 del contenido de un archivo, leído por bloques
+
+    :param path: Ruta del archivo
+    :type path: str
+
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """Caché LRU acotada en disco de los CSV convertidos desde libros Excel"""
+
+    # Tamaño máximo por defecto (bytes)
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Constructor.
+
+        :param cache_dir: Carpeta de la caché (por defecto en el perfil de QGIS)
+        :type cache_dir: str
+
+        :param max_bytes: Tamaño máximo total; se descartan primero los menos usados
+        :type max_bytes: int
+        """
+        if cache_dir is None:
+            # Solo la ubicación por defecto depende de QGIS
+            from qgis.core import QgsApplication
+            cache_dir = os.path.join(QgsApplication.qgisSettingsDirPath(), 'yf_tools_plus', 'cache_csv')
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(digest, sheet_name=0, columns=None, encoding='UTF-8'):
+        """
+        Clave de una conversión: contenido del libro, hoja, columnas y codificación
+
+        :param digest: Hash del contenido del libro (ver file_hash)
+        :type digest: str
+
+        :rtype: str
+        """
+        selection = json.dumps([digest, sheet_name, list(columns) if columns else None, encoding.upper()])
+        return hashlib.sha256(selection.encode('utf-8')).hexdigest()
+
+    def path_for(self, key):
+        """Ruta del CSV guardado para una clave."""
+        return os.path.join(self.cache_dir, f"{key}.csv")
+
+    def lookup(self, key):
+        """
+        Devuelve la ruta del CSV guardado, o None si no está.
+        La fecha de modificación se usa como marca de último uso.
+        """
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def store(self, key, write):
+        """
+        Guarda una conversión nueva
+
+        :param key: Clave de la conversión
+        :type key: str
+
+        :param write: Función que escribe el CSV en la ruta recibida
+        :type write: callable
+
+        :returns: Ruta del CSV guardado
+        :rtype: str
+        """
+        # Escritura en un temporal y renombrado atómico: un lector nunca ve un CSV a medias
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+        os.close(fd)
+        try:
+            write(temp_path)
+            os.replace(temp_path, self.path_for(key))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.evict(keep=self.path_for(key))
+        return self.path_for(key)
+
+    def entries(self):
+        """Lista de (ruta, tamaño, último uso) de los CSV guardados."""
+        result = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.csv'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            result.append((path, stat.st_size, stat.st_mtime))
+        return result
+
+    def size(self):
+        """Tamaño total de la caché en bytes."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        """
+        Descarta los CSV menos usados hasta respetar el tamaño máximo
+
+        :param keep: Ruta que no se descarta aunque supere el límite (la recién guardada)
+        :type keep: str
+        """
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                # Otro hilo pudo descartarlo ya
+                pass
+            total -= size
+
+    def clear(self):
+        """Vacía la caché."""
+        for path, _, _ in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
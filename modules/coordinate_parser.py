@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ CoordinateParser
+                                 A QGIS plugin
+ Lectura vectorizada de columnas de coordenadas con convenciones locales
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import csv
+import re
+import numpy as np
+import pandas as pd
+
+# Número con coma decimal (opcionalmente con puntos de miles): 280.123,45 / 280123,45
+_COMMA_DECIMAL = re.compile(r'^[-+]?(\d{1,3}(\.\d{3})+|\d+),\d+$')
+# Número con punto decimal (opcionalmente con comas de miles): 280,123.45 / 280123.45
+_DOT_DECIMAL = re.compile(r'^[-+]?(\d{1,3}(,\d{3})+|\d+)\.\d+$')
+# Espacios, incluidos los no separables que deja Excel. Los no separables van como
+# caracteres literales (no como escapes de regex): motores como RE2 no admiten \u
+_SPACES = '[\\s\xa0\u202f]'
+
+
+class CoordinateParser:
+    """Clase para leer coordenadas de CSV con delimitador y decimales locales"""
+
+    # Bytes leídos para detectar el formato
+    SAMPLE_BYTES = 64 * 1024
+
+    # Filas rechazadas que se citan en el resumen
+    MAX_REPORTED = 10
+
+    def __init__(self):
+        """Constructor."""
+        self.delimiter = ','
+        self.decimal = '.'
+        self.encoding = 'utf-8-sig'
+
+    @staticmethod
+    def guess_decimal(tokens):
+        """
+        Convención decimal más frecuente entre los valores de una muestra
+
+        :param tokens: Valores de texto
+        :type tokens: iterable of str
+
+        :returns: ',' o '.'
+        :rtype: str
+        """
+        comma = dot = 0
+        for token in tokens:
+            token = re.sub(_SPACES, '', token)
+            if _COMMA_DECIMAL.match(token):
+                comma += 1
+            elif _DOT_DECIMAL.match(token):
+                dot += 1
+        return ',' if comma > dot else '.'
+
+    def read_sample(self, path):
+        """Lee el comienzo del archivo como texto, detectando la codificación."""
+        with open(path, 'rb') as f:
+            raw = f.read(self.SAMPLE_BYTES)
+        for encoding in ('utf-8-sig', 'cp1252'):
+            try:
+                text = raw.decode(encoding)
+                self.encoding = encoding
+                return text
+            except UnicodeDecodeError as e:
+                # Un carácter multibyte cortado al final de la muestra no cuenta
+                if encoding == 'utf-8-sig' and e.start >= len(raw) - 3:
+                    self.encoding = encoding
+                    return raw[:e.start].decode(encoding)
+        self.encoding = 'latin-1'
+        return raw.decode('latin-1')
+
+    def sniff(self, path):
+        """
+        Detecta una sola vez delimitador, decimal y codificación a partir de una muestra
+
+        :param path: Ruta del CSV
+        :type path: str
+
+        :returns: (delimitador, decimal)
+        :rtype: tuple
+        """
+        sample = self.read_sample(path)
+        lines = sample.splitlines()[:200]
+        if len(sample) >= self.SAMPLE_BYTES and len(lines) > 1:
+            # La última línea puede estar cortada
+            lines = lines[:-1]
+        sample = '\n'.join(lines)
+
+        try:
+            self.delimiter = csv.Sniffer().sniff(sample, delimiters=';,\t|').delimiter
+        except csv.Error:
+            header = lines[0] if lines else ''
+            self.delimiter = max(';,\t|', key=header.count) if header else ','
+
+        rows = list(csv.reader(lines[1:], delimiter=self.delimiter))
+        self.decimal = self.guess_decimal(value for row in rows for value in row)
+        return self.delimiter, self.decimal
+
+    def read_header(self, path):
+        """Nombres de columna del CSV (sin espacios sobrantes)."""
+        self.sniff(path)
+        with open(path, 'r', encoding=self.encoding, newline='') as f:
+            header = next(csv.reader(f, delimiter=self.delimiter), [])
+        return [name.strip() for name in header]
+
+    def to_numeric(self, series, decimal=None):
+        """
+        Convierte una columna completa a números en una sola pasada vectorizada
+
+        :param series: Columna a convertir
+        :type series: pandas.Series
+
+        :param decimal: ',' o '.'; None = detectar con una muestra de la columna
+        :type decimal: str
+
+        :returns: Columna de float con NaN donde el valor no es numérico
+        :rtype: pandas.Series
+        """
+        if pd.api.types.is_numeric_dtype(series):
+            return series.astype(float)
+
+        text = series.astype(str).str.replace(_SPACES, '', regex=True)
+        if decimal is None:
+            decimal = self.guess_decimal(text.head(200))
+        thousands = '.' if decimal == ',' else ','
+
+        # El separador de miles solo se quita si el valor también tiene decimal
+        # o si está agrupado de tres en tres; si aparece solo, es el decimal
+        has_decimal = text.str.contains(decimal, regex=False)
+        grouped = text.str.fullmatch(r'[-+]?\d{1,3}(' + re.escape(thousands) + r'\d{3})+')
+        text = text.mask(has_decimal | grouped, text.str.replace(thousands, '', regex=False))
+        text = text.str.replace(',', '.', regex=False)
+        return pd.to_numeric(text, errors='coerce')
+
+    def read_coordinates(self, path, field_x, field_y):
+        """
+        Lee las columnas X e Y de un CSV
+
+        :param path: Ruta del CSV
+        :type path: str
+
+        :returns: (xs, ys, resumen); xs e ys solo con las filas válidas
+        :rtype: tuple
+        """
+        self.sniff(path)
+        wanted = {field_x.strip(), field_y.strip()}
+        df = pd.read_csv(
+            path,
+            sep=self.delimiter,
+            encoding=self.encoding,
+            dtype=str,
+            keep_default_na=False,
+            usecols=lambda name: name.strip() in wanted
+        )
+        df.columns = [name.strip() for name in df.columns]
+        for field in wanted:
+            if field not in df.columns:
+                raise KeyError(f"El campo '{field}' no existe en el CSV")
+
+        xs = self.to_numeric(df[field_x.strip()], self.decimal)
+        ys = self.to_numeric(df[field_y.strip()], self.decimal)
+        valid = (xs.notna() & ys.notna()).to_numpy()
+        summary = self.summary(df, valid, field_x.strip(), field_y.strip())
+        return xs.to_numpy()[valid], ys.to_numpy()[valid], summary
+
+    def summary(self, df, valid, field_x, field_y):
+        """
+        Resumen agregado de filas rechazadas (en lugar de un aviso por fila)
+
+        :returns: Diccionario con total, rejected, examples y formato detectado
+        :rtype: dict
+        """
+        rejected = np.flatnonzero(~valid)
+        examples = [
+            # +2: la fila 1 es la cabecera y las filas se numeran desde 1
+            (int(i) + 2, df[field_x].iat[i], df[field_y].iat[i])
+            for i in rejected[:self.MAX_REPORTED]
+        ]
+        return {
+            'total': len(df),
+            'rejected': len(rejected),
+            'examples': examples,
+            'delimiter': self.delimiter,
+            'decimal': self.decimal,
+            'encoding': self.encoding
+        }
+
+    @staticmethod
+    def describe(summary):
+        """Texto de una línea con el resumen de filas rechazadas."""
+        text = f"{summary['rejected']} de {summary['total']} fila(s) sin coordenadas numéricas"
+        if summary['examples']:
+            detail = ", ".join(f"fila {row}: '{x}' / '{y}'" for row, x, y in summary['examples'])
+            more = "..." if summary['rejected'] > len(summary['examples']) else ""
+            text += f" ({detail}{more})"
+        return text
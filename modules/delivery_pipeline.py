@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DeliveryPipeline
+                                 A QGIS plugin
+ Flujo completo en un paso: Excel → polígono → segmentos → tabla Excel
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import fnmatch
+import os
+import traceback
+import pandas as pd
+from qgis.core import (
+    QgsTask, QgsProject, QgsPointXY, QgsCoordinateReferenceSystem,
+    QgsMessageLog, Qgis
+)
+from PyQt5.QtCore import QCoreApplication
+
+from .excel_to_csv import ExcelToCsv
+from .polygon_creator import PolygonCreator
+from .segmentator import Segmentator
+from .excel_exporter import ExcelExporter
+from .run_profiler import RunProfiler
+from .coordinate_parser import CoordinateParser
+
+
+class DeliveryPipeline:
+    """Clase para encadenar las cuatro herramientas sin archivos intermedios"""
+
+    # Patrón por defecto de archivos de entrega (separados por ';')
+    DEFAULT_PATTERN = '*.xlsx;*.xls;*.csv'
+
+    # Opciones por defecto de run
+    DEFAULT_OPTIONS = {
+        'field_x': 'ESTE',
+        'field_y': 'NORTE',
+        'crs': 'EPSG:32718',
+        'output_dir': None,          # None = junto al archivo de entrada
+        'keep_csv': False,           # Guardar también el CSV intermedio
+        'export': True,              # Escribir la tabla de vértices en Excel
+        'cache': None,               # ConversionCache para no volver a leer libros sin cambios
+        'style_params': None,        # Ver PolygonCreator.DEFAULT_STYLE
+        'polygon_options': None,     # Ver PolygonCreator.DEFAULT_OPTIONS
+        'segment_options': None      # Ver Segmentator.OPCIONES_DEFECTO
+    }
+
+    def __init__(self):
+        """Constructor."""
+        self.excel_to_csv = ExcelToCsv()
+        self.polygon_creator = PolygonCreator()
+        self.segmentator = Segmentator()
+        self.excel_exporter = ExcelExporter()
+        self.trace_memory = False
+
+    @classmethod
+    def list_inputs(cls, folder, pattern=None):
+        """
+        Archivos de entrega de una carpeta, ordenados por nombre
+
+        :param folder: Carpeta de entregas
+        :type folder: str
+
+        :param pattern: Patrones glob separados por ';' (p. ej. '*.xlsx;lote_*.csv')
+        :type pattern: str
+
+        :rtype: list of str
+        """
+        patterns = [p.strip().lower() for p in (pattern or cls.DEFAULT_PATTERN).split(';') if p.strip()]
+        return sorted(
+            os.path.join(folder, name) for name in os.listdir(folder)
+            if os.path.isfile(os.path.join(folder, name))
+            and not name.startswith('~$')
+            and any(fnmatch.fnmatch(name.lower(), p) for p in patterns)
+        )
+
+    @staticmethod
+    def output_path(input_path, output_dir=None, suffix='_vertices.xlsx'):
+        """Ruta de salida de una entrega: <nombre><suffix> en output_dir o junto a la entrada."""
+        stem = os.path.splitext(os.path.basename(input_path))[0]
+        return os.path.join(output_dir or os.path.dirname(input_path), stem + suffix)
+
+    def read_points(self, input_path, field_x, field_y, csv_path=None):
+        """
+        Lee las coordenadas de un Excel o CSV directamente en memoria
+
+        :param input_path: Archivo de entrada
+        :type input_path: str
+
+        :param csv_path: Si se indica, guarda también la tabla de un Excel como CSV
+        :type csv_path: str
+
+        :returns: (puntos, filas leídas, filas descartadas)
+        :rtype: tuple
+        """
+        parser = CoordinateParser()
+        if input_path.lower().endswith('.csv'):
+            # Delimitador y decimales locales detectados una vez; solo se leen X e Y
+            xs, ys, summary = parser.read_coordinates(input_path, field_x, field_y)
+            points = [QgsPointXY(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+            return points, summary['total'], summary['rejected']
+
+        if self.excel_to_csv.cache is not None:
+            # Libro ya convertido antes: se lee el CSV de la caché
+            cached_path, _ = self.excel_to_csv.cached_csv(input_path)
+            df = pd.read_csv(cached_path)
+        else:
+            df = pd.read_excel(input_path)
+
+        for field in (field_x, field_y):
+            if field not in df.columns:
+                raise ValueError(f"El campo '{field}' no existe. Campos disponibles: {list(df.columns)}")
+
+        if csv_path:
+            df.to_csv(csv_path, index=False, encoding='UTF-8')
+
+        # Celdas de texto con coma decimal, miles o espacios se convierten igual
+        xs = parser.to_numeric(df[field_x])
+        ys = parser.to_numeric(df[field_y])
+        valid = xs.notna() & ys.notna()
+        points = [QgsPointXY(x, y) for x, y in zip(xs[valid].tolist(), ys[valid].tolist())]
+        return points, len(df), int((~valid).sum())
+
+    def run(self, input_path, options=None):
+        """
+        Procesa una entrega completa. No añade capas al proyecto: es seguro
+        llamarlo desde un QgsTask.
+
+        :param input_path: Archivo Excel o CSV con las coordenadas de la parcela
+        :type input_path: str
+
+        :param options: Opciones del flujo (ver DEFAULT_OPTIONS)
+        :type options: dict
+
+        :returns: Resultado con claves input, output, ok, error, layers y profile
+        :rtype: dict
+        """
+        options = dict(self.DEFAULT_OPTIONS, **(options or {}))
+        stem = os.path.splitext(os.path.basename(input_path))[0]
+        profiler = RunProfiler(f"Flujo completo: {stem}", self.trace_memory)
+        result = {'input': input_path, 'output': None, 'ok': False, 'error': None, 'layers': [], 'profile': profiler}
+
+        self.excel_to_csv.cache = options['cache']
+        try:
+            output_dir = options['output_dir']
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            # Un CSV de entrada no se vuelve a escribir (la ruta coincidiría con la entrada)
+            keep_csv = options['keep_csv'] and not input_path.lower().endswith('.csv')
+            csv_path = self.output_path(input_path, output_dir, '.csv') if keep_csv else None
+
+            with profiler.stage('lectura', 'filas') as stage:
+                points, rows, rejected = self.read_points(
+                    input_path, options['field_x'], options['field_y'], csv_path
+                )
+                stage.items = rows
+            if rejected:
+                QgsMessageLog.logMessage(
+                    f"{stem}: {rejected} fila(s) sin coordenadas numéricas descartadas.",
+                    "YF Tools Plus",
+                    Qgis.Warning
+                )
+
+            crs = QgsCoordinateReferenceSystem(options['crs'])
+            if not crs.isValid():
+                raise ValueError(f"El CRS '{options['crs']}' no es válido")
+
+            style_params = dict(PolygonCreator.DEFAULT_STYLE, **(options['style_params'] or {}))
+            polygon_layer = self.polygon_creator.build_polygon_layer(
+                points, crs, style_params, options['polygon_options'], profiler, f"{stem} - Polígono"
+            )
+            if polygon_layer is None:
+                raise ValueError("No se pudo crear el polígono (revise el registro de mensajes)")
+
+            segment_options = dict(Segmentator.OPCIONES_DEFECTO, **(options['segment_options'] or {}))
+            # La capa de polígonos aún no está en el proyecto: siempre capas en memoria
+            segment_options['capas_virtuales'] = False
+            capa_segmentos, capa_vertices, _ = self.segmentator.segmentar_capa(polygon_layer, segment_options, profiler)
+            capa_segmentos.setName(f"{stem} - Segmentos")
+            capa_vertices.setName(f"{stem} - Vertices")
+
+            output_file = None
+            if options['export']:
+                output_file = self.output_path(input_path, output_dir)
+                with profiler.stage('exportacion', 'filas') as stage:
+                    # Directo desde las columnas calculadas, sin recorrer la capa de vértices
+                    self.excel_exporter.write_result(self.segmentator.last_results['vertices'], output_file)
+                    stage.items = capa_vertices.featureCount()
+
+            result.update(ok=True, output=output_file, layers=[polygon_layer, capa_segmentos, capa_vertices])
+
+        except Exception as e:
+            result['error'] = str(e)
+            QgsMessageLog.logMessage(
+                f"Error en el flujo completo ({input_path}): {str(e)}\n{traceback.format_exc()}",
+                "YF Tools Plus",
+                Qgis.Critical
+            )
+        finally:
+            profiler.finish()
+        return result
+
+
+class PipelineTask(QgsTask):
+    """Tarea en segundo plano que ejecuta el flujo completo sobre una o varias entregas"""
+
+    def __init__(self, inputs, options=None, add_layers=True, on_finished=None):
+        """
+        Constructor.
+
+        :param inputs: Archivos de entrada
+        :type inputs: list of str
+
+        :param options: Opciones del flujo (ver DeliveryPipeline.DEFAULT_OPTIONS)
+        :type options: dict
+
+        :param add_layers: Añadir al proyecto las capas de cada entrega al terminar
+        :type add_layers: bool
+
+        :param on_finished: Función llamada en el hilo principal con la lista de resultados
+        :type on_finished: callable
+        """
+        super(PipelineTask, self).__init__(
+            f"YF Tools Plus - Flujo completo ({len(inputs)} archivo(s))", QgsTask.CanCancel
+        )
+        self.inputs = list(inputs)
+        self.options = options or {}
+        self.add_layers = add_layers
+        self.on_finished = on_finished
+        self.pipeline = DeliveryPipeline()
+        self.results = []
+
+    def run(self):
+        main_thread = QCoreApplication.instance().thread()
+        for index, input_path in enumerate(self.inputs):
+            if self.isCanceled():
+                return False
+            result = self.pipeline.run(input_path, self.options)
+            if not self.add_layers:
+                result['layers'] = []
+            # Las capas creadas en este hilo deben pasar al hilo principal
+            for layer in result['layers']:
+                layer.moveToThread(main_thread)
+            self.results.append(result)
+            self.setProgress(100.0 * (index + 1) / len(self.inputs))
+        return True
+
+    def finished(self, result):
+        for item in self.results:
+            for layer in item['layers']:
+                QgsProject.instance().addMapLayer(layer)
+        if self.on_finished:
+            self.on_finished(self.results, self.isCanceled())
@@ -13,17 +13,47 @@
 
 import os
 import sys
+import queue
+import threading
 import subprocess
-from qgis.core import QgsVectorLayer, QgsVectorFileWriter, QgsMessageLog, Qgis
+from concurrent.futures import ThreadPoolExecutor
+from qgis.core import (
+    QgsVectorLayer, QgsVectorLayerFeatureSource, QgsVectorFileWriter,
+    QgsFeatureRequest, QgsExpression, QgsExpressionContext, QgsExpressionContextUtils,
+    QgsProject, QgsTask, QgsMessageLog, Qgis
+)
 from qgis.PyQt.QtWidgets import QMessageBox
 
+from .run_profiler import RunProfiler
+from .external_sort import ExternalSorter
+from .table_writers import (
+    FORMATS, XlsxTableWriter, read_batches, field_kinds, partition_file_name, output_with_extension
+)
+
 
 class ExcelExporter:
     """Clase para exportar capas vectoriales a Excel"""
+
+    # Hilos lectores como máximo y bloques en espera hacia el escritor
+    MAX_READERS = 4
+    QUEUE_BATCHES = 16
+
+    # Filas por bloque al escribir resultados en columnas (grupos de filas de Parquet)
+    COLUMN_BLOCK = 64 * 1024
+
+    # Exportación por particiones: hilos escritores y filas acumuladas por partición
+    MAX_WRITERS = 4
+    PARTITION_BATCH = 500
+
+    # Proveedores que ordenan en la consulta (ORDER BY); el resto se ordena con ExternalSorter
+    ORDERING_PROVIDERS = ('postgres', 'spatialite', 'oracle', 'mssql', 'hana')
+    ORDERING_OGR_FORMATS = ('GPKG', 'SQLITE')
     
     def __init__(self):
         """Constructor."""
-        pass
+        # Medición por etapas de la última ejecución (ver RunProfiler)
+        self.trace_memory = False
+        self.last_profile = None
     
     def export_to_excel(self, layer, output_file, open_file=True):
         """
@@ -61,11 +91,15 @@ class ExcelExporter:
         options.attributes = list(range(len(layer.fields())))  # Exportar todos los campos
         
         # Exportar usando QgsVectorFileWriter
-        error = QgsVectorFileWriter.writeAsVectorFormat(
-            layer,
-            output_file,
-            options
-        )
+        profiler = self.last_profile = RunProfiler('Exportar a Excel', self.trace_memory)
+        with profiler.stage('escritura_xlsx', 'filas') as stage:
+            error = QgsVectorFileWriter.writeAsVectorFormat(
+                layer,
+                output_file,
+                options
+            )
+            stage.items = layer.featureCount()
+        profiler.finish()
         
         if error[0] != QgsVectorFileWriter.NoError:
             raise Exception(f"Error al exportar a XLSX: {error[1]}")
@@ -80,20 +114,676 @@ class ExcelExporter:
         if open_file:
             self.open_file_in_os(output_file)
     
-    def quick_export(self, layer):
+    @classmethod
+    def provider_orders(cls, layer):
+        """
+        Indica si el proveedor de la capa resuelve el orden en la propia consulta.
+        En los demás QGIS ordenaría cargando todas las entidades en memoria.
+
+        :rtype: bool
+        """
+        provider = layer.providerType()
+        if provider in cls.ORDERING_PROVIDERS:
+            return True
+        return provider == 'ogr' and layer.dataProvider().storageType().upper() in cls.ORDERING_OGR_FORMATS
+
+    def prepare_table(self, layer, fields=None, expression=None, selected_only=False, order_by=None):
+        """
+        Prepara en el hilo principal la lectura de una capa: campos, filtro y
+        una copia de la fuente que después se puede leer desde otro hilo.
+        Común a todos los formatos de exportación.
+
+        :param layer: Capa vectorial a exportar
+        :type layer: QgsVectorLayer
+
+        :param fields: Nombres de los campos a exportar (por defecto, todos)
+        :type fields: list of str
+
+        :param expression: Expresión de filtro de QGIS (p. ej. "AREA" > 1)
+        :type expression: str
+
+        :param selected_only: Exportar solo las entidades seleccionadas
+        :type selected_only: bool
+
+        :param order_by: Orden de las filas, lista de (campo, ascendente) (ver external_sort.parse_sort_spec)
+        :type order_by: list of tuple
+
+        :returns: Diccionario con name, source, field_indexes, header, kinds, request, count y sort
+        :rtype: dict
+
+        :raises Exception: Si la capa, un campo o la expresión no son válidos
+        """
+        if not layer or not isinstance(layer, QgsVectorLayer):
+            raise Exception("La capa proporcionada no es válida")
+        layer_fields = layer.fields()
+        if fields:
+            missing = [name for name in fields if layer_fields.indexOf(name) < 0]
+            if missing:
+                raise Exception(f"Campos inexistentes en la capa: {', '.join(missing)}")
+            field_indexes = [layer_fields.indexOf(name) for name in fields]
+        else:
+            field_indexes = list(range(len(layer_fields)))
+
+        request = QgsFeatureRequest()
+        if expression:
+            parsed = QgsExpression(expression)
+            if parsed.hasParserError():
+                raise Exception(f"Expresión de filtro no válida: {parsed.parserErrorString()}")
+            request.setFilterExpression(expression)
+            request.setExpressionContext(
+                QgsExpressionContext(QgsExpressionContextUtils.globalProjectLayerScopes(layer))
+            )
+        if selected_only:
+            request.setFilterFids(layer.selectedFeatureIds())
+
+        sort = None
+        if order_by:
+            missing = [name for name, _ in order_by if layer_fields.indexOf(name) < 0]
+            if missing:
+                raise Exception(f"Campos de orden inexistentes en la capa: {', '.join(missing)}")
+            if self.provider_orders(layer):
+                request.setOrderBy(QgsFeatureRequest.OrderBy([
+                    QgsFeatureRequest.OrderByClause(QgsExpression.quotedColumnRef(name), ascending, False)
+                    for name, ascending in order_by
+                ]))
+            else:
+                # Los campos de orden que no se exportan se leen al final de la fila y se descartan
+                read_indexes = list(field_indexes)
+                for name, _ in order_by:
+                    index = layer_fields.indexOf(name)
+                    if index not in read_indexes:
+                        read_indexes.append(index)
+                sort = {
+                    'read_indexes': read_indexes,
+                    'keys': [read_indexes.index(layer_fields.indexOf(name)) for name, _ in order_by],
+                    'ascending': [ascending for _, ascending in order_by]
+                }
+
+        return {
+            'name': layer.name(),
+            'source': QgsVectorLayerFeatureSource(layer),
+            'field_indexes': field_indexes,
+            'header': [layer_fields.at(i).name() for i in field_indexes],
+            'kinds': field_kinds(layer_fields, field_indexes),
+            'request': request,
+            'count': layer.selectedFeatureCount() if selected_only else layer.featureCount(),
+            'sort': sort
+        }
+
+    def write_table(self, table, output_file, fmt='xlsx', is_canceled=None):
+        """
+        Escribe en streaming una tabla preparada con prepare_table.
+        No toca la capa: es seguro llamarlo desde un QgsTask.
+
+        :param table: Tabla preparada (ver prepare_table)
+        :type table: dict
+
+        :param output_file: Ruta de salida (se ajusta la extensión al formato)
+        :type output_file: str
+
+        :param fmt: Formato: 'xlsx', 'csv', 'parquet' o 'arrow' (ver FORMATS)
+        :type fmt: str
+
+        :param is_canceled: Función que indica si se debe interrumpir la escritura
+        :type is_canceled: callable
+
+        :returns: Ruta del archivo escrito, o None si se canceló
+        :rtype: str
+        """
+        batches, sorter = self.table_batches(table)
+        width = len(table['field_indexes'])
+        if sorter is not None:
+            # Los campos de orden que no se exportan van al final de la fila y se descartan
+            batches = ([row[:width] for row in batch] for batch in batches)
+        output_file = self.write_blocks(
+            table['name'], table['header'], table['kinds'], batches, output_file, fmt, False, is_canceled
+        )
+        self.log_sort(sorter)
+        return output_file
+
+    @staticmethod
+    def table_batches(table, read_indexes=None):
+        """
+        Bloques de filas de una tabla preparada, en el orden pedido (ver prepare_table).
+        Las filas traen todas las columnas leídas: primero las exportadas y al
+        final las que solo se leen para ordenar o repartir.
+
+        :param table: Tabla preparada (ver prepare_table)
+        :type table: dict
+
+        :param read_indexes: Índices a leer; deben empezar por los de la tabla
+            (por defecto, los de la tabla más los de orden)
+        :type read_indexes: list of int
+
+        :returns: (generador de listas de filas, ExternalSorter o None)
+        :rtype: tuple
+        """
+        sort = table.get('sort')
+        if read_indexes is None:
+            read_indexes = sort['read_indexes'] if sort else table['field_indexes']
+        batches = read_batches(table['source'], read_indexes, table['request'])
+        if sort is None:
+            return batches, None
+        # Orden externo: tramos ordenados en disco y mezcla, con memoria acotada
+        sorter = ExternalSorter(sort['keys'], sort['ascending'])
+        return sorter.sort(batches), sorter
+
+    @staticmethod
+    def log_sort(sorter):
+        """Registra los tramos en disco de un orden externo, si los hubo."""
+        if sorter is not None and sorter.runs:
+            QgsMessageLog.logMessage(
+                f"Orden externo: {sorter.runs} tramo(s) de {sorter.run_rows} filas mezclados desde disco",
+                "YF Tools Plus",
+                Qgis.Info
+            )
+
+    def write_result(self, result, output_file, fmt='xlsx', fields=None, is_canceled=None):
+        """
+        Escribe un resultado en columnas (p. ej. Segmentator.last_results['vertices'])
+        directamente de los arreglos al archivo, sin recorrer ninguna capa.
+        Parquet/Arrow reciben las columnas tal cual; XLSX y CSV, filas por bloques.
+
+        :param result: Resultado en columnas
+        :type result: ResultTable
+
+        :param fields: Nombres de los campos a exportar (por defecto, todos)
+        :type fields: list of str
+
+        :returns: Ruta del archivo escrito, o None si se canceló
+        :rtype: str
+        """
+        if fmt not in FORMATS:
+            raise Exception(f"Formato de exportación desconocido: {fmt}")
+        field_indexes = result.field_indexes(fields)
+        header = [result.header[i] for i in field_indexes]
+        kinds = [result.kinds[i] for i in field_indexes]
+        columnar = hasattr(FORMATS[fmt][2], 'write_columns')
+        if columnar:
+            blocks = result.column_blocks(field_indexes, self.COLUMN_BLOCK)
+        else:
+            blocks = result.batches(field_indexes)
+        return self.write_blocks(result.name, header, kinds, blocks, output_file, fmt, columnar, is_canceled)
+
+    def write_blocks(self, name, header, kinds, blocks, output_file, fmt, columnar=False, is_canceled=None):
+        """
+        Escribe bloques de filas (o de columnas, si columnar) en el formato pedido.
+        Común a write_table y write_result.
+
+        :returns: Ruta del archivo escrito, o None si se canceló
+        :rtype: str
+        """
+        if fmt not in FORMATS:
+            raise Exception(f"Formato de exportación desconocido: {fmt}")
+        output_file = output_with_extension(output_file, fmt)
+
+        profiler = self.last_profile = RunProfiler(f"Exportar a {FORMATS[fmt][0]}", self.trace_memory)
+        writer = None
+        try:
+            writer = FORMATS[fmt][2](output_file)
+            writer.add_table(name, header, kinds)
+            write = writer.write_columns if columnar else writer.write_rows
+            with profiler.stage(f'escritura_{fmt}', 'filas') as stage:
+                for block in blocks:
+                    if is_canceled and is_canceled():
+                        break
+                    write(0, block)
+                stage.items = writer.rows
+            with profiler.stage('guardado'):
+                writer.close()
+        except Exception as e:
+            # Cerrar el escritor libera el archivo antes de borrar la salida parcial
+            if writer is not None:
+                try:
+                    writer.close()
+                except Exception:
+                    pass
+            self.remove_files([output_file])
+            raise Exception(f"Error al exportar a {FORMATS[fmt][0]}: {str(e)}")
+        finally:
+            profiler.finish()
+
+        if is_canceled and is_canceled():
+            if os.path.exists(output_file):
+                os.remove(output_file)
+            return None
+
+        QgsMessageLog.logMessage(
+            f"Exportación exitosa ({writer.rows} filas) a: {output_file}",
+            "YF Tools Plus",
+            Qgis.Success
+        )
+        return output_file
+
+    def export_result(self, result, output_file, fmt='xlsx', fields=None, open_file=False):
+        """
+        Exporta un resultado en columnas (ver write_result)
+
+        :returns: Ruta del archivo escrito
+        :rtype: str
+        """
+        output_file = self.write_result(result, output_file, fmt, fields)
+        if open_file:
+            self.open_file_in_os(output_file)
+        return output_file
+
+    def export_table(self, layer, output_file, fmt='xlsx', fields=None, expression=None,
+                     selected_only=False, open_file=False, order_by=None):
+        """
+        Exporta una capa a XLSX, CSV, Parquet o Arrow con selección de campos, filtro y orden
+
+        :returns: Ruta del archivo escrito
+        :rtype: str
+        """
+        table = self.prepare_table(layer, fields, expression, selected_only, order_by)
+        output_file = self.write_table(table, output_file, fmt)
+        if open_file:
+            self.open_file_in_os(output_file)
+        return output_file
+
+    @staticmethod
+    def group_layers(group_name):
+        """
+        Capas vectoriales de un grupo del proyecto (incluidos sus subgrupos), en orden del árbol
+
+        :param group_name: Nombre del grupo en el panel de capas
+        :type group_name: str
+
+        :rtype: list of QgsVectorLayer
+        """
+        group = QgsProject.instance().layerTreeRoot().findGroup(group_name)
+        if group is None:
+            raise Exception(f"El grupo '{group_name}' no existe en el proyecto")
+        return [
+            node.layer() for node in group.findLayers()
+            if isinstance(node.layer(), QgsVectorLayer)
+        ]
+
+    def prepare_layers(self, layers, sheet_names=None, fields=None, expression=None,
+                       selected_only=False, order_by=None):
+        """
+        Prepara en el hilo principal la exportación de varias capas a un libro
+        (ver write_layers). Los campos, el filtro y el orden se aplican a cada
+        capa en la medida en que los tenga: los campos y las claves de orden
+        ausentes se omiten (sin ningún campo, se exportan todos) y el filtro solo
+        se aplica a las capas con todas las columnas que usa.
+
+        :param layers: Capas vectoriales a exportar
+        :type layers: list of QgsVectorLayer
+
+        :param sheet_names: Nombres de hoja (por defecto, el nombre de cada capa)
+        :type sheet_names: list of str
+
+        :param fields: Campos, filtro, selección y orden (ver prepare_table)
+        :type fields: list of str
+
+        :returns: Tablas preparadas (ver prepare_table), con el nombre de hoja en 'name'
+        :rtype: list of dict
+        """
+        layers = [layer for layer in layers if isinstance(layer, QgsVectorLayer) and layer.isValid()]
+        if not layers:
+            raise Exception("No hay capas vectoriales válidas para exportar")
+        sheet_names = list(sheet_names or [layer.name() for layer in layers])
+        columns = QgsExpression(expression).referencedColumns() if expression else set()
+        columns.discard(QgsFeatureRequest.ALL_ATTRIBUTES)
+        specs = []
+        for layer, name in zip(layers, sheet_names):
+            names = layer.fields().names()
+            layer_fields = [field for field in fields or [] if field in names] or None
+            layer_expression = expression if columns.issubset(names) else None
+            if expression and layer_expression is None:
+                QgsMessageLog.logMessage(
+                    f"Filtro no aplicado a '{layer.name()}': la capa no tiene todos sus campos",
+                    "YF Tools Plus",
+                    Qgis.Warning
+                )
+            layer_order = [item for item in order_by or [] if item[0] in names] or None
+            spec = self.prepare_table(layer, layer_fields, layer_expression, selected_only, layer_order)
+            spec['name'] = name
+            specs.append(spec)
+        return specs
+
+    def write_layers(self, specs, output_file, is_canceled=None):
+        """
+        Escribe varias tablas preparadas en un solo libro XLSX, una hoja por tabla.
+        Las tablas se leen en paralelo y un único escritor vuelca las filas en
+        streaming. No toca las capas: es seguro llamarlo desde un QgsTask.
+
+        :param specs: Tablas preparadas (ver prepare_layers)
+        :type specs: list of dict
+
+        :param is_canceled: Función que indica si se debe interrumpir la escritura
+        :type is_canceled: callable
+
+        :returns: Ruta del archivo escrito, o None si se canceló
+        :rtype: str
+        """
+        if not output_file.endswith('.xlsx'):
+            output_file += '.xlsx'
+
+        profiler = self.last_profile = RunProfiler('Exportar capas a Excel', self.trace_memory)
+        writer = XlsxTableWriter(output_file)
+        with profiler.stage('preparacion', 'capas') as stage:
+            tables = [writer.add_table(spec['name'], spec['header']) for spec in specs]
+            stage.items = len(specs)
+
+        batches = queue.Queue(maxsize=self.QUEUE_BATCHES)
+        stop = threading.Event()
+        done = object()
+
+        def put(item):
+            # Espera por tramos: si el escritor se detiene, el lector no queda bloqueado
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def discard():
+            # Cerrar el libro a medias libera los temporales de openpyxl antes de borrarlo
+            try:
+                writer.close()
+            except Exception:
+                pass
+            if os.path.exists(output_file):
+                os.remove(output_file)
+
+        def read(table, spec):
+            try:
+                batches, sorter = self.table_batches(spec)
+                width = len(spec['field_indexes'])
+                for batch in batches:
+                    if sorter is not None:
+                        batch = [row[:width] for row in batch]
+                    if not put((table, batch)):
+                        return
+            finally:
+                put((table, done))
+
+        canceled = False
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.MAX_READERS, len(specs))) as pool:
+                futures = [pool.submit(read, table, spec) for table, spec in zip(tables, specs)]
+                try:
+                    # Escritor único en este hilo: openpyxl no admite escrituras concurrentes
+                    with profiler.stage('escritura_xlsx', 'filas') as stage:
+                        pending = len(futures)
+                        while pending:
+                            if is_canceled and is_canceled():
+                                canceled = True
+                                break
+                            table, batch = batches.get()
+                            if batch is done:
+                                pending -= 1
+                                continue
+                            writer.write_rows(table, batch)
+                        stage.items = writer.rows
+                finally:
+                    # Ante un error o una cancelación, los lectores dejan de encolar y
+                    # la cola se vacía antes de que el grupo de hilos espere por ellos
+                    stop.set()
+                    while True:
+                        try:
+                            batches.get_nowait()
+                        except queue.Empty:
+                            break
+                for future in futures:
+                    # Propaga el error de un lector, si lo hubo
+                    future.result()
+
+            if canceled:
+                discard()
+                return None
+            with profiler.stage('guardado'):
+                writer.close()
+        except Exception as e:
+            discard()
+            raise Exception(f"Error al exportar a XLSX: {str(e)}")
+        finally:
+            profiler.finish()
+
+        QgsMessageLog.logMessage(
+            f"Exportación exitosa de {len(specs)} capa(s) ({writer.rows} filas) a: {output_file}",
+            "YF Tools Plus",
+            Qgis.Success
+        )
+        return output_file
+
+    def export_layers(self, layers, output_file, sheet_names=None, open_file=True, fields=None,
+                      expression=None, selected_only=False, order_by=None):
+        """
+        Exporta varias capas a un solo libro XLSX, una hoja por capa
+        (ver prepare_layers y write_layers)
+
+        :returns: Ruta del archivo escrito
+        :rtype: str
+
+        :raises Exception: Si ocurre un error durante la exportación
+        """
+        specs = self.prepare_layers(layers, sheet_names, fields, expression, selected_only, order_by)
+        output_file = self.write_layers(specs, output_file)
+        if open_file:
+            self.open_file_in_os(output_file)
+        return output_file
+
+    def prepare_partitioned(self, layer, field_name, fields=None, expression=None,
+                            selected_only=False, order_by=None):
+        """
+        Prepara en el hilo principal la exportación por particiones (ver write_partitioned).
+        Las filas se ordenan primero por el campo de partición y después por
+        order_by: cada partición llega completa y seguida.
+
+        :param field_name: Campo cuyos valores definen las particiones
+        :type field_name: str
+
+        :param fields: Campos, filtro, selección y orden (ver prepare_table)
+        :type fields: list of str
+
+        :returns: Tabla preparada (ver prepare_table) con 'partition_index'
+        :rtype: dict
+        """
+        partition_index = layer.fields().indexOf(field_name) if layer else -1
+        if partition_index < 0:
+            raise Exception(f"El campo '{field_name}' no existe en la capa")
+        order_by = [(field_name, True)] + [item for item in order_by or [] if item[0] != field_name]
+        table = self.prepare_table(layer, fields, expression, selected_only, order_by)
+        table['partition_index'] = partition_index
+        return table
+
+    def write_partitioned(self, table, output_file, fmt='xlsx', is_canceled=None):
+        """
+        Escribe un archivo por cada valor del campo de partición de una tabla
+        preparada con prepare_partitioned. Las filas llegan ordenadas por
+        partición: cada hilo escritor tiene como máximo un archivo abierto y las
+        particiones se reparten por turnos. Ante un error o una cancelación se
+        borran todos los archivos escritos.
+        No toca la capa: es seguro llamarlo desde un QgsTask.
+
+        :param output_file: Ruta base; se escribe <carpeta>/<nombre>_<valor>.<formato>
+        :type output_file: str
+
+        :param fmt: Formato de los archivos (ver FORMATS)
+        :type fmt: str
+
+        :param is_canceled: Función que indica si se debe interrumpir la escritura
+        :type is_canceled: callable
+
+        :returns: Diccionario {valor: ruta del archivo}, o None si se canceló
+        :rtype: dict
+        """
+        if fmt not in FORMATS:
+            raise Exception(f"Formato de exportación desconocido: {fmt}")
+        writer_class, extension = FORMATS[fmt][2], FORMATS[fmt][1]
+
+        # El campo de partición se lee aunque no se exporte (va al final de la fila)
+        sort = table.get('sort')
+        read_indexes = list(sort['read_indexes'] if sort else table['field_indexes'])
+        if table['partition_index'] not in read_indexes:
+            read_indexes.append(table['partition_index'])
+        key_position = read_indexes.index(table['partition_index'])
+        width = len(table['field_indexes'])
+
+        if not output_file:
+            output_file = os.path.join(os.path.expanduser("~"), f"{table['name'].replace(' ', '_')}_atributos.xlsx")
+        output_dir = os.path.dirname(output_file) or os.path.expanduser("~")
+        stem = os.path.splitext(os.path.basename(output_file))[0]
+        os.makedirs(output_dir, exist_ok=True)
+
+        num_writers = max(1, min(self.MAX_WRITERS, os.cpu_count() or 1))
+        queues = [queue.Queue(maxsize=self.QUEUE_BATCHES) for _ in range(num_writers)]
+        errors = []
+
+        def write(jobs):
+            # Mensajes en orden: ('open', ruta), ('rows', filas)... ('close', None)
+            writer = None
+            try:
+                while True:
+                    job = jobs.get()
+                    if job is None:
+                        break
+                    if errors:
+                        # Tras un error se sigue vaciando la cola para no bloquear al lector
+                        continue
+                    action, data = job
+                    try:
+                        if action == 'open':
+                            writer = writer_class(data)
+                            writer.add_table(table['name'], table['header'], table['kinds'])
+                        elif action == 'rows':
+                            writer.write_rows(0, data)
+                        else:
+                            current, writer = writer, None
+                            current.close()
+                    except Exception as e:
+                        errors.append(e)
+            finally:
+                if writer is not None:
+                    try:
+                        writer.close()
+                    except Exception:
+                        pass
+
+        paths = {}
+        used_names = set()
+        canceled = False
+        profiler = self.last_profile = RunProfiler('Exportar por particiones', self.trace_memory)
+        try:
+            with ThreadPoolExecutor(max_workers=num_writers) as pool:
+                futures = [pool.submit(write, jobs) for jobs in queues]
+                try:
+                    with profiler.stage('lectura_reparto', 'filas') as stage:
+                        batches, sorter = self.table_batches(table, read_indexes)
+                        current, jobs, rows = None, None, []
+                        for batch in batches:
+                            if errors:
+                                break
+                            if is_canceled and is_canceled():
+                                canceled = True
+                                break
+                            for row in batch:
+                                value = row[key_position]
+                                if jobs is None or value != current:
+                                    if value in paths:
+                                        raise Exception(
+                                            f"Las filas del valor '{value}' no llegaron seguidas; "
+                                            "revise el orden del proveedor de datos"
+                                        )
+                                    if jobs is not None:
+                                        if rows:
+                                            jobs.put(('rows', rows))
+                                        jobs.put(('close', None))
+                                    # Reparto por turnos entre los hilos escritores
+                                    jobs, current, rows = queues[len(paths) % num_writers], value, []
+                                    paths[value] = os.path.join(
+                                        output_dir, partition_file_name(stem, value, extension, used_names)
+                                    )
+                                    jobs.put(('open', paths[value]))
+                                rows.append(row[:width])
+                                if len(rows) >= self.PARTITION_BATCH:
+                                    jobs.put(('rows', rows))
+                                    rows = []
+                            stage.items += len(batch)
+                        if jobs is not None and not canceled:
+                            if rows:
+                                jobs.put(('rows', rows))
+                            jobs.put(('close', None))
+                finally:
+                    for jobs in queues:
+                        jobs.put(None)
+                with profiler.stage(f'escritura_{fmt}', 'archivos') as stage:
+                    for future in futures:
+                        future.result()
+                    stage.items = len(paths)
+            if errors:
+                raise errors[0]
+            self.log_sort(sorter)
+        except Exception as e:
+            self.remove_files(paths.values())
+            raise Exception(f"Error al exportar por particiones: {str(e)}")
+        finally:
+            profiler.finish()
+
+        if canceled:
+            self.remove_files(paths.values())
+            return None
+
+        QgsMessageLog.logMessage(
+            f"Exportación por particiones: {len(paths)} archivo(s) en {output_dir}",
+            "YF Tools Plus",
+            Qgis.Success
+        )
+        return paths
+
+    @staticmethod
+    def remove_files(paths):
+        """Borra los archivos parciales de una exportación que falló o se canceló."""
+        for path in paths:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError:
+                continue
+
+    def export_partitioned(self, layer, field_name, output_file, open_folder=False, fmt='xlsx',
+                           fields=None, expression=None, selected_only=False, order_by=None):
+        """
+        Exporta una capa a un archivo por cada valor de un campo
+        (p. ej. un archivo por distrito o propietario; ver prepare_partitioned
+        y write_partitioned)
+
+        :returns: Diccionario {valor: ruta del archivo}
+        :rtype: dict
+
+        :raises Exception: Si ocurre un error durante la exportación
+        """
+        table = self.prepare_partitioned(layer, field_name, fields, expression, selected_only, order_by)
+        paths = self.write_partitioned(table, output_file, fmt)
+        if open_folder:
+            self.open_file_in_os(os.path.dirname(output_file) or os.path.expanduser("~"))
+        return paths
+    
+    def quick_export(self, layer, fmt='xlsx'):
         """
         Exportación rápida (un clic) de una capa a Excel.
         Guarda en la carpeta del usuario y abre automáticamente.
         
         :param layer: Capa vectorial a exportar
         :type layer: QgsVectorLayer
+        
+        :param fmt: Formato de salida (ver FORMATS); CSV y Parquet son más rápidos que XLSX
+        :type fmt: str
         """
         try:
             layer_name = layer.name().replace(" ", "_")
             output_dir = os.path.expanduser("~")
-            output_file = os.path.join(output_dir, f"{layer_name}_atributos.xlsx")
+            output_file = os.path.join(output_dir, f"{layer_name}_atributos{FORMATS[fmt][1]}")
             
-            self.export_to_excel(layer, output_file, open_file=True)
+            if fmt == 'xlsx':
+                self.export_to_excel(layer, output_file, open_file=True)
+            else:
+                self.export_table(layer, output_file, fmt, open_file=True)
             
             # Mensaje de éxito se maneja en export_to_excel
             
@@ -130,4 +820,129 @@ class ExcelExporter:
                 f"No se pudo abrir el archivo automáticamente: {str(e)}", 
                 "YF Tools Plus", 
                 Qgis.Warning
-            )
\ No newline at end of file
+            )
+
+
+class BackgroundExport(QgsTask):
+    """Base de las exportaciones en segundo plano: ejecución, cancelación y aviso final"""
+
+    def __init__(self, description, exporter, output_file, open_file=False, on_finished=None):
+        """
+        Constructor. Las subclases preparan las capas en el hilo principal.
+
+        :param exporter: Exportador (conserva el perfil de la ejecución)
+        :type exporter: ExcelExporter
+
+        :param on_finished: Función llamada en el hilo principal con (ruta, error)
+        :type on_finished: callable
+        """
+        super(BackgroundExport, self).__init__(description, QgsTask.CanCancel)
+        self.exporter = exporter
+        self.output_file = output_file
+        self.open_file = open_file
+        self.on_finished = on_finished
+        self.error = None
+
+    def write(self):
+        """Escribe la salida en el hilo de la tarea; devuelve la ruta o None si se canceló."""
+        raise NotImplementedError
+
+    def run(self):
+        try:
+            self.output_file = self.write()
+        except Exception as e:
+            self.error = str(e)
+            return False
+        return self.output_file is not None
+
+    def finished(self, result):
+        if self.error:
+            QgsMessageLog.logMessage(self.error, "YF Tools Plus", Qgis.Critical)
+        elif result and self.open_file:
+            self.exporter.open_file_in_os(self.output_file)
+        if self.on_finished:
+            self.on_finished(self.output_file if result else None, self.error)
+
+
+class ExportTask(BackgroundExport):
+    """Tarea en segundo plano que exporta una capa en cualquiera de los formatos"""
+
+    def __init__(self, exporter, layer, output_file, fmt='xlsx', fields=None, expression=None,
+                 selected_only=False, open_file=False, on_finished=None, result=None, order_by=None):
+        """
+        Constructor. La capa se prepara aquí, en el hilo principal.
+
+        :param exporter: Exportador (conserva el perfil de la ejecución)
+        :type exporter: ExcelExporter
+
+        :param result: Resultado en columnas con el contenido de la capa; si se
+            indica, se escribe directamente y la capa no se recorre
+        :type result: ResultTable
+
+        :param order_by: Orden de las filas, lista de (campo, ascendente)
+        :type order_by: list of tuple
+
+        :param on_finished: Función llamada en el hilo principal con (ruta, error)
+        :type on_finished: callable
+        """
+        super(ExportTask, self).__init__(
+            f"YF Tools Plus - Exportar {layer.name()} a {FORMATS[fmt][0]}",
+            exporter, output_file, open_file, on_finished
+        )
+        self.result = result
+        self.fields = fields
+        self.table = None if result is not None else exporter.prepare_table(
+            layer, fields, expression, selected_only, order_by
+        )
+        self.fmt = fmt
+
+    def write(self):
+        if self.result is not None:
+            return self.exporter.write_result(
+                self.result, self.output_file, self.fmt, self.fields, self.isCanceled
+            )
+        return self.exporter.write_table(self.table, self.output_file, self.fmt, self.isCanceled)
+
+
+class LayersExportTask(BackgroundExport):
+    """Tarea en segundo plano que exporta varias capas a un libro, una hoja por capa"""
+
+    def __init__(self, exporter, layers, output_file, sheet_names=None, fields=None, expression=None,
+                 selected_only=False, order_by=None, open_file=False, on_finished=None):
+        """
+        Constructor. Las capas se preparan aquí, en el hilo principal (ver ExcelExporter.prepare_layers).
+        """
+        super(LayersExportTask, self).__init__(
+            f"YF Tools Plus - Exportar {len(layers)} capa(s) a Excel (XLSX)",
+            exporter, output_file, open_file, on_finished
+        )
+        self.specs = exporter.prepare_layers(layers, sheet_names, fields, expression, selected_only, order_by)
+
+    def write(self):
+        return self.exporter.write_layers(self.specs, self.output_file, self.isCanceled)
+
+
+class PartitionedExportTask(BackgroundExport):
+    """Tarea en segundo plano que exporta un archivo por cada valor de un campo"""
+
+    def __init__(self, exporter, layer, field_name, output_file, fmt='xlsx', fields=None, expression=None,
+                 selected_only=False, order_by=None, open_folder=False, on_finished=None):
+        """
+        Constructor. La capa se prepara aquí, en el hilo principal (ver ExcelExporter.prepare_partitioned).
+        Al terminar se informa (y se abre, si open_folder) la carpeta de salida.
+        """
+        super(PartitionedExportTask, self).__init__(
+            f"YF Tools Plus - Exportar {layer.name()} por valores de '{field_name}'",
+            exporter, output_file, open_folder, on_finished
+        )
+        self.table = exporter.prepare_partitioned(layer, field_name, fields, expression, selected_only, order_by)
+        self.fmt = fmt
+        # Archivos escritos, {valor: ruta}
+        self.paths = {}
+
+    def write(self):
+        paths = self.exporter.write_partitioned(self.table, self.output_file, self.fmt, self.isCanceled)
+        if paths is None:
+            return None
+        self.paths = paths
+        return os.path.dirname(self.output_file) or os.path.expanduser("~")
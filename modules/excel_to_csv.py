@@ -21,17 +21,95 @@
 """
 
 import os
+import pickle
+import fnmatch
+import shutil
+import multiprocessing
 import pandas as pd
-from qgis.core import QgsMessageLog, Qgis
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from qgis.core import QgsTask, QgsMessageLog, Qgis
+
+from .run_profiler import RunProfiler
+from .conversion_cache import file_hash
+from .table_writers import partition_file_name
+from . import sheet_worker
 
 class ExcelToCsv:
     """Clase para convertir archivos Excel a CSV"""
     
+    # Procesos de trabajo como máximo al convertir todas las hojas de un libro
+    MAX_PROCESSES = 8
+    
+    # Fallos del grupo de procesos que no dependen del libro (arranque, importación
+    # del módulo en el trabajador, envío de tareas): se convierte en este proceso.
+    # Los errores de cada hoja (lectura, disco) se informan como en este proceso.
+    POOL_ERRORS = (BrokenProcessPool, pickle.PicklingError)
+    
     def __init__(self):
         """Constructor."""
-        pass
+        # Medición por etapas de la última ejecución (ver RunProfiler)
+        self.trace_memory = False
+        self.last_profile = None
+        # Caché de conversiones (ConversionCache); None = desactivada
+        self.cache = None
+    
+    def read_workbook(self, excel_path, csv_path, encoding='UTF-8', sheet_name=0, columns=None, profiler=None):
+        """
+        Escribe el CSV de un libro Excel, reutilizando la caché si el mismo
+        contenido (hoja y columnas) ya se convirtió antes
+        
+        :param columns: Columnas a convertir (None = todas)
+        :type columns: list of str
+        
+        :param profiler: Medición por etapas en curso (opcional)
+        :type profiler: RunProfiler
+        
+        :returns: True si el resultado vino de la caché
+        :rtype: bool
+        """
+        profiler = profiler or RunProfiler('Excel a CSV')
+        if self.cache is not None:
+            path, from_cache = self.cached_csv(excel_path, encoding, sheet_name, columns, profiler)
+            with profiler.stage('copia_csv'):
+                shutil.copyfile(path, csv_path)
+            return from_cache
+        
+        # Leer el archivo de Excel
+        with profiler.stage('lectura_excel', 'filas') as stage:
+            df = pd.read_excel(excel_path, sheet_name=sheet_name, usecols=columns)
+            stage.items = len(df)
+        
+        # Guardar como CSV
+        with profiler.stage('escritura_csv', 'filas') as stage:
+            df.to_csv(csv_path, index=False, encoding=encoding)
+            stage.items = len(df)
+        return False
+    
+    def cached_csv(self, excel_path, encoding='UTF-8', sheet_name=0, columns=None, profiler=None):
+        """
+        CSV equivalente al libro dentro de la caché, convirtiendo solo si el
+        contenido no estaba ya guardado. Requiere la caché activada.
+        
+        :returns: (ruta del CSV en la caché, True si ya estaba guardado)
+        :rtype: tuple
+        """
+        profiler = profiler or RunProfiler('Excel a CSV')
+        with profiler.stage('hash'):
+            key = self.cache.make_key(file_hash(excel_path), sheet_name, columns, encoding)
+            path = self.cache.lookup(key)
+        if path is not None:
+            return path, True
+        
+        with profiler.stage('lectura_excel', 'filas') as stage:
+            df = pd.read_excel(excel_path, sheet_name=sheet_name, usecols=columns)
+            stage.items = len(df)
+        with profiler.stage('escritura_csv', 'filas') as stage:
+            path = self.cache.store(key, lambda temp_path: df.to_csv(temp_path, index=False, encoding=encoding))
+            stage.items = len(df)
+        return path, False
         
-    def convert(self, excel_path, csv_path, encoding='UTF-8'):
+    def convert(self, excel_path, csv_path, encoding='UTF-8', sheet_name=0, columns=None):
         """
         Convierte un archivo Excel a CSV
         
@@ -44,20 +122,28 @@ class ExcelToCsv:
         :param encoding: Codificación del archivo CSV
         :type encoding: str
         
+        :param sheet_name: Hoja a convertir (nombre o índice)
+        :type sheet_name: str or int
+        
+        :param columns: Columnas a convertir (None = todas)
+        :type columns: list of str
+        
         :returns: True si la conversión fue exitosa, False en caso contrario
         :rtype: bool
         """
+        profiler = self.last_profile = RunProfiler('Excel a CSV', self.trace_memory)
         try:
             # Verificar que el archivo Excel existe
             if not os.path.exists(excel_path):
                 QgsMessageLog.logMessage(f"El archivo Excel no existe: {excel_path}", "YF Tools Plus", Qgis.Critical)
                 return False
             
-            # Leer el archivo de Excel
-            df = pd.read_excel(excel_path)
-            
-            # Guardar como CSV
-            df.to_csv(csv_path, index=False, encoding=encoding)
+            if self.read_workbook(excel_path, csv_path, encoding, sheet_name, columns, profiler):
+                QgsMessageLog.logMessage(
+                    f"Conversión reutilizada desde la caché (libro sin cambios): {excel_path}", 
+                    "YF Tools Plus", 
+                    Qgis.Info
+                )
             
             # Verificar que el archivo CSV se creó correctamente
             if not os.path.exists(csv_path):
@@ -69,3 +155,203 @@ class ExcelToCsv:
         except Exception as e:
             QgsMessageLog.logMessage(f"Error al convertir Excel a CSV: {str(e)}", "YF Tools Plus", Qgis.Critical)
             return False
+        finally:
+            profiler.finish()
+    
+    @staticmethod
+    def match_sheets(sheet_names, pattern=None):
+        """
+        Hojas cuyo nombre coincide con alguno de los patrones
+        
+        :param pattern: Patrones glob separados por ';' (p. ej. 'Parcela*;Día 1?'); None = todas
+        :type pattern: str
+        
+        :rtype: list of str
+        """
+        patterns = [p.strip().lower() for p in (pattern or '').split(';') if p.strip()]
+        if not patterns:
+            return list(sheet_names)
+        return [
+            name for name in sheet_names
+            if any(fnmatch.fnmatch(str(name).lower(), p) for p in patterns)
+        ]
+    
+    def convert_sheets_in_process(self, excel_path, jobs, encoding, stage):
+        """Convierte las hojas una tras otra en este proceso, con el libro abierto una sola vez."""
+        sheet_worker.open_workbook(excel_path)
+        try:
+            for sheet, csv_path in jobs:
+                try:
+                    stage.items += sheet_worker.convert_sheet(sheet, csv_path, encoding)[1]
+                except Exception as e:
+                    raise Exception(f"Hoja '{sheet}': {str(e)}")
+        finally:
+            sheet_worker.close_workbook()
+    
+    def convert_sheets_in_pool(self, excel_path, jobs, encoding, workers, stage):
+        """
+        Convierte las hojas en un grupo de procesos; cada proceso abre el libro
+        una vez (en su inicializador) y convierte varias hojas
+        """
+        context = multiprocessing.get_context('spawn')
+        python = sheet_worker.python_executable()
+        if python is None:
+            raise BrokenProcessPool("No se encontró el intérprete de Python para los procesos de trabajo")
+        context.set_executable(python)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=sheet_worker.open_workbook,
+            initargs=(excel_path,)
+        ) as executor:
+            try:
+                futures = {
+                    executor.submit(sheet_worker.convert_sheet, sheet, csv_path, encoding): sheet
+                    for sheet, csv_path in jobs
+                }
+            except OSError as e:
+                # Los procesos se lanzan al enviar las tareas: es un fallo de arranque
+                raise BrokenProcessPool(str(e)) from e
+            for future in as_completed(futures):
+                try:
+                    stage.items += future.result()[1]
+                except self.POOL_ERRORS:
+                    raise
+                except Exception as e:
+                    # Error de la hoja: no se convierten las que aún no empezaron
+                    for pending in futures:
+                        pending.cancel()
+                    raise Exception(f"Hoja '{futures[future]}': {str(e)}")
+    
+    def convert_sheets(self, excel_path, csv_path, pattern=None, encoding='UTF-8', workers=None):
+        """
+        Convierte todas las hojas de un libro (o las que coinciden con un patrón)
+        en CSV separados, <nombre>_<hoja>.csv junto a csv_path, en una sola pasada.
+        Las hojas se convierten en paralelo en procesos de trabajo; cada
+        proceso abre el libro una sola vez.
+        
+        :param excel_path: Ruta al archivo Excel
+        :type excel_path: str
+        
+        :param csv_path: Ruta base de los CSV (carpeta y nombre)
+        :type csv_path: str
+        
+        :param pattern: Patrones de nombre de hoja separados por ';' (None = todas)
+        :type pattern: str
+        
+        :param workers: Procesos de trabajo (por defecto, uno por núcleo)
+        :type workers: int
+        
+        :returns: CSV escrito por cada hoja, en el orden del libro
+        :rtype: dict
+        """
+        profiler = self.last_profile = RunProfiler('Excel a CSV (todas las hojas)', self.trace_memory)
+        try:
+            if not os.path.exists(excel_path):
+                raise Exception(f"El archivo Excel no existe: {excel_path}")
+            
+            with profiler.stage('hojas', 'hojas') as stage:
+                with pd.ExcelFile(excel_path) as workbook:
+                    sheets = self.match_sheets(workbook.sheet_names, pattern)
+                stage.items = len(sheets)
+            if not sheets:
+                raise Exception(f"Ninguna hoja del libro coincide con el patrón '{pattern}'")
+            
+            output_dir = os.path.dirname(os.path.abspath(csv_path))
+            stem = os.path.splitext(os.path.basename(csv_path))[0]
+            used = set()
+            outputs = {
+                sheet: os.path.join(output_dir, partition_file_name(stem, sheet, '.csv', used))
+                for sheet in sheets
+            }
+            
+            # Hojas sin cambios desde una conversión anterior: se copian desde la caché
+            keys = {}
+            jobs = []
+            if self.cache is not None:
+                with profiler.stage('cache', 'hojas') as stage:
+                    digest = file_hash(excel_path)
+                    for sheet in sheets:
+                        keys[sheet] = self.cache.make_key(digest, sheet, None, encoding)
+                        cached = self.cache.lookup(keys[sheet])
+                        if cached is not None:
+                            shutil.copyfile(cached, outputs[sheet])
+                            stage.items += 1
+                        else:
+                            jobs.append((sheet, outputs[sheet]))
+            else:
+                jobs = list(outputs.items())
+            
+            workers = min(workers or os.cpu_count() or 1, self.MAX_PROCESSES, len(jobs))
+            with profiler.stage('conversion', 'filas') as stage:
+                if workers > 1:
+                    try:
+                        self.convert_sheets_in_pool(excel_path, jobs, encoding, workers, stage)
+                    except self.POOL_ERRORS as e:
+                        QgsMessageLog.logMessage(
+                            f"No se pudieron usar procesos de trabajo ({str(e)}); conversión en este proceso",
+                            "YF Tools Plus",
+                            Qgis.Warning
+                        )
+                        self.convert_sheets_in_process(excel_path, jobs, encoding, stage)
+                elif jobs:
+                    self.convert_sheets_in_process(excel_path, jobs, encoding, stage)
+            
+            if self.cache is not None and jobs:
+                with profiler.stage('guardado_cache', 'hojas') as stage:
+                    for sheet, path in jobs:
+                        self.cache.store(keys[sheet], lambda temp_path, path=path: shutil.copyfile(path, temp_path))
+                    stage.items = len(jobs)
+        finally:
+            profiler.finish()
+        
+        QgsMessageLog.logMessage(
+            f"{len(outputs)} hoja(s) convertida(s) ({len(outputs) - len(jobs)} desde la caché) "
+            f"con {max(workers, 1)} proceso(s): {output_dir}",
+            "YF Tools Plus",
+            Qgis.Success
+        )
+        return outputs
+
+
+class ConvertSheetsTask(QgsTask):
+    """Tarea en segundo plano que convierte todas las hojas de un libro (ver convert_sheets)"""
+
+    def __init__(self, converter, excel_path, csv_path, pattern=None, encoding='UTF-8', on_finished=None):
+        """
+        Constructor.
+
+        :param converter: Conversor (conserva la caché y el perfil de la ejecución)
+        :type converter: ExcelToCsv
+
+        :param on_finished: Función llamada en el hilo principal con (CSV por hoja, error)
+        :type on_finished: callable
+        """
+        # Las hojas ya repartidas entre procesos no se pueden interrumpir: sin cancelación
+        super(ConvertSheetsTask, self).__init__(
+            f"YF Tools Plus - Convertir hojas de {os.path.basename(excel_path)}", QgsTask.Flags()
+        )
+        self.converter = converter
+        self.excel_path = excel_path
+        self.csv_path = csv_path
+        self.pattern = pattern
+        self.encoding = encoding
+        self.on_finished = on_finished
+        self.outputs = None
+        self.error = None
+
+    def run(self):
+        try:
+            self.outputs = self.converter.convert_sheets(
+                self.excel_path, self.csv_path, self.pattern, self.encoding
+            )
+        except Exception as e:
+            self.error = str(e)
+            return False
+        return True
+
+    def finished(self, result):
+        if self.error:
+            QgsMessageLog.logMessage(f"Error en ExcelToCsv: {self.error}", "YF Tools Plus", Qgis.Critical)
+        if self.on_finished:
+            self.on_finished(self.outputs if result else None, self.error)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ ExternalSort
+                                 A QGIS plugin
+ Ordenamiento de tablas con memoria acotada (tramos en disco y mezcla)
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import heapq
+import pickle
+import tempfile
+from functools import cmp_to_key
+
+
+def parse_sort_spec(text):
+    """
+    Interpreta una especificación de orden como "ID_Poligono, ID_Vertice DESC"
+
+    :param text: Campos separados por comas, cada uno con ASC (por defecto) o DESC
+    :type text: str
+
+    :returns: Lista de (campo, ascendente)
+    :rtype: list of tuple
+    """
+    spec = []
+    for item in (text or '').split(','):
+        words = item.split()
+        if not words:
+            continue
+        direction = words[-1].upper() if len(words) > 1 else 'ASC'
+        if direction in ('ASC', 'DESC'):
+            words = words[:-1] if len(words) > 1 else words
+        else:
+            direction = 'ASC'
+        spec.append((' '.join(words).strip('"'), direction == 'ASC'))
+    return spec
+
+
+class ExternalSorter:
+    """
+    Ordena bloques de filas con un máximo de filas en memoria: cada tramo
+    ordenado se vuelca a un archivo temporal y al final se mezclan todos los
+    tramos. Si todo cabe en un tramo no se escribe nada en disco.
+    El orden es estable y los valores nulos van al final.
+    """
+
+    # Filas en memoria como máximo (tamaño de cada tramo)
+    RUN_ROWS = 200000
+
+    def __init__(self, key_indexes, ascending=None, run_rows=RUN_ROWS, temp_dir=None):
+        """
+        Constructor.
+
+        :param key_indexes: Posiciones en la fila de los campos de orden
+        :type key_indexes: list of int
+
+        :param ascending: Sentido de cada campo (por defecto, todos ascendentes)
+        :type ascending: list of bool
+
+        :param run_rows: Filas por tramo
+        :type run_rows: int
+
+        :param temp_dir: Carpeta de los tramos (por defecto, la temporal del sistema)
+        :type temp_dir: str
+        """
+        self.key_indexes = list(key_indexes)
+        self.ascending = list(ascending) if ascending else [True] * len(self.key_indexes)
+        self.run_rows = max(1, run_rows)
+        self.temp_dir = temp_dir
+        self.key = cmp_to_key(self.compare)
+        # Tramos volcados a disco en la última llamada a sort
+        self.runs = 0
+
+    def compare(self, a, b):
+        """Compara dos filas según los campos de orden."""
+        for index, ascending in zip(self.key_indexes, self.ascending):
+            x, y = a[index], b[index]
+            if x == y:
+                continue
+            if x is None:
+                return 1
+            if y is None:
+                return -1
+            try:
+                less = x < y
+            except TypeError:
+                # Tipos mezclados en una columna: se comparan como texto
+                less = str(x) < str(y)
+            if less:
+                return -1 if ascending else 1
+            return 1 if ascending else -1
+        return 0
+
+    def spill(self, rows, batch_size):
+        """Vuelca un tramo ordenado a un archivo temporal, por bloques."""
+        handle = tempfile.TemporaryFile(prefix='yf_orden_', dir=self.temp_dir)
+        for start in range(0, len(rows), batch_size):
+            pickle.dump(rows[start:start + batch_size], handle, pickle.HIGHEST_PROTOCOL)
+        handle.seek(0)
+        self.runs += 1
+        return handle
+
+    @staticmethod
+    def read_run(handle):
+        """Generador de filas de un tramo en disco."""
+        while True:
+            try:
+                batch = pickle.load(handle)
+            except EOFError:
+                return
+            yield from batch
+
+    def sort(self, batches, batch_size=None):
+        """
+        Ordena bloques de filas (p. ej. de table_writers.read_batches)
+
+        :param batches: Generador de listas de filas
+        :type batches: iterable
+
+        :param batch_size: Filas por bloque devuelto (por defecto, las del mayor bloque de entrada)
+        :type batch_size: int
+
+        :returns: Generador de listas de filas ordenadas
+        """
+        self.runs = 0
+        handles = []
+        rows = []
+        size = batch_size or 1
+        try:
+            for batch in batches:
+                if not batch_size:
+                    size = max(size, len(batch))
+                rows.extend(batch)
+                if len(rows) >= self.run_rows:
+                    rows.sort(key=self.key)
+                    handles.append(self.spill(rows, size))
+                    rows = []
+            rows.sort(key=self.key)
+
+            if handles:
+                if rows:
+                    handles.append(self.spill(rows, size))
+                    rows = []
+                # heapq.merge favorece al primer tramo en los empates: orden estable
+                merged = heapq.merge(*(self.read_run(handle) for handle in handles), key=self.key)
+            else:
+                merged = iter(rows)
+
+            batch = []
+            for row in merged:
+                batch.append(row)
+                if len(batch) >= size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            for handle in handles:
+                handle.close()
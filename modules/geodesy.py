@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ GeodesicCalculator
+                                 A QGIS plugin
+ Distancias, azimuts y áreas sobre el elipsoide calculados por anillo
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import numpy as np
+
+# Las clases de QGIS se importan dentro de los métodos que las usan: las
+# fórmulas del elipsoide (inverse, ring_area...) funcionan sin QGIS
+
+
+class GeodesicCalculator:
+    """Clase para calcular medidas geodésicas de anillos completos con numpy"""
+
+    # Elipsoide usado si ni el proyecto ni el CRS definen uno
+    DEFAULT_ELLIPSOID = 'EPSG:7030'  # WGS 84
+
+    def __init__(self, crs, ellipsoid=None):
+        """
+        Constructor.
+
+        :param crs: CRS de las coordenadas de entrada
+        :type crs: QgsCoordinateReferenceSystem
+
+        :param ellipsoid: Acrónimo del elipsoide (por defecto, el del proyecto)
+        :type ellipsoid: str
+        """
+        from qgis.core import QgsCoordinateTransform, QgsEllipsoidUtils, QgsProject, QgsMessageLog, Qgis
+
+        acronym = ellipsoid or QgsProject.instance().ellipsoid()
+        if not acronym or acronym == 'NONE':
+            acronym = crs.ellipsoidAcronym() or self.DEFAULT_ELLIPSOID
+
+        params = QgsEllipsoidUtils.ellipsoidParameters(acronym)
+        if not params.valid:
+            QgsMessageLog.logMessage(
+                f"Elipsoide '{acronym}' no válido, se usa WGS 84",
+                "YF Tools Plus",
+                Qgis.Warning
+            )
+            params = QgsEllipsoidUtils.ellipsoidParameters(self.DEFAULT_ELLIPSOID)
+
+        self.ellipsoid = acronym
+        self.set_axes(params.semiMajor, params.semiMinor)
+
+        self.crs = crs
+        self._transform = None
+        if not crs.isGeographic():
+            self._transform = QgsCoordinateTransform(
+                crs, crs.toGeographicCrs(), QgsProject.instance()
+            )
+
+    @classmethod
+    def from_axes(cls, semi_major, semi_minor, name=None):
+        """
+        Calculadora para coordenadas ya geográficas sobre un elipsoide dado por
+        sus semiejes (no consulta el proyecto ni el CRS)
+
+        :param semi_major: Semieje mayor en metros
+        :type semi_major: float
+
+        :param semi_minor: Semieje menor en metros
+        :type semi_minor: float
+
+        :rtype: GeodesicCalculator
+        """
+        calculator = cls.__new__(cls)
+        calculator.ellipsoid = name
+        calculator.set_axes(semi_major, semi_minor)
+        calculator.crs = None
+        calculator._transform = None
+        return calculator
+
+    def set_axes(self, semi_major, semi_minor):
+        """Fija los semiejes del elipsoide y las constantes derivadas."""
+        self.a = semi_major
+        self.b = semi_minor
+        self.f = (self.a - self.b) / self.a
+        self.e2 = self.f * (2 - self.f)
+
+        # Radio de la esfera autálica (misma superficie que el elipsoide)
+        self._qp = self._authalic_q(np.array([1.0]))[0]
+        self.authalic_radius = self.a * np.sqrt(self._qp / 2.0)
+
+    def to_geographic(self, points):
+        """
+        Convierte una lista de puntos a longitudes/latitudes en una sola transformación
+
+        :param points: Puntos en el CRS de entrada
+        :type points: list of QgsPointXY
+
+        :returns: Longitudes y latitudes en grados
+        :rtype: tuple of numpy.ndarray
+        """
+        if self._transform is not None:
+            from qgis.core import QgsGeometry
+            line = QgsGeometry.fromPolylineXY(points)
+            line.transform(self._transform)
+            points = line.asPolyline()
+        lon = np.fromiter((p.x() for p in points), dtype=float, count=len(points))
+        lat = np.fromiter((p.y() for p in points), dtype=float, count=len(points))
+        return lon, lat
+
+    def inverse(self, lon1, lat1, lon2, lat2, tolerance=1e-12, max_iterations=200):
+        """
+        Problema geodésico inverso (Vincenty) para arreglos de pares de puntos
+
+        :returns: Distancias en metros, azimut de salida en el punto 1 y
+            azimut de llegada en el punto 2 (grados [0, 360))
+        :rtype: tuple of numpy.ndarray
+        """
+        a, b, f = self.a, self.b, self.f
+        L = np.radians(lon2 - lon1)
+        U1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+        U2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+        sin_u1, cos_u1 = np.sin(U1), np.cos(U1)
+        sin_u2, cos_u2 = np.sin(U2), np.cos(U2)
+
+        lam = L.copy()
+        for _ in range(max_iterations):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+            cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            # Puntos coincidentes: sin_sigma = 0
+            safe_sin_sigma = np.where(sin_sigma == 0, 1.0, sin_sigma)
+            sin_alpha = cos_u1 * cos_u2 * sin_lam / safe_sin_sigma
+            cos2_alpha = 1 - sin_alpha ** 2
+            # Líneas ecuatoriales: cos2_alpha = 0
+            safe_cos2_alpha = np.where(cos2_alpha == 0, 1.0, cos2_alpha)
+            cos_2sm = np.where(cos2_alpha == 0, 0.0, cos_sigma - 2 * sin_u1 * sin_u2 / safe_cos2_alpha)
+            C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+            lam_prev = lam
+            lam = L + (1 - C) * f * sin_alpha * (
+                sigma + C * sin_sigma * (cos_2sm + C * cos_sigma * (-1 + 2 * cos_2sm ** 2))
+            )
+            if np.all(np.abs(lam - lam_prev) < tolerance):
+                break
+
+        u2 = cos2_alpha * (a ** 2 - b ** 2) / b ** 2
+        A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+        B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+        delta_sigma = B * sin_sigma * (cos_2sm + B / 4 * (
+            cos_sigma * (-1 + 2 * cos_2sm ** 2)
+            - B / 6 * cos_2sm * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sm ** 2)
+        ))
+        distance = b * A * (sigma - delta_sigma)
+
+        sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+        azimuth1 = np.degrees(np.arctan2(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)) % 360
+        azimuth2 = np.degrees(np.arctan2(cos_u1 * sin_lam, -sin_u1 * cos_u2 + cos_u1 * sin_u2 * cos_lam)) % 360
+        coincident = sin_sigma == 0
+        azimuth1[coincident] = 0.0
+        azimuth2[coincident] = 0.0
+        return distance, azimuth1, azimuth2
+
+    def ring_measures(self, points, lonlat=None):
+        """
+        Mide todos los lados de un anillo abierto (sin punto de cierre repetido)
+
+        :param points: Vértices del anillo en el CRS de entrada
+        :type points: list of QgsPointXY
+
+        :param lonlat: Los mismos vértices ya pasados por to_geographic (evita transformarlos otra vez)
+        :type lonlat: tuple of numpy.ndarray
+
+        :returns: Longitudes (m), azimuts de salida y azimuts de llegada de
+            cada lado i -> i+1 (el último lado cierra el anillo)
+        :rtype: tuple of numpy.ndarray
+        """
+        lon, lat = lonlat if lonlat is not None else self.to_geographic(points)
+        return self.inverse(lon, lat, np.roll(lon, -1), np.roll(lat, -1))
+
+    def ring_area(self, points, lonlat=None):
+        """
+        Área de un anillo sobre la esfera autálica del elipsoide (lados como círculos máximos)
+
+        :param points: Vértices del anillo en el CRS de entrada
+        :type points: list of QgsPointXY
+
+        :param lonlat: Los mismos vértices ya pasados por to_geographic
+        :type lonlat: tuple of numpy.ndarray
+
+        :returns: Área en metros cuadrados
+        :rtype: float
+        """
+        lon, lat = lonlat if lonlat is not None else self.to_geographic(points)
+        beta = np.arcsin(np.clip(self._authalic_q(np.sin(np.radians(lat))) / self._qp, -1.0, 1.0))
+        lam = np.radians(lon)
+        # Desenrollar longitudes para anillos que cruzan el antimeridiano
+        dlam = np.remainder(np.roll(lam, -1) - lam + np.pi, 2 * np.pi) - np.pi
+        t1 = np.tan(beta / 2)
+        t2 = np.roll(t1, -1)
+        excess = 2 * np.arctan2(np.tan(dlam / 2) * (t1 + t2), 1 + t1 * t2)
+        return float(abs(excess.sum()) * self.authalic_radius ** 2)
+
+    def ground_factor(self, points, mean_height, lonlat=None):
+        """
+        Factor de elevación para pasar de distancias elipsoidales a distancias de terreno
+
+        :param points: Vértices usados para estimar la latitud media
+        :type points: list of QgsPointXY
+
+        :param mean_height: Altura elipsoidal media del terreno en metros
+        :type mean_height: float
+
+        :param lonlat: Los mismos vértices ya pasados por to_geographic
+        :type lonlat: tuple of numpy.ndarray
+
+        :returns: Factor multiplicativo para distancias (elevarlo al cuadrado para áreas)
+        :rtype: float
+        """
+        _, lat = lonlat if lonlat is not None else self.to_geographic(points)
+        sin2 = np.sin(np.radians(lat.mean())) ** 2
+        # Radio medio gaussiano sqrt(M * N) en la latitud media
+        w = 1 - self.e2 * sin2
+        radius = self.a * np.sqrt(1 - self.e2) / w
+        return float((radius + mean_height) / radius)
+
+    def scale_factor(self, lonlat):
+        """
+        Factor de escala de la proyección en el centro de un anillo (distancia de
+        cuadrícula / distancia elipsoidal), según PROJ
+
+        :param lonlat: Vértices pasados por to_geographic
+        :type lonlat: tuple of numpy.ndarray
+
+        :returns: Factor de escala, o None si el CRS es geográfico o PROJ no lo calcula
+        :rtype: float
+        """
+        if self._transform is None:
+            return None
+        from qgis.core import QgsPoint
+
+        lon, lat = lonlat
+        # factors() recibe un QgsPoint (no admite QgsPointXY)
+        factors = self.crs.factors(QgsPoint(float(lon.mean()), float(lat.mean())))
+        if not factors.isValid():
+            return None
+        # Media geométrica de las escalas meridiana y paralela (iguales en proyecciones conformes)
+        return float(np.sqrt(factors.meridionalScale() * factors.parallelScale()))
+
+    def _authalic_q(self, sin_lat):
+        """Función q(φ) de la latitud autálica."""
+        e2 = self.e2
+        if e2 == 0:
+            return 2 * sin_lat
+        e = np.sqrt(e2)
+        es = e * sin_lat
+        return (1 - e2) * (sin_lat / (1 - es ** 2) - np.log((1 - es) / (1 + es)) / (2 * e))
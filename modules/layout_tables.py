@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ LayoutTables
+                                 A QGIS plugin
+ Tablas de vértices paginadas para composiciones de impresión y atlas
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+from qgis.core import (
+    QgsProject, QgsField, QgsFeature, QgsGeometry, QgsFeatureRequest, QgsVectorDataProvider,
+    QgsPrintLayout, QgsLayoutItemMap, QgsLayoutItemLabel, QgsLayoutItemAttributeTable,
+    QgsLayoutFrame, QgsLayoutMultiFrame, QgsLayoutPoint, QgsLayoutSize, QgsUnitTypes,
+    QgsMessageLog, Qgis
+)
+from PyQt5.QtCore import QVariant
+
+from .output_backend import OutputBackend
+from .run_profiler import RunProfiler
+
+
+class LayoutTableBuilder:
+    """
+    Genera un atlas con una lámina por cada página de la tabla de vértices de
+    cada parcela.
+
+    La tabla de vértices se copia una sola vez a un GeoPackage con un índice
+    sobre ID_Poligono y el número de página ya calculado: cada lámina del atlas
+    filtra sus filas por igualdad sobre columnas indexadas, sin recorrer la
+    capa de vértices completa.
+    """
+
+    # Columnas de la tabla impresa (las de la tabla del README)
+    DEFAULT_COLUMNS = ['LADO', 'Este', 'Norte', 'Distancia', 'Azimut', 'ang_int']
+
+    # Filas de la tabla por lámina
+    ROWS_PER_PAGE = 25
+
+    # Campos que debe tener la capa de vértices (la que crea Segmentator)
+    KEY_FIELDS = ('ID_Poligono', 'ID_Vertice')
+
+    # Filtro de la tabla en cada lámina del atlas
+    PAGE_FILTER = (
+        "\"ID_Poligono\" = attribute(@atlas_feature, 'ID_Poligono') "
+        "AND \"PAGINA\" = attribute(@atlas_feature, 'PAGINA')"
+    )
+
+    def __init__(self):
+        """Constructor."""
+        # Medición por etapas de la última ejecución (ver RunProfiler)
+        self.trace_memory = False
+        self.last_profile = None
+
+    def read_parcels(self, vertex_layer, columns):
+        """
+        Lee la capa de vértices en una sola pasada, agrupada por parcela
+
+        :returns: {ID_Poligono: [(ID_Vertice, valores de columns, punto)]}
+        :rtype: dict
+        """
+        fields = vertex_layer.fields()
+        indexes = [fields.indexOf(name) for name in self.KEY_FIELDS + tuple(columns)]
+        request = QgsFeatureRequest().setSubsetOfAttributes(indexes)
+
+        parcels = {}
+        for feature in vertex_layer.getFeatures(request):
+            attributes = feature.attributes()
+            values = [attributes[i] for i in indexes]
+            geometry = feature.geometry()
+            point = None if geometry.isEmpty() else geometry.asPoint()
+            parcels.setdefault(values[0], []).append((values[1], values[2:], point))
+        for rows in parcels.values():
+            rows.sort(key=lambda row: row[0])
+        return parcels
+
+    @staticmethod
+    def parcel_geometry(points):
+        """Contorno de la parcela a partir de sus vértices (extensión del mapa de cada lámina)."""
+        points = [point for point in points if point is not None]
+        if len(points) >= 3:
+            return QgsGeometry.fromPolygonXY([points])
+        if points:
+            return QgsGeometry.fromMultiPointXY(points).buffer(1.0, 4)
+        return QgsGeometry()
+
+    def create_tables(self, vertex_layer, parcels, columns, rows_per_page):
+        """
+        Escribe la capa de láminas (cobertura del atlas) y la tabla paginada en un
+        GeoPackage temporal, con índice de atributos sobre ID_Poligono
+
+        :returns: (capa de láminas, tabla de vértices paginada, backend)
+        :rtype: tuple
+        """
+        backend = OutputBackend()
+        # El índice de atributos necesita un proveedor en disco: siempre GeoPackage
+        backend.backend = OutputBackend.GEOPACKAGE
+        crs = vertex_layer.crs()
+        source_fields = vertex_layer.fields()
+
+        sheet_fields = [
+            QgsField("ID_Poligono", QVariant.Int),
+            QgsField("PAGINA", QVariant.Int),
+            QgsField("PAGINAS", QVariant.Int)
+        ]
+        sheets = backend.create_layer("Polygon", crs, "Láminas", sheet_fields)
+        table_fields = [
+            QgsField("ID_Poligono", QVariant.Int),
+            QgsField("PAGINA", QVariant.Int),
+            QgsField("ID_Vertice", QVariant.Int)
+        ] + [QgsField(source_fields.field(name)) for name in columns]
+        table = backend.create_layer("None", crs, "Tabla de vértices", table_fields)
+        sheet_prefix = OutputBackend.attribute_prefix(sheets, sheet_fields)
+        table_prefix = OutputBackend.attribute_prefix(table, table_fields)
+
+        sheet_features = []
+        table_features = []
+        for parcel_id in sorted(parcels, key=lambda value: (value is None, value)):
+            rows = parcels[parcel_id]
+            pages = (len(rows) + rows_per_page - 1) // rows_per_page
+            geometry = self.parcel_geometry([point for _, _, point in rows])
+            for page in range(1, pages + 1):
+                feature = QgsFeature(sheets.fields())
+                feature.setGeometry(geometry)
+                feature.setAttributes(sheet_prefix + [parcel_id, page, pages])
+                sheet_features.append(feature)
+            # Filas en orden de vértice: el orden de inserción es el de la tabla impresa
+            for ordinal, (vertex_id, values, _) in enumerate(rows):
+                feature = QgsFeature(table.fields())
+                feature.setAttributes(table_prefix + [parcel_id, ordinal // rows_per_page + 1, vertex_id] + values)
+                table_features.append(feature)
+        sheets.dataProvider().addFeatures(sheet_features)
+        table.dataProvider().addFeatures(table_features)
+        sheets.updateExtents()
+
+        provider = table.dataProvider()
+        if provider.capabilities() & QgsVectorDataProvider.CreateAttributeIndex:
+            provider.createAttributeIndex(table.fields().indexOf("ID_Poligono"))
+        else:
+            QgsMessageLog.logMessage(
+                "El proveedor no admite índices de atributos: cada lámina recorrerá la tabla",
+                "YF Tools Plus",
+                Qgis.Warning
+            )
+        return sheets, table, backend
+
+    def create_layout(self, name, sheets, table, columns, rows_per_page):
+        """
+        Composición A4 vertical con el atlas sobre las láminas: mapa de la
+        parcela, título y la tabla filtrada por parcela y página
+
+        :rtype: QgsPrintLayout
+        """
+        project = QgsProject.instance()
+        layout = QgsPrintLayout(project)
+        layout.initializeDefaults()
+        layout.setName(name)
+
+        atlas = layout.atlas()
+        atlas.setCoverageLayer(sheets)
+        atlas.setEnabled(True)
+        atlas.setSortFeatures(True)
+        atlas.setSortExpression("\"ID_Poligono\" * 10000 + \"PAGINA\"")
+        atlas.setFilenameExpression("'parcela_' || \"ID_Poligono\" || '_' || \"PAGINA\"")
+
+        title = QgsLayoutItemLabel(layout)
+        title.setText(
+            "Parcela [% \"ID_Poligono\" %] — lámina [% \"PAGINA\" %] de [% \"PAGINAS\" %]"
+        )
+        title.attemptMove(QgsLayoutPoint(10, 8, QgsUnitTypes.LayoutMillimeters))
+        title.attemptResize(QgsLayoutSize(190, 10, QgsUnitTypes.LayoutMillimeters))
+        layout.addLayoutItem(title)
+
+        map_item = QgsLayoutItemMap(layout)
+        map_item.attemptMove(QgsLayoutPoint(10, 20, QgsUnitTypes.LayoutMillimeters))
+        map_item.attemptResize(QgsLayoutSize(190, 140, QgsUnitTypes.LayoutMillimeters))
+        map_item.setAtlasDriven(True)
+        map_item.setAtlasScalingMode(QgsLayoutItemMap.Auto)
+        map_item.setAtlasMargin(0.1)
+        map_item.zoomToExtent(sheets.extent())
+        layout.addLayoutItem(map_item)
+
+        vertex_table = QgsLayoutItemAttributeTable.create(layout)
+        vertex_table.setVectorLayer(table)
+        vertex_table.setDisplayedFields(list(columns))
+        vertex_table.setFilterFeatures(True)
+        vertex_table.setFeatureFilter(self.PAGE_FILTER)
+        vertex_table.setMaximumNumberOfFeatures(rows_per_page)
+        vertex_table.setResizeMode(QgsLayoutMultiFrame.UseExistingFrames)
+        frame = QgsLayoutFrame(layout, vertex_table)
+        frame.attemptMove(QgsLayoutPoint(10, 165, QgsUnitTypes.LayoutMillimeters))
+        frame.attemptResize(QgsLayoutSize(190, 125, QgsUnitTypes.LayoutMillimeters))
+        vertex_table.addFrame(frame)
+        layout.addMultiFrame(vertex_table)
+
+        # Una composición anterior con el mismo nombre se reemplaza
+        manager = project.layoutManager()
+        existing = manager.layoutByName(name)
+        if existing is not None:
+            manager.removeLayout(existing)
+        manager.addLayout(layout)
+        return layout
+
+    def build(self, vertex_layer, rows_per_page=ROWS_PER_PAGE, columns=None, name=None):
+        """
+        Crea la capa de láminas, la tabla paginada y la composición con atlas
+
+        :param vertex_layer: Capa de vértices (con ID_Poligono e ID_Vertice)
+        :type vertex_layer: QgsVectorLayer
+
+        :param rows_per_page: Filas de la tabla por lámina
+        :type rows_per_page: int
+
+        :param columns: Columnas de la tabla (por defecto, DEFAULT_COLUMNS)
+        :type columns: list of str
+
+        :param name: Nombre de la composición (por defecto, 'Atlas <capa>')
+        :type name: str
+
+        :returns: (composición, número de parcelas, número de láminas)
+        :rtype: tuple
+        """
+        columns = list(columns or self.DEFAULT_COLUMNS)
+        rows_per_page = max(1, int(rows_per_page))
+        if not vertex_layer or not vertex_layer.isValid():
+            raise Exception("La capa de vértices no es válida.")
+        names = vertex_layer.fields().names()
+        missing = [field for field in self.KEY_FIELDS + tuple(columns) if field not in names]
+        if missing:
+            raise Exception(
+                f"La capa '{vertex_layer.name()}' no es una tabla de vértices del segmentador; "
+                f"faltan los campos: {', '.join(missing)}"
+            )
+
+        profiler = self.last_profile = RunProfiler('Tablas de vértices para atlas', self.trace_memory)
+        try:
+            with profiler.stage('lectura', 'vértices') as stage:
+                parcels = self.read_parcels(vertex_layer, columns)
+                stage.items = sum(len(rows) for rows in parcels.values())
+
+            with profiler.stage('tabla_paginada', 'láminas') as stage:
+                sheets, table, backend = self.create_tables(vertex_layer, parcels, columns, rows_per_page)
+                stage.items = sheets.featureCount()
+
+            with profiler.stage('composicion'):
+                project = QgsProject.instance()
+                project.addMapLayer(sheets)
+                project.addMapLayer(table)
+                layout = self.create_layout(
+                    name or f"Atlas {vertex_layer.name()}", sheets, table, columns, rows_per_page
+                )
+        finally:
+            profiler.finish()
+
+        QgsMessageLog.logMessage(
+            f"Atlas '{layout.name()}': {len(parcels)} parcela(s) en {sheets.featureCount()} lámina(s) "
+            f"de {rows_per_page} fila(s); tablas en {backend.path}",
+            "YF Tools Plus",
+            Qgis.Success
+        )
+        return layout, len(parcels), sheets.featureCount()
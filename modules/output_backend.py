@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ OutputBackend
+                                 A QGIS plugin
+ Elección del almacenamiento de las capas de salida según su tamaño estimado
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import os
+import re
+import shutil
+import tempfile
+from qgis.core import (
+    QgsVectorLayer, QgsVectorFileWriter, QgsFields, QgsFeatureRequest, QgsWkbTypes,
+    QgsCoordinateTransformContext, QgsProject
+)
+
+
+class OutputBackend:
+    """Crea las capas de salida en memoria o, si el resultado estimado es grande, en un GeoPackage temporal"""
+
+    # Umbral por defecto del tamaño estimado para pasar a disco (MB)
+    DEFAULT_THRESHOLD_MB = 256
+
+    # Coste aproximado en memoria de una entidad (QgsFeature, atributos e índice del proveedor)
+    BYTES_PER_FEATURE = 600
+
+    # Coste de cada vértice de la geometría (x, y en doble precisión)
+    BYTES_PER_VERTEX = 16
+
+    # Entidades leídas para estimar el número medio de vértices
+    SAMPLE_FEATURES = 200
+
+    MEMORY = 'memory'
+    GEOPACKAGE = 'gpkg'
+
+    # Carpetas temporales creadas en la sesión (ver remove_temp_dirs)
+    TEMP_DIRS = []
+
+    def __init__(self, threshold_mb=DEFAULT_THRESHOLD_MB, temp_dir=None):
+        """
+        Constructor.
+
+        :param threshold_mb: Tamaño estimado a partir del cual se usa un GeoPackage (0 = siempre en memoria)
+        :type threshold_mb: float
+
+        :param temp_dir: Carpeta de los GeoPackage temporales (por defecto, la temporal del sistema)
+        :type temp_dir: str
+        """
+        self.threshold_mb = threshold_mb
+        self.temp_dir = temp_dir
+        self.backend = self.MEMORY
+        self.estimated_bytes = 0
+        self.path = None
+
+    @classmethod
+    def estimate_vertices(cls, layer):
+        """
+        Número de entidades y de vértices de una capa, extrapolando el promedio
+        de vértices de las primeras entidades (sin recorrer toda la capa)
+
+        :param layer: Capa de origen
+        :type layer: QgsVectorLayer
+
+        :returns: (entidades, vértices estimados)
+        :rtype: tuple
+        """
+        count = max(layer.featureCount(), 0)
+        request = QgsFeatureRequest().setNoAttributes().setLimit(cls.SAMPLE_FEATURES)
+        sampled = vertices = 0
+        for feature in layer.getFeatures(request):
+            geometry = feature.geometry()
+            if not geometry.isEmpty():
+                vertices += geometry.constGet().nCoordinates()
+            sampled += 1
+        if not sampled:
+            return count, 0
+        return count, int(vertices * count / sampled)
+
+    def choose(self, num_features, num_vertices=0):
+        """
+        Elige el almacenamiento para un resultado del tamaño dado
+
+        :param num_features: Entidades que se van a crear
+        :type num_features: int
+
+        :param num_vertices: Vértices que se van a crear en total
+        :type num_vertices: int
+
+        :returns: MEMORY o GEOPACKAGE
+        :rtype: str
+        """
+        self.estimated_bytes = num_features * self.BYTES_PER_FEATURE + num_vertices * self.BYTES_PER_VERTEX
+        over = self.threshold_mb and self.estimated_bytes > self.threshold_mb * 1024 * 1024
+        self.backend = self.GEOPACKAGE if over else self.MEMORY
+        return self.backend
+
+    def describe(self):
+        """Texto de una línea con el almacenamiento elegido y el tamaño estimado."""
+        size = f"{self.estimated_bytes / (1024 * 1024):.1f} MB estimados"
+        if self.backend == self.GEOPACKAGE:
+            return f"Salida en GeoPackage temporal con índice espacial ({size}): {self.path}"
+        return f"Salida en memoria ({size})"
+
+    def create_layer(self, geometry, crs, name, fields):
+        """
+        Crea una capa vacía con los campos dados en el almacenamiento elegido
+
+        :param geometry: 'Point', 'LineString' o 'Polygon'
+        :type geometry: str
+
+        :param crs: Sistema de referencia de la capa
+        :type crs: QgsCoordinateReferenceSystem
+
+        :param fields: Campos de la capa
+        :type fields: list of QgsField
+
+        :rtype: QgsVectorLayer
+        """
+        if self.backend == self.MEMORY:
+            layer = QgsVectorLayer(f"{geometry}?crs={crs.toWkt()}", name, "memory")
+            layer.dataProvider().addAttributes(fields)
+            layer.updateFields()
+            return layer
+
+        if self.path is None:
+            folder = self.temp_dir
+            if folder is None:
+                folder = tempfile.mkdtemp(prefix='yf_tools_')
+                self.TEMP_DIRS.append(folder)
+            os.makedirs(folder, exist_ok=True)
+            self.path = os.path.join(folder, 'resultado.gpkg')
+        table = re.sub(r'\W+', '_', name).strip('_').lower() or 'capa'
+
+        qgs_fields = QgsFields()
+        for field in fields:
+            qgs_fields.append(field)
+        options = QgsVectorFileWriter.SaveVectorOptions()
+        options.driverName = "GPKG"
+        options.layerName = table
+        options.layerOptions = ['SPATIAL_INDEX=YES']
+        if os.path.exists(self.path):
+            options.actionOnExistingFile = QgsVectorFileWriter.CreateOrOverwriteLayer
+        writer = QgsVectorFileWriter.create(
+            self.path, qgs_fields, QgsWkbTypes.parseType(geometry), crs,
+            QgsCoordinateTransformContext(), options
+        )
+        if writer.hasError() != QgsVectorFileWriter.NoError:
+            raise Exception(f"No se pudo crear el GeoPackage temporal: {writer.errorMessage()}")
+        del writer
+
+        layer = QgsVectorLayer(f"{self.path}|layername={table}", name, "ogr")
+        if not layer.isValid():
+            raise Exception(f"No se pudo abrir la capa '{table}' del GeoPackage temporal")
+        return layer
+
+    @classmethod
+    def remove_temp_dirs(cls):
+        """
+        Borra las carpetas temporales creadas por create_layer cuyo GeoPackage
+        ya no usa ninguna capa del proyecto (al cerrar el proyecto, todas).
+        Las que no se pueden borrar se vuelven a intentar en la siguiente llamada.
+        """
+        in_use = {
+            os.path.normcase(os.path.dirname(layer.source().split('|')[0]))
+            for layer in QgsProject.instance().mapLayers().values()
+        }
+        for folder in list(cls.TEMP_DIRS):
+            if os.path.normcase(folder) in in_use:
+                continue
+            shutil.rmtree(folder, ignore_errors=True)
+            if not os.path.exists(folder):
+                cls.TEMP_DIRS.remove(folder)
+
+    @staticmethod
+    def attribute_prefix(layer, fields):
+        """
+        Valores iniciales que preceden a los atributos propios de la capa
+        (el GeoPackage añade el campo fid al principio)
+
+        :rtype: list
+        """
+        return [None] * (len(layer.fields()) - len(fields))
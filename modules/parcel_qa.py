@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ ParcelQA
+                                 A QGIS plugin
+ Control de solapes y huecos entre parcelas vecinas con índice espacial
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+from qgis.core import (
+    QgsVectorLayer, QgsField, QgsFeature, QgsGeometry, QgsFeatureRequest,
+    QgsSpatialIndex, QgsWkbTypes, QgsFillSymbol, QgsSingleSymbolRenderer,
+    QgsMessageLog, Qgis
+)
+from PyQt5.QtCore import QVariant
+
+from .run_profiler import RunProfiler
+
+
+class ParcelQA:
+    """Clase para detectar solapes y huecos entre parcelas sin comparar todos los pares"""
+
+    # Opciones por defecto de check
+    DEFAULT_OPTIONS = {
+        'min_area': 0.01,       # Área mínima (unidades del mapa²) de un solape o hueco para reportarlo
+        'max_gap_area': 0.0     # Área máxima de un hueco (0 = todos); los grandes suelen ser vías o áreas libres
+    }
+
+    def __init__(self):
+        """Constructor."""
+        # Medición por etapas de la última ejecución (ver RunProfiler)
+        self.trace_memory = False
+        self.last_profile = None
+
+    @staticmethod
+    def polygonal(geometry):
+        """Parte poligonal de una geometría (las intersecciones pueden incluir líneas y puntos)."""
+        if geometry is None or geometry.isEmpty():
+            return None
+        if geometry.type() == QgsWkbTypes.PolygonGeometry:
+            return geometry
+        parts = [
+            part for part in geometry.asGeometryCollection()
+            if part.type() == QgsWkbTypes.PolygonGeometry
+        ]
+        return QgsGeometry.collectGeometry(parts) if parts else None
+
+    def find_overlaps(self, geometries, index, min_area, stage=None):
+        """
+        Solapes entre pares de parcelas. Cada parcela se prepara una vez y solo
+        se compara con las candidatas del índice cuyo rectángulo la toca.
+
+        :param geometries: Geometrías por id de entidad
+        :type geometries: dict
+
+        :param index: Índice espacial de las mismas geometrías
+        :type index: QgsSpatialIndex
+
+        :returns: Lista de (id_a, id_b, geometría del solape)
+        :rtype: list
+        """
+        overlaps = []
+        for fid, geometry in geometries.items():
+            engine = QgsGeometry.createGeometryEngine(geometry.constGet())
+            engine.prepareGeometry()
+            for other_id in index.intersects(geometry.boundingBox()):
+                # Cada par se evalúa una sola vez
+                if other_id <= fid or other_id not in geometries:
+                    continue
+                other = geometries[other_id].constGet()
+                # Vecinos que solo comparten borde: interiores disjuntos
+                if not engine.intersects(other) or not engine.relatePattern(other, '2********'):
+                    continue
+                overlap = self.polygonal(geometry.intersection(geometries[other_id]))
+                if overlap is not None and overlap.area() >= min_area:
+                    overlaps.append((fid, other_id, overlap))
+            if stage is not None:
+                stage.items += 1
+        return overlaps
+
+    def find_gaps(self, geometries, min_area, max_gap_area):
+        """
+        Huecos: anillos interiores de la unión de todas las parcelas que no
+        corresponden a ninguna parcela
+
+        :returns: Lista de geometrías de hueco
+        :rtype: list of QgsGeometry
+        """
+        union = QgsGeometry.unaryUnion(list(geometries.values()))
+        if union.isEmpty():
+            return []
+        parts = union.asMultiPolygon() if union.isMultipart() else [union.asPolygon()]
+        gaps = []
+        for polygon in parts:
+            for ring in polygon[1:]:
+                gap = QgsGeometry.fromPolygonXY([ring])
+                area = gap.area()
+                if area >= min_area and (not max_gap_area or area <= max_gap_area):
+                    gaps.append(gap)
+        return gaps
+
+    def error_layer(self, crs, overlaps, gaps):
+        """Capa en memoria con un polígono por solape o hueco, con su área."""
+        layer = QgsVectorLayer(f"Polygon?crs={crs.toWkt()}", "Errores de topología", "memory")
+        provider = layer.dataProvider()
+        provider.addAttributes([
+            QgsField("TIPO", QVariant.String),      # 'solape' o 'hueco'
+            QgsField("ID_A", QVariant.LongLong),    # Parcelas implicadas (solo solapes)
+            QgsField("ID_B", QVariant.LongLong),
+            QgsField("AREA", QVariant.Double)
+        ])
+        layer.updateFields()
+
+        features = []
+        for id_a, id_b, geometry in overlaps:
+            feature = QgsFeature(layer.fields())
+            feature.setGeometry(geometry)
+            feature.setAttributes(['solape', id_a, id_b, round(geometry.area(), 4)])
+            features.append(feature)
+        for geometry in gaps:
+            feature = QgsFeature(layer.fields())
+            feature.setGeometry(geometry)
+            feature.setAttributes(['hueco', None, None, round(geometry.area(), 4)])
+            features.append(feature)
+        provider.addFeatures(features)
+        layer.updateExtents()
+
+        layer.setRenderer(QgsSingleSymbolRenderer(QgsFillSymbol.createSimple({
+            'color': '255,0,0,120',
+            'outline_color': '#c00000',
+            'outline_width': '0.4'
+        })))
+        return layer
+
+    def check(self, layer, options=None):
+        """
+        Revisa solapes y huecos entre las parcelas de una capa
+
+        :param layer: Capa de parcelas (polígonos)
+        :type layer: QgsVectorLayer
+
+        :param options: Opciones (ver DEFAULT_OPTIONS)
+        :type options: dict
+
+        :returns: (capa de errores, número de solapes, número de huecos)
+        :rtype: tuple
+        """
+        options = dict(self.DEFAULT_OPTIONS, **(options or {}))
+        if not layer or layer.geometryType() != QgsWkbTypes.PolygonGeometry:
+            raise Exception("La capa seleccionada no es válida o no es de tipo polígono.")
+
+        profiler = self.last_profile = RunProfiler('Revisar solapes y huecos', self.trace_memory)
+        try:
+            with profiler.stage('indice', 'parcelas') as stage:
+                geometries = {}
+                request = QgsFeatureRequest().setNoAttributes()
+                for feature in layer.getFeatures(request):
+                    geometry = feature.geometry()
+                    if geometry.isEmpty():
+                        continue
+                    if not geometry.isGeosValid():
+                        # Las autointersecciones harían fallar la intersección
+                        geometry = geometry.makeValid()
+                    geometries[feature.id()] = geometry
+                # Carga masiva (árbol STR): mucho más rápida que insertar una a una
+                index = QgsSpatialIndex(layer.getFeatures(request))
+                stage.items = len(geometries)
+
+            with profiler.stage('solapes', 'parcelas') as stage:
+                overlaps = self.find_overlaps(geometries, index, options['min_area'], stage)
+
+            with profiler.stage('huecos'):
+                gaps = self.find_gaps(geometries, options['min_area'], options['max_gap_area'])
+
+            with profiler.stage('capa_errores', 'entidades') as stage:
+                errors = self.error_layer(layer.crs(), overlaps, gaps)
+                stage.items = len(overlaps) + len(gaps)
+        finally:
+            profiler.finish()
+
+        QgsMessageLog.logMessage(
+            f"Revisión de '{layer.name()}': {len(geometries)} parcela(s), "
+            f"{len(overlaps)} solape(s) y {len(gaps)} hueco(s)",
+            "YF Tools Plus",
+            Qgis.Warning if overlaps or gaps else Qgis.Success
+        )
+        return errors, len(overlaps), len(gaps)
@@ -12,9 +12,8 @@
 """
 
 import os
-import csv
 from qgis.core import (
-    QgsVectorLayer, QgsField, QgsFeature, QgsGeometry, QgsPointXY, QgsProject,
+    QgsField, QgsFeature, QgsGeometry, QgsPointXY, QgsProject,
     QgsSimpleLineSymbolLayer, QgsSingleSymbolRenderer, QgsFillSymbol,
     QgsPalLayerSettings, QgsTextFormat, QgsTextBufferSettings, 
     QgsVectorLayerSimpleLabeling, QgsCoordinateReferenceSystem,
@@ -23,12 +22,44 @@ from qgis.core import (
 from PyQt5.QtCore import QVariant
 from PyQt5.QtGui import QColor, QFont
 
+from .geodesy import GeodesicCalculator
+from .run_profiler import RunProfiler
+from .coordinate_parser import CoordinateParser
+from .result_store import ResultTable
+from .output_backend import OutputBackend
+from .vertex_orderer import VertexOrderer
+
 class PolygonCreator:
     """Clase para crear polígonos a partir de archivos CSV"""
     
+    # Opciones por defecto de create_polygon
+    DEFAULT_OPTIONS = {
+        'measure_mode': 'planar',      # 'planar' o 'ellipsoidal'
+        'ground_correction': False,    # Convertir área y perímetro a terreno
+        'mean_height': 0.0,            # Altura elipsoidal media en metros
+        'memory_threshold_mb': OutputBackend.DEFAULT_THRESHOLD_MB,  # Tamaño estimado a partir del cual la capa va a un GeoPackage temporal (0 = siempre en memoria)
+        'vertex_order': VertexOrderer.AUTO  # 'auto' (si se autointersecta), 'always' o 'never' (orden del archivo)
+    }
+    
+    # Estilo por defecto de la capa de polígono
+    DEFAULT_STYLE = {
+        'polygon_color': '#ffffff',
+        'border_color': '#ff340b',
+        'border_width': '0.26',
+        'label_font': 'Arial',
+        'label_size': '9',
+        'label_color': '#ff340b'
+    }
+    
     def __init__(self):
         """Constructor."""
-        pass
+        # Medición por etapas de la última ejecución (ver RunProfiler)
+        self.trace_memory = False
+        self.last_profile = None
+        # Resultado en columnas del último polígono: {'poligono': ResultTable}
+        self.last_results = None
+        # Almacenamiento elegido para la última capa (ver OutputBackend)
+        self.last_backend = None
     
     def get_csv_fields(self, csv_path):
         """
@@ -49,10 +80,8 @@ class PolygonCreator:
                 )
                 return []
             
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                headers = next(reader)
-                return headers
+            # Respeta el delimitador y la codificación del archivo (p. ej. ';' y cp1252)
+            return CoordinateParser().read_header(csv_path)
                 
         except Exception as e:
             QgsMessageLog.logMessage(
@@ -62,7 +91,277 @@ class PolygonCreator:
             )
             return []
         
-    def create_polygon(self, csv_path, field_x, field_y, crs, style_params=None):
+    def build_label_text(self, area, perimeter):
+        """
+        Construye el texto de etiqueta del polígono (equivalente a la expresión de etiquetado)
+        
+        :param area: Área en hectáreas
+        :type area: float
+        
+        :param perimeter: Perímetro en metros
+        :type perimeter: float
+        
+        :returns: Texto de la etiqueta en tres líneas
+        :rtype: str
+        """
+        return (
+            "PARCELA GEOREFERENCIADA\n"
+            f"AREA : {round(area, 4)} Ha.\n"
+            f"PERIMETRO : {round(perimeter, 2)} m."
+        )
+        
+    def compute_measures(self, points, crs, options):
+        """
+        Calcula área y perímetro del anillo según el modo de medición
+        
+        :param points: Vértices del polígono
+        :type points: list of QgsPointXY
+        
+        :param crs: CRS de los vértices
+        :type crs: QgsCoordinateReferenceSystem
+        
+        :param options: Opciones de medición (ver DEFAULT_OPTIONS)
+        :type options: dict
+        
+        :returns: Área en metros cuadrados y perímetro en metros
+        :rtype: tuple
+        """
+        ellipsoidal = options['measure_mode'] == 'ellipsoidal' or crs.isGeographic()
+        polygon = QgsGeometry.fromPolygonXY([points])
+        
+        if not ellipsoidal and not options['ground_correction']:
+            return polygon.area(), polygon.length()
+        
+        # Anillo abierto (sin el punto de cierre repetido), transformado una sola vez
+        ring = points[:-1] if points[0] == points[-1] else points
+        calculator = GeodesicCalculator(crs)
+        lonlat = calculator.to_geographic(ring)
+        elevation = (
+            calculator.ground_factor(ring, float(options['mean_height']), lonlat)
+            if options['ground_correction'] else 1.0
+        )
+        
+        if ellipsoidal:
+            distances, _, _ = calculator.ring_measures(ring, lonlat)
+            area = calculator.ring_area(ring, lonlat)
+            return area * elevation ** 2, float(distances.sum()) * elevation
+        
+        # Plano con corrección a terreno: medidas de cuadrícula por el factor
+        # combinado (factor de elevación / factor de escala de la proyección)
+        scale = calculator.scale_factor(lonlat)
+        if scale is None:
+            # Sin factores de PROJ: escala media a partir del perímetro elipsoidal
+            distances, _, _ = calculator.ring_measures(ring, lonlat)
+            scale = polygon.length() / float(distances.sum())
+        factor = elevation / scale
+        return polygon.area() * factor ** 2, polygon.length() * factor
+        
+    def apply_style(self, polygon_layer, style_params, materialize_labels=False):
+        """
+        Aplica la simbología y el etiquetado de la capa de polígonos
+        
+        :param polygon_layer: Capa de polígonos
+        :type polygon_layer: QgsVectorLayer
+        
+        :param style_params: Parámetros de estilo para el polígono
+        :type style_params: dict
+        
+        :param materialize_labels: Etiquetar con el campo ETIQUETA en lugar de una expresión
+        :type materialize_labels: bool
+        """
+        # Aplicar simbología
+        symbol = QgsFillSymbol.createSimple({
+            'color': style_params.get('polygon_color', '#ffffff'),
+            'color_border': style_params.get('border_color', '#ff340b'),
+            'width_border': style_params.get('border_width', '0.26'),
+            'style': 'solid',
+            'style_border': 'solid'
+        })
+        polygon_layer.renderer().setSymbol(symbol)
+        
+        # Aplicar etiquetas
+        label_settings = QgsPalLayerSettings()
+        if materialize_labels:
+            # Texto ya calculado: el motor de etiquetas no evalúa expresiones
+            label_settings.fieldName = "ETIQUETA"
+            label_settings.isExpression = False
+        else:
+            label_settings.fieldName = (
+                "'PARCELA GEOREFERENCIADA' || '\\n' || "
+                "'AREA : ' || round(\"AREA\", 4) || ' Ha.' || '\\n' || "
+                "'PERIMETRO : ' || round(\"PERIMETRO\", 2) || ' m.'"
+            )
+            label_settings.isExpression = True
+        
+        text_format = QgsTextFormat()
+        text_format.setColor(QColor(style_params.get('label_color', '#ff340b')))
+        text_format.setSize(float(style_params.get('label_size', '9')))
+        text_format.setFont(QFont(
+            style_params.get('label_font', 'Arial'), 
+            int(style_params.get('label_size', '9')), 
+            QFont.Bold
+        ))
+        
+        buffer_settings = QgsTextBufferSettings()
+        buffer_settings.setEnabled(True)
+        buffer_settings.setSize(1.0)
+        buffer_settings.setColor(QColor("white"))
+        text_format.setBuffer(buffer_settings)
+        
+        label_settings.setFormat(text_format)
+        
+        # Compatibilidad con QGIS 3.x para placement
+        try:
+            # Para QGIS 3.16+
+            label_settings.placement = Qgis.LabelPlacement.OverPoint
+        except (AttributeError):
+            # Para versiones anteriores de QGIS 3.x
+            try:
+                label_settings.placement = QgsPalLayerSettings.Placement.OverPoint
+            except:
+                # Fallback para versiones muy antiguas
+                label_settings.placement = 0  # OverPoint
+        
+        label_settings.centroidWhole = True
+        
+        polygon_layer.setLabeling(QgsVectorLayerSimpleLabeling(label_settings))
+        polygon_layer.setLabelsEnabled(True)
+        
+    def build_polygon_layer(self, points, crs_obj, style_params, options, profiler=None, name="Polígono"):
+        """
+        Construye la capa de polígono en memoria (con medidas y estilo) a partir
+        de puntos ya leídos, sin añadirla al proyecto
+        
+        :param points: Vértices del polígono, en orden
+        :type points: list of QgsPointXY
+        
+        :param crs_obj: Sistema de referencia de coordenadas de los puntos
+        :type crs_obj: QgsCoordinateReferenceSystem
+        
+        :param style_params: Parámetros de estilo para el polígono
+        :type style_params: dict
+        
+        :param options: Opciones de medición (ver DEFAULT_OPTIONS)
+        :type options: dict
+        
+        :param profiler: Medición por etapas en curso (opcional)
+        :type profiler: RunProfiler
+        
+        :param name: Nombre de la capa
+        :type name: str
+        
+        :returns: Capa de polígono o None si los puntos no son válidos
+        :rtype: QgsVectorLayer or None
+        """
+        profiler = profiler or RunProfiler('Crear polígono')
+        options = dict(self.DEFAULT_OPTIONS, **(options or {}))
+        
+        # Verificar que hay suficientes puntos
+        if len(points) < 3:
+            QgsMessageLog.logMessage(
+                f"Se necesitan al menos 3 puntos para crear un polígono. Solo se encontraron {len(points)} puntos válidos.", 
+                "YF Tools Plus", 
+                Qgis.Critical
+            )
+            return None
+        
+        QgsMessageLog.logMessage(
+            f"Se cargaron {len(points)} puntos correctamente", 
+            "YF Tools Plus", 
+            Qgis.Success
+        )
+        
+        # Puntos ordenados por código o cota en lugar de por el contorno
+        orderer = VertexOrderer()
+        with profiler.stage('ordenamiento', 'vértices') as stage:
+            points = orderer.order(points, options['vertex_order'])
+            stage.items = len(points)
+        if orderer.method != 'archivo':
+            detail = f"; {orderer.duplicates} punto(s) repetido(s) descartado(s)" if orderer.duplicates else ""
+            QgsMessageLog.logMessage(
+                f"El orden del archivo no forma un contorno válido: vértices reordenados "
+                f"({orderer.method.replace('_', ' ')}){detail}",
+                "YF Tools Plus",
+                Qgis.Warning
+            )
+        
+        materialize_labels = style_params.get('materialize_labels', False)
+        
+        # Campos
+        fields = [
+            QgsField("ID", QVariant.Int),
+            QgsField("AREA", QVariant.Double),
+            QgsField("PERIMETRO", QVariant.Double)
+        ]
+        if materialize_labels:
+            fields.append(QgsField("ETIQUETA", QVariant.String))
+        
+        # Crear capa de polígonos en memoria (o en un GeoPackage temporal si es muy grande)
+        backend = self.last_backend = OutputBackend(options['memory_threshold_mb'])
+        backend.choose(1, len(points))
+        polygon_layer = backend.create_layer("Polygon", crs_obj, name, fields)
+        QgsMessageLog.logMessage(backend.describe(), "YF Tools Plus", Qgis.Info)
+        
+        if not polygon_layer.isValid():
+            QgsMessageLog.logMessage(
+                "Error al crear la capa de polígonos", 
+                "YF Tools Plus", 
+                Qgis.Critical
+            )
+            return None
+        
+        provider = polygon_layer.dataProvider()
+        
+        # Crear geometría del polígono
+        with profiler.stage('geometria', 'vértices') as stage:
+            polygon = QgsGeometry.fromPolygonXY([points])
+            stage.items = len(points)
+        
+        if polygon.isEmpty():
+            QgsMessageLog.logMessage(
+                "La geometría del polígono está vacía", 
+                "YF Tools Plus", 
+                Qgis.Critical
+            )
+            return None
+        
+        # Crear feature
+        feature = QgsFeature(polygon_layer.fields())
+        feature.setGeometry(polygon)
+        
+        # Calcular área y perímetro
+        with profiler.stage('atributos'):
+            area, perimeter = self.compute_measures(points, crs_obj, options)
+        area = area / 10000  # Convertir a hectáreas
+        
+        QgsMessageLog.logMessage(
+            f"Polígono creado - Área: {area:.4f} Ha, Perímetro: {perimeter:.2f} m", 
+            "YF Tools Plus", 
+            Qgis.Success
+        )
+        
+        # Añadir atributos
+        attributes = [1, round(area, 4), round(perimeter, 2)]
+        if materialize_labels:
+            attributes.append(self.build_label_text(area, perimeter))
+        feature.setAttributes(OutputBackend.attribute_prefix(polygon_layer, fields) + attributes)
+        
+        # Añadir feature a la capa
+        with profiler.stage('insercion') as stage:
+            provider.addFeatures([feature])
+            polygon_layer.updateExtents()
+            stage.items = 1
+        
+        table = ResultTable.from_fields(name, fields, 'polygon', polygon_layer.id())
+        table.append(attributes, points)
+        self.last_results = {'poligono': table}
+        
+        with profiler.stage('estilo'):
+            self.apply_style(polygon_layer, style_params, materialize_labels)
+        
+        return polygon_layer
+        
+    def create_polygon(self, csv_path, field_x, field_y, crs, style_params=None, options=None):
         """
         Crea un polígono a partir de coordenadas en un archivo CSV
         
@@ -79,12 +378,19 @@ class PolygonCreator:
         :type crs: str
         
         :param style_params: Parámetros de estilo para el polígono
+            ('materialize_labels' guarda el texto de la etiqueta en el campo ETIQUETA)
         :type style_params: dict
         
+        :param options: Opciones de medición (ver DEFAULT_OPTIONS)
+        :type options: dict
+        
         :returns: Capa de polígono creada
         :rtype: QgsVectorLayer or None
         """
+        profiler = self.last_profile = RunProfiler('Crear polígono', self.trace_memory)
         try:
+            options = dict(self.DEFAULT_OPTIONS, **(options or {}))
+            
             QgsMessageLog.logMessage(
                 f"========== INICIANDO CREACIÓN DE POLÍGONO ==========", 
                 "YF Tools Plus", 
@@ -117,14 +423,7 @@ class PolygonCreator:
             
             # Configurar parámetros de estilo predeterminados
             if style_params is None:
-                style_params = {
-                    'polygon_color': '#ffffff',
-                    'border_color': '#ff340b',
-                    'border_width': '0.26',
-                    'label_font': 'Arial',
-                    'label_size': '9',
-                    'label_color': '#ff340b'
-                }
+                style_params = dict(self.DEFAULT_STYLE)
             
             # Verificar campos en el CSV
             available_fields = self.get_csv_fields(csv_path)
@@ -134,6 +433,9 @@ class PolygonCreator:
                 Qgis.Info
             )
             
+            field_x = field_x.strip()
+            field_y = field_y.strip()
+            
             if field_x not in available_fields:
                 QgsMessageLog.logMessage(
                     f"El campo X '{field_x}' no existe en el CSV. Campos disponibles: {available_fields}", 
@@ -164,158 +466,35 @@ class PolygonCreator:
                 )
                 return None
             
-            # Leer puntos directamente del CSV
-            points = []
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                row_count = 0
-                for row in reader:
-                    row_count += 1
-                    try:
-                        x = float(row[field_x])
-                        y = float(row[field_y])
-                        points.append(QgsPointXY(x, y))
-                        QgsMessageLog.logMessage(
-                            f"Punto {row_count}: X={x}, Y={y}", 
-                            "YF Tools Plus", 
-                            Qgis.Info
-                        )
-                    except (ValueError, KeyError) as e:
-                        QgsMessageLog.logMessage(
-                            f"Error al leer fila {row_count}: {str(e)}", 
-                            "YF Tools Plus", 
-                            Qgis.Warning
-                        )
-                        continue
-            
-            # Verificar que hay suficientes puntos
-            if len(points) < 3:
-                QgsMessageLog.logMessage(
-                    f"Se necesitan al menos 3 puntos para crear un polígono. Solo se encontraron {len(points)} puntos válidos.", 
-                    "YF Tools Plus", 
-                    Qgis.Critical
-                )
-                return None
+            # Leer las columnas de coordenadas completas en una sola pasada
+            with profiler.stage('lectura_csv', 'filas') as stage:
+                parser = CoordinateParser()
+                xs, ys, summary = parser.read_coordinates(csv_path, field_x, field_y)
+                points = [QgsPointXY(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+                stage.items = summary['total']
             
             QgsMessageLog.logMessage(
-                f"Se cargaron {len(points)} puntos correctamente", 
+                f"Formato detectado: delimitador '{summary['delimiter']}', decimal '{summary['decimal']}', "
+                f"codificación {summary['encoding']}", 
                 "YF Tools Plus", 
-                Qgis.Success
-            )
-            
-            # Crear capa de polígonos en memoria
-            polygon_layer = QgsVectorLayer(
-                f"Polygon?crs={crs_obj.authid()}", 
-                "Polígono", 
-                "memory"
+                Qgis.Info
             )
-            
-            if not polygon_layer.isValid():
+            if summary['rejected']:
+                # Un único aviso agregado en lugar de uno por fila
                 QgsMessageLog.logMessage(
-                    "Error al crear la capa de polígonos en memoria", 
+                    CoordinateParser.describe(summary), 
                     "YF Tools Plus", 
-                    Qgis.Critical
+                    Qgis.Warning
                 )
-                return None
             
-            provider = polygon_layer.dataProvider()
-            
-            # Añadir campos
-            provider.addAttributes([
-                QgsField("ID", QVariant.Int),
-                QgsField("AREA", QVariant.Double),
-                QgsField("PERIMETRO", QVariant.Double)
-            ])
-            polygon_layer.updateFields()
-            
-            # Crear geometría del polígono
-            polygon = QgsGeometry.fromPolygonXY([points])
-            
-            if polygon.isEmpty():
-                QgsMessageLog.logMessage(
-                    "La geometría del polígono está vacía", 
-                    "YF Tools Plus", 
-                    Qgis.Critical
-                )
+            polygon_layer = self.build_polygon_layer(points, crs_obj, style_params, options, profiler)
+            if polygon_layer is None:
                 return None
             
-            # Crear feature
-            feature = QgsFeature(polygon_layer.fields())
-            feature.setGeometry(polygon)
-            
-            # Calcular área y perímetro
-            area = polygon.area() / 10000  # Convertir a hectáreas
-            perimeter = polygon.length()  # Perímetro en metros
-            
-            QgsMessageLog.logMessage(
-                f"Polígono creado - Área: {area:.4f} Ha, Perímetro: {perimeter:.2f} m", 
-                "YF Tools Plus", 
-                Qgis.Success
-            )
-            
-            # Añadir atributos
-            feature.setAttributes([1, round(area, 4), round(perimeter, 2)])
-            
-            # Añadir feature a la capa
-            provider.addFeatures([feature])
-            polygon_layer.updateExtents()
-            
-            # Aplicar simbología
-            symbol = QgsFillSymbol.createSimple({
-                'color': style_params.get('polygon_color', '#ffffff'),
-                'color_border': style_params.get('border_color', '#ff340b'),
-                'width_border': style_params.get('border_width', '0.26'),
-                'style': 'solid',
-                'style_border': 'solid'
-            })
-            polygon_layer.renderer().setSymbol(symbol)
-            
-            # Aplicar etiquetas
-            label_settings = QgsPalLayerSettings()
-            label_settings.fieldName = (
-                "'PARCELA GEOREFERENCIADA' || '\\n' || "
-                "'AREA : ' || round(\"AREA\", 4) || ' Ha.' || '\\n' || "
-                "'PERIMETRO : ' || round(\"PERIMETRO\", 2) || ' m.'"
-            )
-            label_settings.isExpression = True
-            
-            text_format = QgsTextFormat()
-            text_format.setColor(QColor(style_params.get('label_color', '#ff340b')))
-            text_format.setSize(float(style_params.get('label_size', '9')))
-            text_format.setFont(QFont(
-                style_params.get('label_font', 'Arial'), 
-                int(style_params.get('label_size', '9')), 
-                QFont.Bold
-            ))
-            
-            buffer_settings = QgsTextBufferSettings()
-            buffer_settings.setEnabled(True)
-            buffer_settings.setSize(1.0)
-            buffer_settings.setColor(QColor("white"))
-            text_format.setBuffer(buffer_settings)
-            
-            label_settings.setFormat(text_format)
-            
-            # Compatibilidad con QGIS 3.x para placement
-            try:
-                # Para QGIS 3.16+
-                label_settings.placement = Qgis.LabelPlacement.OverPoint
-            except (AttributeError):
-                # Para versiones anteriores de QGIS 3.x
-                try:
-                    label_settings.placement = QgsPalLayerSettings.Placement.OverPoint
-                except:
-                    # Fallback para versiones muy antiguas
-                    label_settings.placement = 0  # OverPoint
-            
-            label_settings.centroidWhole = True
-            
-            polygon_layer.setLabeling(QgsVectorLayerSimpleLabeling(label_settings))
-            polygon_layer.setLabelsEnabled(True)
-            
             # Añadir al proyecto
-            QgsProject.instance().addMapLayer(polygon_layer)
-            polygon_layer.triggerRepaint()
+            with profiler.stage('agregar_proyecto'):
+                QgsProject.instance().addMapLayer(polygon_layer)
+                polygon_layer.triggerRepaint()
             
             QgsMessageLog.logMessage(
                 "✓ Polígono añadido al proyecto exitosamente", 
@@ -329,4 +508,6 @@ class PolygonCreator:
             import traceback
             error_msg = f"Error al crear polígono: {str(e)}\n{traceback.format_exc()}"
             QgsMessageLog.logMessage(error_msg, "YF Tools Plus", Qgis.Critical)
-            return None
\ No newline at end of file
+            return None
+        finally:
+            profiler.finish()
\ No newline at end of file
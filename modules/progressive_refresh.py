@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ ProgressiveRefresh
+                                 A QGIS plugin
+ Capas de salida visibles desde el inicio de un proceso largo
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import time
+from qgis.core import QgsProject
+from PyQt5.QtCore import QCoreApplication
+
+
+class ProgressiveRefresh:
+    """
+    Añade las capas de salida al proyecto al empezar y las redibuja a medida
+    que se insertan lotes, como máximo una vez cada `interval` segundos: los
+    resultados parciales se ven (y se pueden consultar) durante el proceso
+    sin que el redibujado frene la inserción.
+
+    Mientras se atienden eventos el usuario puede quitar capas del proyecto:
+    si quita una de salida o la de origen, el proceso se interrumpe en el
+    siguiente lote en lugar de seguir escribiendo en una capa borrada.
+    """
+
+    # Segundos mínimos entre dos redibujados
+    INTERVAL = 1.5
+
+    def __init__(self, interval=INTERVAL):
+        """
+        Constructor.
+
+        :param interval: Segundos mínimos entre dos redibujados
+        :type interval: float
+        """
+        self.interval = interval
+        self.layers = []
+        self.refreshes = 0
+        self.last_refresh = 0.0
+        self.watched = set()
+        self.removed = False
+
+    def start(self, layers, source=None):
+        """
+        Añade las capas (aún vacías y ya estilizadas) al proyecto
+
+        :param layers: Capas de salida
+        :type layers: list of QgsVectorLayer
+
+        :param source: Capa de origen del proceso (también se vigila)
+        :type source: QgsVectorLayer
+        """
+        self.layers = list(layers)
+        project = QgsProject.instance()
+        project.addMapLayers(self.layers)
+        self.watched = {layer.id() for layer in self.layers}
+        if source is not None:
+            self.watched.add(source.id())
+        self.removed = False
+        project.layersWillBeRemoved.connect(self.layers_removed)
+        self.last_refresh = time.monotonic()
+        self.process_events()
+
+    def layers_removed(self, layer_ids):
+        """Marca el proceso para interrumpirlo si se quita una de sus capas."""
+        if self.watched.intersection(layer_ids):
+            self.removed = True
+
+    def process_events(self):
+        """
+        Atiende los eventos pendientes (el lienzo dibuja en sus propios hilos)
+
+        :raises Exception: Si durante los eventos se quitó una capa del proceso
+        """
+        QCoreApplication.processEvents()
+        if self.removed:
+            self.stop()
+            raise Exception("Se quitó del proyecto una capa del proceso; se interrumpe")
+
+    def batch_done(self):
+        """Tras insertar un lote: redibuja si pasó el intervalo desde el último redibujado."""
+        if not self.layers or time.monotonic() - self.last_refresh < self.interval:
+            return
+        self.refresh()
+        self.process_events()
+        self.last_refresh = time.monotonic()
+
+    def refresh(self):
+        """Actualiza la extensión y pide el redibujado de las capas."""
+        for layer in self.layers:
+            layer.updateExtents()
+            layer.triggerRepaint()
+        self.refreshes += 1
+
+    def finish(self):
+        """Redibujado final con todas las entidades."""
+        if self.layers:
+            self.refresh()
+        self.stop()
+
+    def stop(self):
+        """Deja de vigilar las capas del proyecto."""
+        if self.watched:
+            try:
+                QgsProject.instance().layersWillBeRemoved.disconnect(self.layers_removed)
+            except TypeError:
+                pass
+            self.watched = set()
+
+    def discard(self):
+        """Quita del proyecto las capas de un proceso que falló."""
+        self.stop()
+        project = QgsProject.instance()
+        ids = []
+        for layer in self.layers:
+            try:
+                if project.mapLayer(layer.id()) is not None:
+                    ids.append(layer.id())
+            except RuntimeError:
+                # El usuario ya quitó la capa durante el proceso
+                continue
+        if ids:
+            project.removeMapLayers(ids)
+        self.layers = []
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ RenderingProfile
+                                 A QGIS plugin
+ Visibilidad por escala de etiquetas y símbolos para capas de salida grandes
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+from math import sqrt
+from qgis.core import (
+    QgsRuleBasedLabeling, QgsRuleBasedRenderer, QgsSingleSymbolRenderer,
+    QgsVectorLayerSimpleLabeling, QgsPalLayerSettings, QgsUnitTypes,
+    QgsMessageLog, Qgis
+)
+
+
+class RenderingProfile:
+    """Clase para limitar por escala las etiquetas y símbolos de una capa"""
+
+    # Cantidad máxima de etiquetas que se intentan colocar en pantalla
+    MAX_LABELS = 400
+
+    # Cantidad máxima de símbolos dibujados en pantalla
+    MAX_SYMBOLS = 20000
+
+    # Tamaño aproximado del lienzo en metros de "papel" (≈ 1000 x 600 px a 96 ppp)
+    SCREEN_WIDTH_M = 0.26
+    SCREEN_HEIGHT_M = 0.16
+
+    def __init__(self):
+        """Constructor."""
+        pass
+
+    def visibility_scale(self, layer, feature_count, max_visible):
+        """
+        Calcula la escala (denominador) a partir de la cual habría más de
+        max_visible entidades en pantalla, suponiendo densidad uniforme
+
+        :param layer: Capa cuya extensión se usa para estimar la densidad
+        :type layer: QgsVectorLayer
+
+        :param feature_count: Número de entidades consideradas
+        :type feature_count: int
+
+        :param max_visible: Máximo de entidades en pantalla
+        :type max_visible: int
+
+        :returns: Denominador de escala, o 0 si no hace falta límite
+        :rtype: float
+        """
+        if feature_count <= max_visible:
+            return 0
+
+        extent = layer.extent()
+        to_meters = QgsUnitTypes.fromUnitToUnitFactor(
+            layer.crs().mapUnits(), QgsUnitTypes.DistanceMeters
+        )
+        # Evitar extensiones degeneradas (una sola fila/columna de entidades)
+        width = max(extent.width() * to_meters, 1.0)
+        height = max(extent.height() * to_meters, 1.0)
+        density = feature_count / (width * height)
+
+        # A escala 1:S la pantalla cubre (ancho * S) x (alto * S) metros de terreno
+        return sqrt(max_visible / (density * self.SCREEN_WIDTH_M * self.SCREEN_HEIGHT_M))
+
+    def compute_thresholds(self, layer, subset_count):
+        """
+        Calcula los umbrales de escala de la capa según su extensión y densidad
+
+        :param layer: Capa de salida
+        :type layer: QgsVectorLayer
+
+        :param subset_count: Número de entidades del subconjunto representativo
+        :type subset_count: int
+
+        :returns: Diccionario con 'labels_all', 'labels_subset', 'symbols_all' y
+            'symbols_subset' (denominadores de escala, 0 = sin límite)
+        :rtype: dict
+        """
+        count = layer.featureCount()
+        return {
+            'labels_all': self.visibility_scale(layer, count, self.MAX_LABELS),
+            'labels_subset': self.visibility_scale(layer, subset_count, self.MAX_LABELS),
+            'symbols_all': self.visibility_scale(layer, count, self.MAX_SYMBOLS),
+            'symbols_subset': self.visibility_scale(layer, subset_count, self.MAX_SYMBOLS)
+        }
+
+    def apply(self, layer, subset_filter, subset_count):
+        """
+        Aplica el perfil: todas las entidades a escalas grandes, solo el
+        subconjunto representativo a escalas intermedias y nada más allá.
+        Las capas pequeñas no reciben límites.
+
+        :param layer: Capa de salida ya simbolizada y etiquetada
+        :type layer: QgsVectorLayer
+
+        :param subset_filter: Expresión que selecciona el subconjunto representativo
+        :type subset_filter: str
+
+        :param subset_count: Número de entidades que cumplen subset_filter
+        :type subset_count: int
+
+        :returns: Umbrales aplicados (ver compute_thresholds)
+        :rtype: dict
+        """
+        thresholds = self.compute_thresholds(layer, subset_count)
+
+        if thresholds['labels_all'] and isinstance(layer.labeling(), QgsVectorLayerSimpleLabeling):
+            self._apply_labeling(layer, subset_filter, thresholds)
+
+        if thresholds['symbols_all'] and isinstance(layer.renderer(), QgsSingleSymbolRenderer):
+            self._apply_renderer(layer, subset_filter, thresholds)
+
+        if thresholds['labels_all']:
+            QgsMessageLog.logMessage(
+                f"Perfil de renderizado para '{layer.name()}': etiquetas completas hasta 1:{int(thresholds['labels_all'])}, "
+                f"símbolos completos hasta 1:{int(thresholds['symbols_all'] or 0)}",
+                "YF Tools Plus",
+                Qgis.Info
+            )
+        return thresholds
+
+    def _apply_labeling(self, layer, subset_filter, thresholds):
+        """Reemplaza el etiquetado simple por reglas con visibilidad por escala."""
+        base_settings = layer.labeling().settings()
+
+        # Etiquetas completas: ceden ante las del subconjunto y no se fuerzan
+        all_settings = QgsPalLayerSettings(base_settings)
+        all_settings.priority = 3
+        all_settings.displayAll = False
+        obstacle = all_settings.obstacleSettings()
+        obstacle.setIsObstacle(True)
+        all_settings.setObstacleSettings(obstacle)
+
+        subset_settings = QgsPalLayerSettings(all_settings)
+        subset_settings.priority = 8
+
+        root = QgsRuleBasedLabeling.Rule(None)
+        root.appendChild(QgsRuleBasedLabeling.Rule(
+            all_settings, 0, thresholds['labels_all'], '', 'Todas'
+        ))
+        if thresholds['labels_subset'] > thresholds['labels_all'] or not thresholds['labels_subset']:
+            root.appendChild(QgsRuleBasedLabeling.Rule(
+                subset_settings, thresholds['labels_all'], thresholds['labels_subset'],
+                subset_filter, 'Representativas'
+            ))
+
+        layer.setLabeling(QgsRuleBasedLabeling(root))
+        layer.setLabelsEnabled(True)
+
+    def _apply_renderer(self, layer, subset_filter, thresholds):
+        """Reemplaza el símbolo único por reglas con visibilidad por escala."""
+        symbol = layer.renderer().symbol()
+
+        root = QgsRuleBasedRenderer.Rule(None)
+        root.appendChild(QgsRuleBasedRenderer.Rule(
+            symbol.clone(), 0, thresholds['symbols_all'], '', 'Todos'
+        ))
+        if thresholds['symbols_subset'] > thresholds['symbols_all'] or not thresholds['symbols_subset']:
+            root.appendChild(QgsRuleBasedRenderer.Rule(
+                symbol.clone(), thresholds['symbols_all'], thresholds['symbols_subset'],
+                subset_filter, 'Representativos'
+            ))
+
+        layer.setRenderer(QgsRuleBasedRenderer(root))
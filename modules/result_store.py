@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ ResultStore
+                                 A QGIS plugin
+ Resultados en columnas (arreglos tipados) para exportar sin recorrer capas
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+from array import array
+from qgis.core import QgsGeometry, QgsPointXY
+
+from .table_writers import BATCH_SIZE, field_kind
+
+
+class ResultTable:
+    """Tabla de resultados en columnas: un arreglo tipado por campo y la geometría como coordenadas"""
+
+    # Arreglos compactos para columnas numéricas (enteros de 64 bits y dobles)
+    TYPECODES = {'int': 'q', 'float': 'd'}
+
+    def __init__(self, name, header, kinds, geometry_type=None, layer_id=None):
+        """
+        Constructor.
+
+        :param name: Nombre de la tabla (el de la capa equivalente)
+        :type name: str
+
+        :param header: Nombres de los campos
+        :type header: list of str
+
+        :param kinds: Tipo de cada campo (ver table_writers.field_kind)
+        :type kinds: list of str
+
+        :param geometry_type: 'point', 'line', 'multiline', 'polygon' o None (sin geometría)
+        :type geometry_type: str
+
+        :param layer_id: Id de la capa con el mismo contenido, si existe
+        :type layer_id: str
+        """
+        self.name = name
+        self.header = list(header)
+        self.kinds = list(kinds)
+        self.columns = [array(self.TYPECODES[kind]) if kind in self.TYPECODES else [] for kind in self.kinds]
+        self.geometry_type = geometry_type
+        self.layer_id = layer_id
+        # Coordenadas de todas las geometrías seguidas; la entidad i ocupa offsets[i]:offsets[i + 1]
+        self.xs = array('d')
+        self.ys = array('d')
+        self.offsets = array('q', [0])
+        # Geometrías multiparte: final de cada parte en xs; la entidad i tiene las partes part_offsets[i]:part_offsets[i + 1]
+        self.part_ends = array('q')
+        self.part_offsets = array('q', [0])
+
+    @classmethod
+    def from_fields(cls, name, fields, geometry_type=None, layer_id=None):
+        """
+        Tabla vacía con los campos de una capa
+
+        :param fields: Campos en el orden de los atributos
+        :type fields: list of QgsField
+        """
+        return cls(name, [f.name() for f in fields], [field_kind(f) for f in fields], geometry_type, layer_id)
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else len(self.offsets) - 1
+
+    def append(self, row, points=None):
+        """
+        Añade una entidad
+
+        :param row: Atributos en el orden de header
+        :type row: list
+
+        :param points: Vértices de la geometría (uno para puntos, dos para un segmento, el anillo
+            para polígonos); en las multiparte, una lista de vértices por parte
+        :type points: list of QgsPointXY
+        """
+        for index, value in enumerate(row):
+            try:
+                self.columns[index].append(value)
+            except TypeError:
+                # Valor nulo o de otro tipo en una columna numérica: pasa a lista
+                self.columns[index] = list(self.columns[index])
+                self.columns[index].append(value)
+        if self.geometry_type is not None:
+            for part in (points or ()) if self.multipart else (points or (),):
+                for point in part:
+                    self.xs.append(point.x())
+                    self.ys.append(point.y())
+                if self.multipart:
+                    self.part_ends.append(len(self.xs))
+            self.offsets.append(len(self.xs))
+            if self.multipart:
+                self.part_offsets.append(len(self.part_ends))
+
+    @property
+    def multipart(self):
+        """Si las geometrías se guardan por partes."""
+        return self.geometry_type == 'multiline'
+
+    def column(self, name):
+        """Columna completa de un campo."""
+        return self.columns[self.header.index(name)]
+
+    def field_indexes(self, fields=None):
+        """Índices de los campos pedidos (por defecto, todos)."""
+        if not fields:
+            return list(range(len(self.header)))
+        missing = [name for name in fields if name not in self.header]
+        if missing:
+            raise Exception(f"Campos inexistentes en el resultado: {', '.join(missing)}")
+        return [self.header.index(name) for name in fields]
+
+    def column_blocks(self, field_indexes=None, batch_size=BATCH_SIZE):
+        """Generador de bloques de columnas (cortes de los arreglos) para escritores columnares."""
+        field_indexes = self.field_indexes() if field_indexes is None else field_indexes
+        for start in range(0, len(self), batch_size):
+            yield [self.columns[i][start:start + batch_size] for i in field_indexes]
+
+    def batches(self, field_indexes=None, batch_size=BATCH_SIZE):
+        """Generador de bloques de filas, con la misma forma que table_writers.read_batches."""
+        for block in self.column_blocks(field_indexes, batch_size):
+            yield [list(row) for row in zip(*block)]
+
+    def points(self, index):
+        """Vértices de la geometría de una entidad (en las multiparte, una lista por parte)."""
+        start, end = self.offsets[index], self.offsets[index + 1]
+        if self.multipart:
+            ends = self.part_ends[self.part_offsets[index]:self.part_offsets[index + 1]]
+            parts = []
+            for part_end in ends:
+                parts.append([QgsPointXY(x, y) for x, y in zip(self.xs[start:part_end], self.ys[start:part_end])])
+                start = part_end
+            return parts
+        return [QgsPointXY(x, y) for x, y in zip(self.xs[start:end], self.ys[start:end])]
+
+    def geometry(self, index):
+        """Geometría de una entidad (se construye solo cuando se pide)."""
+        points = self.points(index)
+        if self.geometry_type == 'point':
+            return QgsGeometry.fromPointXY(points[0])
+        if self.geometry_type == 'line':
+            return QgsGeometry.fromPolylineXY(points)
+        if self.geometry_type == 'multiline':
+            return QgsGeometry.fromMultiPolylineXY(points)
+        return QgsGeometry.fromPolygonXY([points])
+
+    def wkb(self, index):
+        """Geometría de una entidad en WKB."""
+        return bytes(self.geometry(index).asWkb())
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ RingSimplifier
+                                 A QGIS plugin
+ Limpieza de vértices colineales y micro-segmentos antes de segmentar
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import threading
+import numpy as np
+
+
+class RingSimplifier:
+    """Clase para eliminar vértices colineales y lados muy cortos de anillos"""
+
+    def __init__(self, distance_tolerance=0.01, angle_tolerance=0.5):
+        """
+        Constructor.
+
+        :param distance_tolerance: Longitud mínima de lado, en unidades del mapa
+        :type distance_tolerance: float
+
+        :param angle_tolerance: Desvío máximo en grados para considerar colineal un vértice
+        :type angle_tolerance: float
+        """
+        self.distance_tolerance = distance_tolerance
+        self.angle_tolerance = angle_tolerance
+        self.rings = 0
+        self.removed = 0
+        # Una misma instancia la usan a la vez los iteradores de las capas virtuales
+        self._lock = threading.Lock()
+
+    def keep_indices(self, xs, ys):
+        """
+        Calcula qué vértices de un anillo abierto se conservan.
+
+        En cada pasada se marcan los vértices colineales o con un lado
+        adyacente más corto que la tolerancia, y se eliminan solo mínimos
+        locales de la puntuación que no sean vecinos entre sí. Así un arco
+        suave no se borra de golpe.
+
+        :param xs: Coordenadas X del anillo (sin punto de cierre)
+        :type xs: numpy.ndarray
+
+        :param ys: Coordenadas Y del anillo (sin punto de cierre)
+        :type ys: numpy.ndarray
+
+        :returns: Índices conservados, en orden
+        :rtype: numpy.ndarray
+        """
+        index = np.arange(len(xs))
+        while len(index) > 3:
+            x, y = xs[index], ys[index]
+            dx_in, dy_in = x - np.roll(x, 1), y - np.roll(y, 1)
+            dx_out, dy_out = np.roll(x, -1) - x, np.roll(y, -1) - y
+
+            # Desvío de dirección en el vértice (0 = perfectamente colineal)
+            deflection = np.abs(np.degrees(np.arctan2(
+                dx_in * dy_out - dy_in * dx_out,
+                dx_in * dx_out + dy_in * dy_out
+            )))
+            shortest = np.minimum(np.hypot(dx_in, dy_in), np.hypot(dx_out, dy_out))
+
+            # Puntuación < 1 significa candidato a eliminar
+            score = np.full(len(index), np.inf)
+            if self.angle_tolerance > 0:
+                score = np.minimum(score, deflection / self.angle_tolerance)
+            if self.distance_tolerance > 0:
+                score = np.minimum(score, shortest / self.distance_tolerance)
+
+            candidate = (
+                (score < 1)
+                & (score <= np.roll(score, 1))
+                & (score <= np.roll(score, -1))
+            )
+            if not candidate.any():
+                break
+
+            # En tramos de candidatos consecutivos (empates, p. ej. una recta
+            # con muchos vértices) eliminar uno sí y otro no
+            positions = np.arange(len(index))
+            run_start = np.maximum.accumulate(
+                np.where(candidate & ~np.roll(candidate, 1), positions, 0)
+            )
+            remove = candidate & ((positions - run_start) % 2 == 0)
+            if remove[0] and remove[-1]:
+                remove[-1] = False
+            # Conservar al menos un triángulo
+            excess = remove.sum() - (len(index) - 3)
+            if excess > 0:
+                remove[np.flatnonzero(remove)[:excess]] = False
+            index = index[~remove]
+
+        with self._lock:
+            self.rings += 1
+            self.removed += len(xs) - len(index)
+        return index
+
+    def simplify(self, points):
+        """
+        Simplifica un anillo abierto de puntos
+
+        :param points: Vértices sin el punto de cierre repetido
+        :type points: list of QgsPointXY
+
+        :returns: Vértices conservados (los mismos objetos, en orden)
+        :rtype: list of QgsPointXY
+        """
+        xs = np.fromiter((p.x() for p in points), dtype=float, count=len(points))
+        ys = np.fromiter((p.y() for p in points), dtype=float, count=len(points))
+        return [points[i] for i in self.keep_indices(xs, ys)]
+
+    def summary(self, unit='unidades del mapa'):
+        """
+        Texto con el resumen de vértices eliminados
+
+        :param unit: Unidad de la tolerancia de distancia (la del CRS de la capa)
+        :type unit: str
+        """
+        return (
+            f"Simplificación: {self.removed} vértice(s) eliminado(s) en {self.rings} anillo(s) "
+            f"(tolerancias {self.distance_tolerance} {unit} / {self.angle_tolerance}°)."
+        )
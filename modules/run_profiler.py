@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ RunProfiler
+                                 A QGIS plugin
+ Medición de tiempos, memoria y rendimiento por etapa de cada herramienta
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class StageRecord:
+    """Tiempo acumulado, elementos procesados y pico de memoria de una etapa"""
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.calls = 0
+        self.items = 0
+        self.unit = 'entidades'
+        self.peak_bytes = None
+
+    def rate(self):
+        """Elementos por segundo, o None si la etapa no cuenta elementos."""
+        if not self.items or self.seconds <= 0:
+            return None
+        return self.items / self.seconds
+
+
+class RunProfiler:
+    """
+    Clase para instrumentar una ejecución de una herramienta por etapas.
+
+    El pico de memoria de tracemalloc es único para todo el proceso: incluye lo
+    que reservan otros hilos en el mismo intervalo, y reiniciarlo en una
+    ejecución borraría el de cualquier otra en curso. Por eso solo mide memoria
+    una ejecución a la vez (la primera que lo pide); las que se solapan con ella
+    se miden sin memoria (peak_bytes queda en None).
+    """
+
+    # Ejecución que mide memoria en este momento
+    _memory_owner = None
+    _memory_lock = threading.Lock()
+
+    def __init__(self, tool, trace_memory=False):
+        """
+        Constructor.
+
+        :param tool: Nombre de la herramienta medida
+        :type tool: str
+
+        :param trace_memory: Registrar el pico de memoria de Python por etapa (tracemalloc)
+        :type trace_memory: bool
+        """
+        self.tool = tool
+        self.trace_memory = trace_memory
+        self.started = datetime.now()
+        self.stages = {}
+        self._start = time.perf_counter()
+        self._total = None
+        self._owns_tracemalloc = False
+        # Etapas abiertas (anidadas), para no perder su pico al reiniciarlo
+        self._open = []
+        self.measures_memory = False
+        if trace_memory:
+            with RunProfiler._memory_lock:
+                if RunProfiler._memory_owner is None:
+                    RunProfiler._memory_owner = self
+                    self.measures_memory = True
+                    if not tracemalloc.is_tracing():
+                        tracemalloc.start()
+                        self._owns_tracemalloc = True
+
+    @contextmanager
+    def stage(self, name, unit=None):
+        """
+        Mide un bloque de código. Si la etapa se repite (p. ej. por anillo) los
+        tiempos se acumulan. El bloque puede sumar elementos en record.items.
+
+        :param name: Nombre de la etapa
+        :type name: str
+
+        :param unit: Unidad de los elementos ('entidades', 'filas'...)
+        :type unit: str
+        """
+        record = self.stages.get(name)
+        if record is None:
+            record = self.stages[name] = StageRecord(name)
+        if unit:
+            record.unit = unit
+        if self.measures_memory:
+            self._fold_peak()
+            tracemalloc.reset_peak()
+            self._open.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds += time.perf_counter() - start
+            record.calls += 1
+            if self.measures_memory:
+                self._fold_peak()
+                self._open.pop()
+
+    def _fold_peak(self):
+        """Suma el pico desde el último reinicio a todas las etapas abiertas."""
+        peak = tracemalloc.get_traced_memory()[1]
+        for record in self._open:
+            record.peak_bytes = max(record.peak_bytes or 0, peak)
+
+    def finish(self):
+        """Cierra la medición (tiempo total y tracemalloc propio)."""
+        if self._total is None:
+            self._total = time.perf_counter() - self._start
+            if self.measures_memory:
+                with RunProfiler._memory_lock:
+                    if self._owns_tracemalloc:
+                        tracemalloc.stop()
+                        self._owns_tracemalloc = False
+                    RunProfiler._memory_owner = None
+        return self
+
+    def total_seconds(self):
+        """Tiempo total de la ejecución."""
+        if self._total is None:
+            return time.perf_counter() - self._start
+        return self._total
+
+    def report(self):
+        """
+        Informe compacto, una línea por etapa
+
+        :rtype: str
+        """
+        lines = [f"⏱ {self.tool}: {self.total_seconds():.3f} s"]
+        for record in self.stages.values():
+            line = f"  • {record.name}: {record.seconds:.3f} s"
+            rate = record.rate()
+            if rate is not None:
+                line += f" ({record.items} {record.unit}, {rate:,.0f}/s)"
+            if record.peak_bytes is not None:
+                line += f", pico {record.peak_bytes / (1024 * 1024):.1f} MB"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def to_dict(self):
+        """Datos de la medición en forma serializable."""
+        return {
+            'tool': self.tool,
+            'started': self.started.isoformat(timespec='seconds'),
+            'total_s': round(self.total_seconds(), 6),
+            'trace_memory': self.measures_memory,
+            'stages': [
+                {
+                    'name': r.name,
+                    'seconds': round(r.seconds, 6),
+                    'calls': r.calls,
+                    'items': r.items,
+                    'unit': r.unit,
+                    'items_per_s': round(r.rate(), 1) if r.rate() is not None else None,
+                    'peak_bytes': r.peak_bytes
+                }
+                for r in self.stages.values()
+            ]
+        }
+
+    def write_json(self, path):
+        """
+        Guarda la medición en un archivo JSON
+
+        :param path: Ruta del archivo
+        :type path: str
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
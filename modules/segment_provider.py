@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ SegmentProvider
+                                 A QGIS plugin
+ Proveedor de datos virtual: segmentos y vértices calculados bajo demanda
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode, parse_qsl
+from qgis.core import (
+    QgsVectorDataProvider, QgsDataProvider, QgsProviderRegistry, QgsProviderMetadata,
+    QgsAbstractFeatureSource, QgsAbstractFeatureIterator, QgsFeatureIterator,
+    QgsFeatureRequest, QgsFeature, QgsField, QgsFields, QgsGeometry, QgsRectangle,
+    QgsCoordinateTransform, QgsCsException, QgsVectorLayer, QgsVectorLayerFeatureSource,
+    QgsProject, QgsWkbTypes
+)
+from PyQt5.QtCore import QVariant
+
+from .segmentator import Segmentator
+
+
+class RingCache:
+    """Caché LRU acotada de anillos calculados, compartida entre hilos de renderizado"""
+
+    def __init__(self, max_size):
+        """
+        Constructor.
+
+        :param max_size: Número máximo de anillos guardados
+        :type max_size: int
+        """
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Devuelve el anillo guardado (o None) y lo marca como usado."""
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Guarda un anillo y descarta los menos usados si se supera el límite."""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """Descarta un anillo, o todos si no se indica clave."""
+        with self._lock:
+            if key is None:
+                self._items.clear()
+            else:
+                self._items.pop(key, None)
+
+
+class SegmentFeatureSource(QgsAbstractFeatureSource):
+    """Instantánea de la capa de origen usable desde otro hilo"""
+
+    def __init__(self, provider):
+        super(SegmentFeatureSource, self).__init__()
+        self.provider_fields = provider.fields()
+        self.crs = provider.crs()
+        self.kind = provider.kind
+        self.options = provider.options
+        self.cache = provider.cache
+        self.measure = provider.measure
+        self.segmentator = provider.segmentator
+        self.simplifier = provider.simplifier
+        self.source = QgsVectorLayerFeatureSource(provider.source_layer)
+
+    def getFeatures(self, request):
+        return QgsFeatureIterator(SegmentFeatureIterator(self, request))
+
+    def ring_rows(self, source_feature):
+        """
+        Filas del anillo de una entidad de origen, desde la caché si es posible
+
+        :param source_feature: Entidad de la capa de polígonos
+        :type source_feature: QgsFeature
+
+        :rtype: list of dict
+        """
+        rows = self.cache.get(source_feature.id())
+        if rows is None:
+            vertices, _ = self.segmentator.extraer_anillo(source_feature.geometry(), self.simplifier)
+            rows = []
+            if vertices is not None:
+                rows, _ = self.segmentator.calcular_anillo(vertices, *self.measure)
+            self.cache.put(source_feature.id(), rows)
+        return rows
+
+    def make_feature(self, source_fid, row):
+        """
+        Construye la entidad virtual de una fila.
+        ID_Global es el fid virtual e ID_Poligono el fid de la entidad de origen.
+        """
+        fid = source_fid * SegmentProvider.FID_STRIDE + row['id_vertice'] - 1
+        feature = QgsFeature(self.provider_fields, fid)
+        if self.kind == 'segmentos':
+            feature.setGeometry(QgsGeometry.fromPolylineXY([row['inicio'], row['fin']]))
+            feature.setAttributes(self.segmentator.atributos_segmento(row, fid, source_fid, self.options))
+        else:
+            feature.setGeometry(QgsGeometry.fromPointXY(row['inicio']))
+            feature.setAttributes(self.segmentator.atributos_vertice(row, fid, source_fid, self.options))
+        return feature
+
+
+class SegmentFeatureIterator(QgsAbstractFeatureIterator):
+    """Iterador que calcula solo los anillos que la petición necesita"""
+
+    def __init__(self, source, request):
+        super(SegmentFeatureIterator, self).__init__(request)
+        self._source = source
+        self._request = request if request is not None else QgsFeatureRequest()
+        self._rows = iter(())
+
+        self._transform = QgsCoordinateTransform()
+        if self._request.destinationCrs().isValid() and self._request.destinationCrs() != source.crs:
+            self._transform = QgsCoordinateTransform(
+                source.crs, self._request.destinationCrs(), self._request.transformContext()
+            )
+        try:
+            self._filter_rect = self.filterRectToSourceCrs(self._transform)
+        except QgsCsException:
+            self.close()
+            return
+
+        self._fids = None
+        if self._request.filterType() == QgsFeatureRequest.FilterFid:
+            self._fids = {self._request.filterFid()}
+        elif self._request.filterType() == QgsFeatureRequest.FilterFids:
+            self._fids = set(self._request.filterFids())
+
+        self.rewind()
+
+    def _candidate_rows(self):
+        """Recorre solo las entidades de origen que pueden contener lo pedido."""
+        source_request = QgsFeatureRequest()
+        if self._fids is not None:
+            source_request.setFilterFids(list({fid // SegmentProvider.FID_STRIDE for fid in self._fids}))
+        elif not self._filter_rect.isNull():
+            source_request.setFilterRect(self._filter_rect)
+
+        for source_feature in self._source.source.getFeatures(source_request):
+            for row in self._source.ring_rows(source_feature):
+                yield source_feature.id(), row
+
+    def fetchFeature(self, f):
+        # El filtro por expresión lo aplica QgsAbstractFeatureIterator
+        for source_fid, row in self._rows:
+            feature = self._source.make_feature(source_fid, row)
+            if self._fids is not None and feature.id() not in self._fids:
+                continue
+            if not self._filter_rect.isNull() and not self._filter_rect.intersects(feature.geometry().boundingBox()):
+                continue
+
+            f.setFields(feature.fields())
+            f.setAttributes(feature.attributes())
+            f.setGeometry(feature.geometry())
+            f.setId(feature.id())
+            f.setValid(True)
+            self.geometryToDestinationCrs(f, self._transform)
+            return True
+        return False
+
+    def __iter__(self):
+        self.rewind()
+        return self
+
+    def __next__(self):
+        f = QgsFeature()
+        if not self.nextFeature(f):
+            raise StopIteration
+        return f
+
+    def rewind(self):
+        self._rows = self._candidate_rows()
+        return True
+
+    def close(self):
+        self._rows = iter(())
+        return True
+
+
+class SegmentProvider(QgsVectorDataProvider):
+    """Proveedor de solo lectura de segmentos o vértices de una capa de polígonos"""
+
+    # fid virtual = fid de origen * FID_STRIDE + índice del vértice
+    FID_STRIDE = 1 << 20
+
+    # Anillos calculados que se mantienen en memoria
+    CACHE_SIZE = 2048
+
+    @classmethod
+    def providerKey(cls):
+        return 'yf_segmentos'
+
+    @classmethod
+    def description(cls):
+        return 'YF Tools Plus - Segmentos y vértices virtuales'
+
+    @classmethod
+    def createProvider(cls, uri, providerOptions, flags=QgsDataProvider.ReadFlags()):
+        return SegmentProvider(uri, providerOptions, flags)
+
+    @classmethod
+    def register(cls):
+        """Registra el proveedor en QGIS (solo la primera vez)."""
+        registry = QgsProviderRegistry.instance()
+        if cls.providerKey() not in registry.providerList():
+            registry.registerProvider(
+                QgsProviderMetadata(cls.providerKey(), cls.description(), cls.createProvider)
+            )
+
+    @classmethod
+    def build_uri(cls, layer, kind, options):
+        """
+        Construye la URI de una capa virtual
+
+        :param layer: Capa de polígonos de origen
+        :type layer: QgsVectorLayer
+
+        :param kind: 'segmentos' o 'vertices'
+        :type kind: str
+
+        :param options: Opciones de segmentación
+        :type options: dict
+
+        :rtype: str
+        """
+        return urlencode({'source': layer.id(), 'tipo': kind, 'opciones': json.dumps(options)})
+
+    def __init__(self, uri='', providerOptions=QgsDataProvider.ProviderOptions(), flags=QgsDataProvider.ReadFlags()):
+        super(SegmentProvider, self).__init__(uri, providerOptions, flags)
+        params = dict(parse_qsl(uri))
+        self._uri = uri
+        self.kind = params.get('tipo', 'segmentos')
+        self.segmentator = Segmentator()
+        self.options = dict(Segmentator.OPCIONES_DEFECTO, **json.loads(params.get('opciones', '{}')))
+        self.cache = RingCache(self.CACHE_SIZE)
+        self._feature_count = None
+        self.measure = (None, False, None)
+        self.simplifier = self.segmentator.crear_simplificador(self.options)
+
+        self.source_layer = QgsProject.instance().mapLayer(params.get('source', ''))
+        self._valid = (
+            isinstance(self.source_layer, QgsVectorLayer)
+            and self.source_layer.geometryType() == QgsWkbTypes.PolygonGeometry
+        )
+
+        self._fields = QgsFields()
+        campos = (
+            self.segmentator.campos_segmentos(self.options) if self.kind == 'segmentos'
+            else self.segmentator.campos_vertices(self.options)
+        )
+        for campo in campos:
+            # Los fids virtuales superan el rango de un entero de 32 bits
+            if campo.name() == "ID_Global":
+                campo = QgsField("ID_Global", QVariant.LongLong)
+            self._fields.append(campo)
+
+        if self._valid:
+            self.measure = self.segmentator.configurar_medicion(self.source_layer.crs(), self.options)
+            self.source_layer.geometryChanged.connect(self._invalidate_feature)
+            self.source_layer.featureDeleted.connect(self._invalidate_feature)
+            self.source_layer.featureAdded.connect(self._invalidate_count)
+            # Al guardar la edición los fids nuevos cambian: descartar todo
+            self.source_layer.afterCommitChanges.connect(self._invalidate_all)
+            self.source_layer.afterRollBack.connect(self._invalidate_all)
+            self.source_layer.willBeDeleted.connect(self._source_deleted)
+
+    def _invalidate_feature(self, fid, *args):
+        self.cache.invalidate(fid)
+        self._feature_count = None
+        self.dataChanged.emit()
+
+    def _invalidate_count(self, *args):
+        self._feature_count = None
+        self.dataChanged.emit()
+
+    def _invalidate_all(self):
+        self.cache.invalidate()
+        self._feature_count = None
+        self.dataChanged.emit()
+
+    def _source_deleted(self):
+        self._valid = False
+        self.source_layer = None
+        self.cache.invalidate()
+
+    def featureSource(self):
+        return SegmentFeatureSource(self)
+
+    def dataSourceUri(self, expandAuthConfig=True):
+        return self._uri
+
+    def storageType(self):
+        return 'Cálculo bajo demanda'
+
+    def getFeatures(self, request=QgsFeatureRequest()):
+        if not self._valid:
+            return QgsFeatureIterator()
+        return QgsFeatureIterator(SegmentFeatureIterator(SegmentFeatureSource(self), request))
+
+    def wkbType(self):
+        return QgsWkbTypes.LineString if self.kind == 'segmentos' else QgsWkbTypes.Point
+
+    def featureCount(self):
+        """
+        Número exacto de lados de todos los anillos. Se calcula una vez y se
+        guarda hasta el siguiente cambio de la capa de origen.
+        """
+        if not self._valid:
+            return 0
+        if self._feature_count is None:
+            source = SegmentFeatureSource(self)
+            request = QgsFeatureRequest().setNoAttributes()
+            # Mismas filas que el iterador: sin los lados de longitud cero
+            self._feature_count = sum(
+                len(source.ring_rows(feature)) for feature in source.source.getFeatures(request)
+            )
+        return self._feature_count
+
+    def fields(self):
+        return self._fields
+
+    def extent(self):
+        if not self._valid:
+            return QgsRectangle()
+        return self.source_layer.extent()
+
+    def updateExtents(self):
+        pass
+
+    def isValid(self):
+        return self._valid
+
+    def capabilities(self):
+        return QgsVectorDataProvider.SelectAtId
+
+    def crs(self):
+        if not self._valid:
+            return QgsProject.instance().crs()
+        return self.source_layer.crs()
+
+    def name(self):
+        return self.providerKey()
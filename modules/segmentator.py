@@ -20,24 +20,60 @@
  ****************************************************************************/
 """
 
-from math import atan2, degrees
+import json
+from math import atan2, degrees, hypot
 from qgis.core import (
     QgsVectorLayer, QgsField, QgsFeature, QgsGeometry, QgsPointXY, QgsProject,
     QgsSimpleLineSymbolLayer, QgsSingleSymbolRenderer, QgsFillSymbol,
     QgsPalLayerSettings, QgsTextFormat, QgsTextBufferSettings, QgsVectorLayerSimpleLabeling,
-    QgsWkbTypes, QgsMessageLog, Qgis
+    QgsWkbTypes, QgsUnitTypes, QgsMessageLog, Qgis
 )
 from PyQt5.QtCore import QVariant
 from PyQt5.QtGui import QColor, QFont
 import traceback
 
+from .rendering_profile import RenderingProfile
+from .geodesy import GeodesicCalculator
+from .run_profiler import RunProfiler
+from .ring_simplifier import RingSimplifier
+from .result_store import ResultTable
+from .output_backend import OutputBackend
+from .progressive_refresh import ProgressiveRefresh
+
 
 class Segmentator:
     """Clase para segmentar polígonos en líneas y vértices"""
     
+    # Opciones por defecto de segment_polygon
+    OPCIONES_DEFECTO = {
+        'etiquetas_materializadas': False,  # Guardar el texto de las etiquetas como atributo
+        'formato_azimut': 'decimal',        # 'decimal' o 'dms' (solo etiquetas materializadas)
+        'perfil_renderizado': False,        # Limitar etiquetas y símbolos por escala en capas grandes (añade el campo rango)
+        'segmentos_representativos': 2,     # Segmentos más largos por polígono visibles a escalas pequeñas
+        'modo_medicion': 'planar',          # 'planar' o 'elipsoidal' (geodésico sobre el elipsoide del proyecto)
+        'correccion_terreno': False,        # Convertir distancias a terreno (factor de escala y elevación)
+        'altura_media': 0.0,                # Altura elipsoidal media en metros para la corrección a terreno
+        'capas_virtuales': False,           # Calcular segmentos y vértices bajo demanda en lugar de copiarlos
+        'simplificar': False,               # Limpiar vértices colineales y micro-segmentos antes de segmentar
+        'tolerancia_distancia': 0.01,       # Longitud mínima de lado (unidades del mapa)
+        'tolerancia_angulo': 0.5,           # Desvío máximo en grados para considerar colineal un vértice
+        'umbral_memoria_mb': OutputBackend.DEFAULT_THRESHOLD_MB,  # Tamaño estimado a partir del cual las capas van a un GeoPackage temporal (0 = siempre en memoria)
+        'segmentos_por_parcela': False,     # Una entidad multilínea por parcela con longitudes y azimuts en JSON (Vertices no cambia)
+        'poblado_progresivo': True          # Añadir las capas al proyecto al empezar y redibujarlas por lotes durante el proceso
+    }
+    
+    # Entidades acumuladas antes de insertarlas en el proveedor
+    LOTE_INSERCION = 5000
+    
     def __init__(self):
         """Constructor."""
-        pass
+        # Medición por etapas de la última ejecución (ver RunProfiler)
+        self.trace_memory = False
+        self.last_profile = None
+        # Resultados en columnas de la última segmentación: {'segmentos': ResultTable, 'vertices': ResultTable}
+        self.last_results = None
+        # Almacenamiento elegido para las capas de la última segmentación (ver OutputBackend)
+        self.last_backend = None
     
     def calcular_angulo_norte(self, punto_inicio, punto_fin):
         """
@@ -62,237 +98,655 @@ class Segmentator:
             angulo += 360
         return angulo
     
-    def segment_polygon(self, capa_poligonos):
+    def formatear_azimut(self, azimut, formato='decimal'):
         """
-        Segmenta un polígono en líneas y vértices, calculando ángulos internos/externos.
-        Cada polígono tiene su propia numeración independiente de vértices.
+        Convierte un azimut en el texto usado por las etiquetas
         
-        :param capa_poligonos: Capa de polígonos a segmentar
-        :type capa_poligonos: QgsVectorLayer
+        :param azimut: Azimut en grados decimales
+        :type azimut: float
         
-        :returns: True si la segmentación fue exitosa, False en caso contrario
-        :rtype: bool
+        :param formato: 'decimal' (123.4°) o 'dms' (123°24'00")
+        :type formato: str
+        
+        :returns: Azimut formateado
+        :rtype: str
         """
-        try:
-            if not capa_poligonos or capa_poligonos.geometryType() != QgsWkbTypes.PolygonGeometry:
-                QgsMessageLog.logMessage("La capa seleccionada no es válida o no es de tipo polígono.", "YF Tools", Qgis.Critical)
-                return False
-            
-            # Crear una nueva capa para las polilíneas (segmentos)
-            uri_lineas = f"LineString?crs={capa_poligonos.crs().toWkt()}"
-            capa_polilineas = QgsVectorLayer(uri_lineas, "Segmentos", "memory")
-            prov_lineas = capa_polilineas.dataProvider()
-            prov_lineas.addAttributes([
-                QgsField("ID_Global", QVariant.Int),      # ID único global
-                QgsField("ID_Poligono", QVariant.Int),    # ID del polígono al que pertenece
-                QgsField("ID_Segmento", QVariant.Int),    # ID del segmento dentro del polígono
-                QgsField("longitud", QVariant.Double),
-                QgsField("azimut", QVariant.Double)
-            ])
-            capa_polilineas.updateFields()
-            
-            # Crear una nueva capa para los puntos (vértices)
-            uri_puntos = f"Point?crs={capa_poligonos.crs().toWkt()}"
-            capa_puntos = QgsVectorLayer(uri_puntos, "Vertices", "memory")
-            prov_puntos = capa_puntos.dataProvider()
-            prov_puntos.addAttributes([
-                QgsField("ID_Global", QVariant.Int),      # ID único global
-                QgsField("ID_Poligono", QVariant.Int),    # ID del polígono al que pertenece
-                QgsField("ID_Vertice", QVariant.Int),     # ID del vértice dentro del polígono
-                QgsField("LADO", QVariant.String),        # Descripción del segmento
-                QgsField("Este", QVariant.Double),
-                QgsField("Norte", QVariant.Double),
-                QgsField("Distancia", QVariant.Double),
-                QgsField("Azimut", QVariant.Double),
-                QgsField("ang_int", QVariant.Double),
-                QgsField("ang_extr", QVariant.Double)
-            ])
-            capa_puntos.updateFields()
-            
-            # Contador global para IDs únicos
-            id_global_counter = 1
-            
-            # Contador de polígonos procesados
-            id_poligono = 1
-            
-            # Procesar cada polígono en la capa de entrada
-            for feature in capa_poligonos.getFeatures():
-                geom = feature.geometry()
-                if not geom or geom.isEmpty():
-                    continue
-
-                if geom.isMultipart():
-                    # Tomar solo la primera parte si es multiparte
-                    poligonos = geom.asMultiPolygon()
-                    if not poligonos: 
-                        continue
-                    anillos = poligonos[0]
-                else:
-                    poligono = geom.asPolygon()
-                    if not poligono: 
-                        continue
-                    anillos = poligono
-
-                if not anillos: 
-                    continue
-                anillo_exterior = anillos[0]
+        if formato != 'dms':
+            return f"{round(azimut, 1)}°"
+        
+        # Trabajar en segundos enteros para evitar 60" por redondeo
+        total_segundos = int(round(azimut * 3600)) % (360 * 3600)
+        grados, resto = divmod(total_segundos, 3600)
+        minutos, segundos = divmod(resto, 60)
+        return f"{grados}°{minutos:02d}'{segundos:02d}\""
+    
+    def medir_anillo(self, vertices, calculadora=None, elipsoidal=False, altura_media=None):
+        """
+        Calcula longitudes y azimuts de todos los lados de un anillo en un solo paso
+        
+        :param vertices: Vértices del anillo sin el punto de cierre repetido
+        :type vertices: list of QgsPointXY
+        
+        :param calculadora: Calculadora geodésica (requerida si elipsoidal o altura_media)
+        :type calculadora: GeodesicCalculator
+        
+        :param elipsoidal: Usar distancias y azimuts geodésicos en lugar de planos
+        :type elipsoidal: bool
+        
+        :param altura_media: Si se indica, las longitudes se corrigen a terreno
+        :type altura_media: float
+        
+        :returns: Longitudes, azimuts de salida y azimuts de llegada del lado i -> i+1
+        :rtype: tuple of list
+        """
+        n = len(vertices)
+        if calculadora is not None:
+            # Una sola transformación a geográficas para lados y factor de elevación
+            lonlat = calculadora.to_geographic(vertices)
+            distancias, azimuts_salida, azimuts_llegada = calculadora.ring_measures(vertices, lonlat)
+        
+        if elipsoidal:
+            azimuts_salida = azimuts_salida.tolist()
+            azimuts_llegada = azimuts_llegada.tolist()
+        else:
+            azimuts_salida = [
+                self.calcular_angulo_norte(vertices[i], vertices[(i + 1) % n]) for i in range(n)
+            ]
+            azimuts_llegada = azimuts_salida
+        
+        if altura_media is not None:
+            # Distancia de terreno = distancia elipsoidal * factor de elevación
+            factor = calculadora.ground_factor(vertices, altura_media, lonlat)
+            longitudes = (distancias * factor).tolist()
+        elif elipsoidal:
+            longitudes = distancias.tolist()
+        else:
+            longitudes = [
+                hypot(vertices[(i + 1) % n].x() - vertices[i].x(), vertices[(i + 1) % n].y() - vertices[i].y())
+                for i in range(n)
+            ]
+        return longitudes, azimuts_salida, azimuts_llegada
+    
+    def configurar_medicion(self, crs, opciones):
+        """
+        Prepara el modo de medición a partir de las opciones
+        
+        :param crs: CRS de la capa de polígonos
+        :type crs: QgsCoordinateReferenceSystem
+        
+        :param opciones: Opciones de segmentación completas
+        :type opciones: dict
+        
+        :returns: Calculadora geodésica (o None), si se mide sobre el elipsoide y
+            altura media para la corrección a terreno (o None)
+        :rtype: tuple
+        """
+        # Las medidas planas en grados no tienen sentido: usar el elipsoide
+        elipsoidal = opciones['modo_medicion'] == 'elipsoidal'
+        if not elipsoidal and crs.isGeographic():
+            QgsMessageLog.logMessage("CRS geográfico: se usan medidas elipsoidales.", "YF Tools", Qgis.Info)
+            elipsoidal = True
+        altura_media = float(opciones['altura_media']) if opciones['correccion_terreno'] else None
+        calculadora = None
+        if elipsoidal or altura_media is not None:
+            calculadora = GeodesicCalculator(crs)
+        return calculadora, elipsoidal, altura_media
+    
+    def crear_simplificador(self, opciones):
+        """
+        Crea el simplificador de anillos si las opciones lo piden
+        
+        :param opciones: Opciones de segmentación completas
+        :type opciones: dict
+        
+        :rtype: RingSimplifier or None
+        """
+        if not opciones['simplificar']:
+            return None
+        return RingSimplifier(float(opciones['tolerancia_distancia']), float(opciones['tolerancia_angulo']))
+    
+    def extraer_anillo(self, geom, simplificador=None):
+        """
+        Obtiene el anillo exterior ordenado desde el vértice más al norte
+        
+        :param geom: Geometría del polígono (si es multiparte se usa la primera parte)
+        :type geom: QgsGeometry
+        
+        :param simplificador: Limpieza opcional de vértices colineales y micro-segmentos
+        :type simplificador: RingSimplifier
+        
+        :returns: Vértices ordenados sin el punto de cierre y motivo de descarte
+            (None si el anillo es válido)
+        :rtype: tuple
+        """
+        if not geom or geom.isEmpty():
+            return None, "geometría vacía"
 
-                # Convertir anillo a QgsPointXY
-                vertices_xy = [QgsPointXY(punto) for punto in anillo_exterior]
-                
-                # Validar y limpiar anillo
-                if len(vertices_xy) < 3:
-                    QgsMessageLog.logMessage(f"Polígono con ID {feature.id()} tiene menos de 3 vértices. Omitiendo.", "YF Tools", Qgis.Warning)
-                    continue
-                    
-                # Eliminar punto duplicado al final si existe (cierra el anillo)
-                if vertices_xy[0].compare(vertices_xy[-1], 1e-9):
-                    vertices_xy.pop()
-                    
-                if len(vertices_xy) < 3:
-                    QgsMessageLog.logMessage(f"Polígono con ID {feature.id()} tiene menos de 3 vértices únicos. Omitiendo.", "YF Tools", Qgis.Warning)
-                    continue
+        if geom.isMultipart():
+            # Tomar solo la primera parte si es multiparte
+            poligonos = geom.asMultiPolygon()
+            if not poligonos: 
+                return None, "geometría vacía"
+            anillos = poligonos[0]
+        else:
+            anillos = geom.asPolygon()
 
-                # Encontrar el vértice más al norte (mayor Y, desempatar con menor X)
-                vertice_norte = max(vertices_xy, key=lambda p: (p.y(), -p.x()))
-                indice_norte = vertices_xy.index(vertice_norte)
-                
-                # Reorganizar los vértices para que comiencen desde el norte
-                vertices_ordenados = vertices_xy[indice_norte:] + vertices_xy[:indice_norte]
-                num_vertices = len(vertices_ordenados)
+        if not anillos: 
+            return None, "geometría vacía"
+        anillo_exterior = anillos[0]
 
-                # Procesar cada vértice del polígono actual
-                for i in range(num_vertices):
-                    # Índices para vértice actual, siguiente y anterior (manejo cíclico)
-                    idx_curr = i
-                    idx_next = (i + 1) % num_vertices
-                    idx_prev = (i - 1 + num_vertices) % num_vertices
-                    
-                    punto_inicio = vertices_ordenados[idx_curr]
-                    punto_fin = vertices_ordenados[idx_next]
-                    punto_prev = vertices_ordenados[idx_prev]
+        # Convertir anillo a QgsPointXY
+        vertices_xy = [QgsPointXY(punto) for punto in anillo_exterior]
+        
+        # Validar y limpiar anillo
+        if len(vertices_xy) < 3:
+            return None, "tiene menos de 3 vértices"
+            
+        # Eliminar punto duplicado al final si existe (cierra el anillo)
+        if vertices_xy[0].compare(vertices_xy[-1], 1e-9):
+            vertices_xy.pop()
+        
+        # La limpieza va antes de buscar el vértice norte para no perder el inicio
+        if simplificador is not None and len(vertices_xy) > 3:
+            vertices_xy = simplificador.simplify(vertices_xy)
+            
+        if len(vertices_xy) < 3:
+            return None, "tiene menos de 3 vértices únicos"
 
-                    # Crear el segmento (línea)
-                    segmento_geom = QgsGeometry.fromPolylineXY([punto_inicio, punto_fin])
-                    if not segmento_geom or segmento_geom.isEmpty(): 
-                        continue
-                    
-                    longitud = round(segmento_geom.length(), 4)
-                    
-                    # Omitir si la longitud es prácticamente cero
-                    if longitud < 1e-6: 
-                        QgsMessageLog.logMessage(f"Segmento de longitud cero detectado en polígono {id_poligono}, vértice {i+1}. Omitiendo.", "YF Tools", Qgis.Warning)
-                        continue
-                    
-                    # Calcular azimut del segmento actual (inicio -> fin)
-                    azimut = self.calcular_angulo_norte(punto_inicio, punto_fin)
-                    azimut = round(azimut, 1)
-                    
-                    # --- Calcular Ángulos Interno y Externo ---
-                    azimut_prev_curr = self.calcular_angulo_norte(punto_prev, punto_inicio)
-                    azimut_curr_next = azimut
-                    internal_angle = (azimut_prev_curr - azimut_curr_next + 180) % 360
-                    external_angle = 360.0 - internal_angle
-                    if abs(external_angle - 360) < 1e-6: 
-                        external_angle = 0.0
-                    elif external_angle < 0: 
-                        external_angle += 360
-                    internal_angle = round(internal_angle, 2)
-                    external_angle = round(external_angle, 2)
-                    # --- Fin Cálculo Ángulos ---
+        # Encontrar el vértice más al norte (mayor Y, desempatar con menor X)
+        vertice_norte = max(vertices_xy, key=lambda p: (p.y(), -p.x()))
+        indice_norte = vertices_xy.index(vertice_norte)
+        
+        # Reorganizar los vértices para que comiencen desde el norte
+        return vertices_xy[indice_norte:] + vertices_xy[:indice_norte], None
+    
+    def calcular_anillo(self, vertices_ordenados, calculadora=None, elipsoidal=False, altura_media=None):
+        """
+        Calcula las filas de segmentos/vértices de un anillo ya ordenado
+        
+        :param vertices_ordenados: Vértices devueltos por extraer_anillo
+        :type vertices_ordenados: list of QgsPointXY
+        
+        :returns: Filas (un dict por lado válido) y números de vértice de los
+            lados omitidos por longitud cero
+        :rtype: tuple
+        """
+        num_vertices = len(vertices_ordenados)
+        
+        # Medidas de todos los lados del anillo en un solo cálculo
+        longitudes, azimuts_salida, azimuts_llegada = self.medir_anillo(
+            vertices_ordenados, calculadora, elipsoidal, altura_media
+        )
+        
+        filas = []
+        omitidos = []
 
-                    # ID del vértice dentro del polígono actual (1-based)
-                    id_vertice_local = i + 1
-                    id_vertice_siguiente_local = ((i + 1) % num_vertices) + 1
+        # Procesar cada vértice del polígono actual
+        for i in range(num_vertices):
+            # Índices para vértice actual, siguiente y anterior (manejo cíclico)
+            idx_next = (i + 1) % num_vertices
+            idx_prev = (i - 1 + num_vertices) % num_vertices
+            
+            longitud = round(longitudes[i], 4)
+            
+            # Omitir si la longitud es prácticamente cero
+            if longitud < 1e-6: 
+                omitidos.append(i + 1)
+                continue
+            
+            # Calcular azimut del segmento actual (inicio -> fin); el atributo se
+            # redondea a 0.1° pero las etiquetas DMS usan el valor sin redondear
+            azimut_exacto = azimuts_salida[i]
+            azimut = round(azimut_exacto, 1)
+            
+            # --- Calcular Ángulos Interno y Externo ---
+            # Azimut con el que el lado anterior llega al vértice actual
+            azimut_prev_curr = azimuts_llegada[idx_prev]
+            azimut_curr_next = azimut
+            internal_angle = (azimut_prev_curr - azimut_curr_next + 180) % 360
+            external_angle = 360.0 - internal_angle
+            if abs(external_angle - 360) < 1e-6: 
+                external_angle = 0.0
+            elif external_angle < 0: 
+                external_angle += 360
+            # --- Fin Cálculo Ángulos ---
 
-                    # Crear característica para la capa de polilíneas (segmentos)
+            filas.append({
+                'inicio': vertices_ordenados[i],
+                'fin': vertices_ordenados[idx_next],
+                'id_vertice': i + 1,                    # ID del vértice dentro del polígono (1-based)
+                'id_vertice_siguiente': idx_next + 1,
+                'longitud': longitud,
+                'azimut': azimut,
+                'azimut_exacto': azimut_exacto,
+                'ang_int': round(internal_angle, 2),
+                'ang_extr': round(external_angle, 2),
+                'rango': None
+            })
+        
+        # Posición del segmento por longitud dentro de su polígono (1 = más largo)
+        for rango, fila in enumerate(sorted(filas, key=lambda f: f['longitud'], reverse=True), start=1):
+            fila['rango'] = rango
+        
+        return filas, omitidos
+    
+    def campos_segmentos(self, opciones):
+        """
+        Campos de la capa de segmentos
+        
+        :param opciones: Opciones de segmentación completas
+        :type opciones: dict
+        
+        :rtype: list of QgsField
+        """
+        if opciones['segmentos_por_parcela']:
+            # Una entidad por parcela: la parte i de la geometría es el lado i de las listas
+            campos = [
+                QgsField("ID_Poligono", QVariant.Int),
+                QgsField("num_segmentos", QVariant.Int),
+                QgsField("perimetro", QVariant.Double),
+                QgsField("longitudes", QVariant.String),  # Lista JSON, en orden de segmento
+                QgsField("azimuts", QVariant.String),     # Lista JSON, en orden de segmento
+                QgsField("ids_segmento", QVariant.String)  # ID_Segmento de cada parte (lista JSON)
+            ]
+            if opciones['etiquetas_materializadas']:
+                campos.append(QgsField("etiqueta", QVariant.String))
+            return campos
+        
+        campos = [
+            QgsField("ID_Global", QVariant.Int),      # ID único global
+            QgsField("ID_Poligono", QVariant.Int),    # ID del polígono (fid de origen en capas virtuales)
+            QgsField("ID_Segmento", QVariant.Int),    # ID del segmento dentro del polígono
+            QgsField("longitud", QVariant.Double),
+            QgsField("azimut", QVariant.Double)
+        ]
+        if opciones['perfil_renderizado']:
+            campos.append(QgsField("rango", QVariant.Int))
+        if opciones['etiquetas_materializadas']:
+            campos.append(QgsField("etiqueta", QVariant.String))
+        return campos
+    
+    def campos_vertices(self, opciones):
+        """
+        Campos de la capa de vértices
+        
+        :param opciones: Opciones de segmentación completas
+        :type opciones: dict
+        
+        :rtype: list of QgsField
+        """
+        campos = [
+            QgsField("ID_Global", QVariant.Int),      # ID único global
+            QgsField("ID_Poligono", QVariant.Int),    # ID del polígono (fid de origen en capas virtuales)
+            QgsField("ID_Vertice", QVariant.Int),     # ID del vértice dentro del polígono
+            QgsField("LADO", QVariant.String),        # Descripción del segmento
+            QgsField("Este", QVariant.Double),
+            QgsField("Norte", QVariant.Double),
+            QgsField("Distancia", QVariant.Double),
+            QgsField("Azimut", QVariant.Double),
+            QgsField("ang_int", QVariant.Double),
+            QgsField("ang_extr", QVariant.Double)
+        ]
+        if opciones['etiquetas_materializadas']:
+            campos.append(QgsField("etiqueta", QVariant.String))
+        return campos
+    
+    def atributos_segmento(self, fila, id_global, id_poligono, opciones):
+        """Atributos de un segmento en el orden de campos_segmentos."""
+        atributos = [
+            id_global,                   # ID_Global
+            id_poligono,                 # ID_Poligono
+            fila['id_vertice'],          # ID_Segmento (corresponde al vértice de inicio)
+            fila['longitud'],            # longitud
+            fila['azimut']               # azimut
+        ]
+        if opciones['perfil_renderizado']:
+            atributos.append(fila['rango'])
+        if opciones['etiquetas_materializadas']:
+            atributos.append(
+                f"{round(fila['longitud'], 2)} m\n{self.formatear_azimut(fila['azimut_exacto'], opciones['formato_azimut'])}"
+            )
+        return atributos
+    
+    def atributos_parcela(self, filas, id_poligono, opciones):
+        """Atributos de la entidad multilínea de una parcela en el orden de campos_segmentos."""
+        perimetro = round(sum(fila['longitud'] for fila in filas), 4)
+        atributos = [
+            id_poligono,                                                    # ID_Poligono
+            len(filas),                                                     # num_segmentos
+            perimetro,                                                      # perimetro
+            json.dumps([fila['longitud'] for fila in filas]),               # longitudes
+            json.dumps([fila['azimut'] for fila in filas]),                 # azimuts
+            json.dumps([fila['id_vertice'] for fila in filas])              # ids_segmento
+        ]
+        if opciones['etiquetas_materializadas']:
+            atributos.append(f"P = {round(perimetro, 2)} m")
+        return atributos
+    
+    def atributos_vertice(self, fila, id_global, id_poligono, opciones):
+        """Atributos de un vértice en el orden de campos_vertices."""
+        punto_inicio = fila['inicio']
+        atributos = [
+            id_global,                                          # ID_Global
+            id_poligono,                                        # ID_Poligono
+            fila['id_vertice'],                                 # ID_Vertice
+            # LADO usando solo los IDs de vértices (sin prefijo de polígono)
+            f"V{fila['id_vertice']} a V{fila['id_vertice_siguiente']}",
+            round(punto_inicio.x(), 6),                         # Este
+            round(punto_inicio.y(), 6),                         # Norte
+            fila['longitud'],                                   # Distancia
+            fila['azimut'],                                     # Azimut
+            fila['ang_int'],                                    # ang_int
+            fila['ang_extr']                                    # ang_extr
+        ]
+        if opciones['etiquetas_materializadas']:
+            atributos.append(f"V{fila['id_vertice']}")
+        return atributos
+    
+    def estilizar_capas(self, capa_polilineas, capa_puntos, opciones):
+        """
+        Configura el etiquetado de las capas de segmentos y vértices
+        
+        :param capa_polilineas: Capa de segmentos
+        :type capa_polilineas: QgsVectorLayer
+        
+        :param capa_puntos: Capa de vértices
+        :type capa_puntos: QgsVectorLayer
+        
+        :param opciones: Opciones de segmentación completas
+        :type opciones: dict
+        """
+        etiquetas_materializadas = opciones['etiquetas_materializadas']
+        
+        # Configurar etiquetas para la capa de polilíneas
+        etiquetas_polilineas = QgsPalLayerSettings()
+        if etiquetas_materializadas:
+            # Texto ya calculado: el motor de etiquetas no evalúa expresiones
+            etiquetas_polilineas.fieldName = "etiqueta"
+            etiquetas_polilineas.isExpression = False
+        elif opciones['segmentos_por_parcela']:
+            # Una etiqueta por parcela: las medidas de cada lado están en las listas
+            etiquetas_polilineas.fieldName = "'P = ' || round(\"perimetro\", 2) || ' m'"
+            etiquetas_polilineas.isExpression = True
+        else:
+            etiquetas_polilineas.fieldName = "concat(round(\"longitud\", 2) || ' m' || '\\n' || round(\"azimut\", 1) || '°')"
+            etiquetas_polilineas.isExpression = True
+        formato_texto_polilineas = QgsTextFormat()
+        formato_texto_polilineas.setFont(QFont("Arial", 7))
+        formato_texto_polilineas.setColor(QColor(0, 0, 0))
+        formato_texto_polilineas.setSize(7)
+        buffer_polilineas = QgsTextBufferSettings()
+        buffer_polilineas.setEnabled(True)
+        buffer_polilineas.setSize(0.5)
+        buffer_polilineas.setColor(QColor(255, 255, 255))
+        formato_texto_polilineas.setBuffer(buffer_polilineas)
+        etiquetas_polilineas.setFormat(formato_texto_polilineas)
+        etiquetas_polilineas.placement = QgsPalLayerSettings.Line
+        etiquetas_polilineas.placementFlags = QgsPalLayerSettings.OnLine | QgsPalLayerSettings.AboveLine
+        capa_polilineas.setLabeling(QgsVectorLayerSimpleLabeling(etiquetas_polilineas))
+        capa_polilineas.setLabelsEnabled(True)
+        
+        # Configurar etiquetas para la capa de puntos - muestra solo V{ID_Vertice}
+        etiquetas_puntos = QgsPalLayerSettings()
+        if etiquetas_materializadas:
+            etiquetas_puntos.fieldName = "etiqueta"
+            etiquetas_puntos.isExpression = False
+        else:
+            etiquetas_puntos.fieldName = "'V' || \"ID_Vertice\""
+            etiquetas_puntos.isExpression = True
+        formato_texto_puntos = QgsTextFormat()
+        formato_texto_puntos.setFont(QFont("Arial", 9))
+        formato_texto_puntos.setColor(QColor(0, 0, 255))
+        formato_texto_puntos.setSize(9)
+        buffer_puntos = QgsTextBufferSettings()
+        buffer_puntos.setEnabled(True)
+        buffer_puntos.setSize(0.5)
+        buffer_puntos.setColor(QColor(255, 255, 255))
+        formato_texto_puntos.setBuffer(buffer_puntos)
+        etiquetas_puntos.setFormat(formato_texto_puntos)
+        etiquetas_puntos.placement = QgsPalLayerSettings.AroundPoint
+        etiquetas_puntos.quadOffset = QgsPalLayerSettings.QuadrantAboveRight
+        etiquetas_puntos.dist = 1.0
+        capa_puntos.setLabeling(QgsVectorLayerSimpleLabeling(etiquetas_puntos))
+        capa_puntos.setLabelsEnabled(True)
+    
+    def aplicar_perfil(self, capa_polilineas, capa_puntos, num_poligonos, opciones):
+        """Visibilidad por escala: a escalas pequeñas solo un subconjunto representativo."""
+        k = opciones['segmentos_representativos']
+        perfil = RenderingProfile()
+        if not opciones['segmentos_por_parcela']:
+            # Con una entidad por parcela la capa ya es ligera: no hace falta limitarla
+            perfil.apply(
+                capa_polilineas,
+                f'"rango" <= {k}',
+                num_poligonos * k
+            )
+        # El vértice 1 es el más al norte: siempre pertenece al contorno
+        perfil.apply(
+            capa_puntos,
+            '"ID_Vertice" = 1',
+            num_poligonos
+        )
+    
+    def segmentar_capa(self, capa_poligonos, opciones, perfil=None, refresco=None):
+        """
+        Construye las capas de segmentos y vértices en memoria, ya estilizadas.
+        Solo se añaden al proyecto si se indica refresco (al empezar).
+        
+        :param capa_poligonos: Capa de polígonos a segmentar
+        :type capa_poligonos: QgsVectorLayer
+        
+        :param opciones: Opciones de segmentación completas
+        :type opciones: dict
+        
+        :param perfil: Medición por etapas en curso (opcional)
+        :type perfil: RunProfiler
+        
+        :param refresco: Poblado progresivo: capas en el proyecto desde el inicio (opcional)
+        :type refresco: ProgressiveRefresh
+        
+        :returns: (capa de segmentos, capa de vértices, polígonos procesados)
+        :rtype: tuple
+        """
+        perfil = perfil or RunProfiler('Segmentar polígonos')
+        
+        calculadora, elipsoidal, altura_media = self.configurar_medicion(capa_poligonos.crs(), opciones)
+        simplificador = self.crear_simplificador(opciones)
+        segmentos_nulos = 0
+        
+        # Memoria o GeoPackage temporal según el tamaño estimado del resultado:
+        # cada vértice da un segmento (2 coordenadas) y un punto (1 coordenada)
+        with perfil.stage('estimacion', 'polígonos') as etapa:
+            backend = self.last_backend = OutputBackend(opciones['umbral_memoria_mb'])
+            etapa.items, num_vertices = OutputBackend.estimate_vertices(capa_poligonos)
+            if opciones['segmentos_por_parcela']:
+                backend.choose(etapa.items + num_vertices, 3 * num_vertices)
+            else:
+                backend.choose(2 * num_vertices, 3 * num_vertices)
+        
+        # Crear una nueva capa para las polilíneas (segmentos)
+        por_parcela = opciones['segmentos_por_parcela']
+        campos_segmentos = self.campos_segmentos(opciones)
+        capa_polilineas = backend.create_layer(
+            "MultiLineString" if por_parcela else "LineString", capa_poligonos.crs(), "Segmentos", campos_segmentos
+        )
+        prov_lineas = capa_polilineas.dataProvider()
+        prefijo_lineas = OutputBackend.attribute_prefix(capa_polilineas, campos_segmentos)
+        
+        # Crear una nueva capa para los puntos (vértices)
+        campos_vertices = self.campos_vertices(opciones)
+        capa_puntos = backend.create_layer("Point", capa_poligonos.crs(), "Vertices", campos_vertices)
+        prov_puntos = capa_puntos.dataProvider()
+        prefijo_puntos = OutputBackend.attribute_prefix(capa_puntos, campos_vertices)
+        # Una sola vez, ya con la ruta del GeoPackage si se eligió
+        QgsMessageLog.logMessage(backend.describe(), "YF Tools", Qgis.Info)
+        
+        # Los mismos valores en columnas, para exportar sin volver a recorrer las capas
+        tabla_segmentos = ResultTable.from_fields(
+            "Segmentos", campos_segmentos, 'multiline' if por_parcela else 'line', capa_polilineas.id()
+        )
+        tabla_vertices = ResultTable.from_fields("Vertices", campos_vertices, 'point', capa_puntos.id())
+        
+        # El estilo no depende de los datos: se aplica antes para que los
+        # resultados parciales ya se vean con sus etiquetas
+        with perfil.stage('estilo'):
+            self.estilizar_capas(capa_polilineas, capa_puntos, opciones)
+        if refresco is not None:
+            with perfil.stage('agregar_proyecto'):
+                refresco.start([capa_polilineas, capa_puntos], capa_poligonos)
+        
+        # Entidades pendientes de insertar (se insertan por lotes)
+        lineas_pendientes = []
+        puntos_pendientes = []
+        
+        # Contador global para IDs únicos
+        id_global_counter = 1
+        
+        # Contador de polígonos procesados
+        id_poligono = 1
+        
+        # Procesar cada polígono en la capa de entrada
+        for feature in capa_poligonos.getFeatures():
+            with perfil.stage('anillos', 'anillos') as etapa:
+                vertices_ordenados, motivo = self.extraer_anillo(feature.geometry(), simplificador)
+                if vertices_ordenados is not None:
+                    filas, omitidos = self.calcular_anillo(vertices_ordenados, calculadora, elipsoidal, altura_media)
+                    etapa.items += 1
+            if vertices_ordenados is None:
+                if motivo != "geometría vacía":
+                    QgsMessageLog.logMessage(f"Polígono con ID {feature.id()} {motivo}. Omitiendo.", "YF Tools", Qgis.Warning)
+                continue
+            segmentos_nulos += len(omitidos)
+            
+            # Se cuentan lados en los dos modos (por parcela se crea una sola línea)
+            with perfil.stage('atributos', 'lados') as etapa:
+                if por_parcela and filas:
+                    # Una sola entidad multilínea por parcela, una parte por lado
+                    partes = [[fila['inicio'], fila['fin']] for fila in filas]
                     linea_feature = QgsFeature(capa_polilineas.fields())
-                    linea_feature.setGeometry(segmento_geom)
-                    linea_feature.setAttributes([
-                        id_global_counter,           # ID_Global
-                        id_poligono,                 # ID_Poligono
-                        id_vertice_local,            # ID_Segmento (corresponde al vértice de inicio)
-                        longitud,                    # longitud
-                        azimut                       # azimut
-                    ])
-                    prov_lineas.addFeature(linea_feature)
+                    linea_feature.setGeometry(QgsGeometry.fromMultiPolylineXY(partes))
+                    atributos = self.atributos_parcela(filas, id_poligono, opciones)
+                    linea_feature.setAttributes(prefijo_lineas + atributos)
+                    lineas_pendientes.append(linea_feature)
+                    tabla_segmentos.append(atributos, partes)
+                
+                for fila in filas:
+                    if not por_parcela:
+                        # Crear característica para la capa de polilíneas (segmentos)
+                        linea_feature = QgsFeature(capa_polilineas.fields())
+                        linea_feature.setGeometry(QgsGeometry.fromPolylineXY([fila['inicio'], fila['fin']]))
+                        atributos = self.atributos_segmento(fila, id_global_counter, id_poligono, opciones)
+                        linea_feature.setAttributes(prefijo_lineas + atributos)
+                        lineas_pendientes.append(linea_feature)
+                        tabla_segmentos.append(atributos, (fila['inicio'], fila['fin']))
                     
                     # Crear característica para la capa de puntos (vértices)
                     punto_feature = QgsFeature(capa_puntos.fields())
-                    punto_feature.setGeometry(QgsGeometry.fromPointXY(punto_inicio))
-                    
-                    # Generar string LADO usando solo los IDs de vértices (sin prefijo de polígono)
-                    lado_str = f"V{id_vertice_local} a V{id_vertice_siguiente_local}"
-                    
-                    punto_feature.setAttributes([
-                        id_global_counter,                  # ID_Global
-                        id_poligono,                        # ID_Poligono
-                        id_vertice_local,                   # ID_Vertice
-                        lado_str,                           # LADO
-                        round(punto_inicio.x(), 6),         # Este
-                        round(punto_inicio.y(), 6),         # Norte
-                        longitud,                           # Distancia
-                        azimut,                             # Azimut
-                        internal_angle,                     # ang_int
-                        external_angle                      # ang_extr
-                    ])
-                    prov_puntos.addFeature(punto_feature)
+                    punto_feature.setGeometry(QgsGeometry.fromPointXY(fila['inicio']))
+                    atributos = self.atributos_vertice(fila, id_global_counter, id_poligono, opciones)
+                    punto_feature.setAttributes(prefijo_puntos + atributos)
+                    puntos_pendientes.append(punto_feature)
+                    tabla_vertices.append(atributos, (fila['inicio'],))
                     
                     # Incrementar el contador global
                     id_global_counter += 1
-                
-                # Incrementar el ID del polígono para el siguiente
-                id_poligono += 1
+                etapa.items += len(filas)
+            
+            # Inserción por lotes: en un GeoPackage cada llamada es una transacción
+            if len(puntos_pendientes) >= self.LOTE_INSERCION:
+                with perfil.stage('insercion') as etapa:
+                    prov_lineas.addFeatures(lineas_pendientes)
+                    prov_puntos.addFeatures(puntos_pendientes)
+                    etapa.items += len(lineas_pendientes) + len(puntos_pendientes)
+                lineas_pendientes = []
+                puntos_pendientes = []
+                if refresco is not None:
+                    with perfil.stage('redibujado'):
+                        refresco.batch_done()
             
-            # Actualizar extensión de las capas
-            capa_polilineas.updateExtents()
-            capa_puntos.updateExtents()
+            # Incrementar el ID del polígono para el siguiente
+            id_poligono += 1
+        
+        with perfil.stage('insercion') as etapa:
+            prov_lineas.addFeatures(lineas_pendientes)
+            prov_puntos.addFeatures(puntos_pendientes)
+            etapa.items += len(lineas_pendientes) + len(puntos_pendientes)
+        
+        # Actualizar extensión de las capas
+        capa_polilineas.updateExtents()
+        capa_puntos.updateExtents()
 
-            # Configurar etiquetas para la capa de polilíneas
-            etiquetas_polilineas = QgsPalLayerSettings()
-            etiquetas_polilineas.fieldName = "concat(round(\"longitud\", 2) || ' m' || '\\n' || round(\"azimut\", 1) || '°')"
-            etiquetas_polilineas.isExpression = True
-            formato_texto_polilineas = QgsTextFormat()
-            formato_texto_polilineas.setFont(QFont("Arial", 7))
-            formato_texto_polilineas.setColor(QColor(0, 0, 0))
-            formato_texto_polilineas.setSize(7)
-            buffer_polilineas = QgsTextBufferSettings()
-            buffer_polilineas.setEnabled(True)
-            buffer_polilineas.setSize(0.5)
-            buffer_polilineas.setColor(QColor(255, 255, 255))
-            formato_texto_polilineas.setBuffer(buffer_polilineas)
-            etiquetas_polilineas.setFormat(formato_texto_polilineas)
-            etiquetas_polilineas.placement = QgsPalLayerSettings.Line
-            etiquetas_polilineas.placementFlags = QgsPalLayerSettings.OnLine | QgsPalLayerSettings.AboveLine
-            capa_polilineas.setLabeling(QgsVectorLayerSimpleLabeling(etiquetas_polilineas))
-            capa_polilineas.setLabelsEnabled(True)
+        with perfil.stage('estilo'):
+            if opciones['perfil_renderizado']:
+                self.aplicar_perfil(capa_polilineas, capa_puntos, id_poligono - 1, opciones)
+        if refresco is not None:
+            with perfil.stage('redibujado'):
+                refresco.finish()
+        
+        # Un único resumen en lugar de un aviso por vértice
+        if simplificador is not None:
+            unidad = QgsUnitTypes.toAbbreviatedString(capa_poligonos.crs().mapUnits())
+            QgsMessageLog.logMessage(simplificador.summary(unidad), "YF Tools", Qgis.Info)
+        if segmentos_nulos:
+            QgsMessageLog.logMessage(f"Se omitieron {segmentos_nulos} segmento(s) de longitud cero.", "YF Tools", Qgis.Warning)
+        
+        self.last_results = {'segmentos': tabla_segmentos, 'vertices': tabla_vertices}
+        return capa_polilineas, capa_puntos, id_poligono - 1
+    
+    def segment_polygon(self, capa_poligonos, opciones=None):
+        """
+        Segmenta un polígono en líneas y vértices, calculando ángulos internos/externos.
+        Cada polígono tiene su propia numeración independiente de vértices.
+        
+        :param capa_poligonos: Capa de polígonos a segmentar
+        :type capa_poligonos: QgsVectorLayer
+        
+        :param opciones: Opciones de segmentación (ver OPCIONES_DEFECTO)
+        :type opciones: dict
+        
+        :returns: True si la segmentación fue exitosa, False en caso contrario
+        :rtype: bool
+        """
+        perfil = self.last_profile = RunProfiler('Segmentar polígonos', self.trace_memory)
+        try:
+            opciones = dict(self.OPCIONES_DEFECTO, **(opciones or {}))
             
-            # Configurar etiquetas para la capa de puntos - muestra solo V{ID_Vertice}
-            etiquetas_puntos = QgsPalLayerSettings()
-            etiquetas_puntos.fieldName = "'V' || \"ID_Vertice\""
-            etiquetas_puntos.isExpression = True
-            formato_texto_puntos = QgsTextFormat()
-            formato_texto_puntos.setFont(QFont("Arial", 9))
-            formato_texto_puntos.setColor(QColor(0, 0, 255))
-            formato_texto_puntos.setSize(9)
-            buffer_puntos = QgsTextBufferSettings()
-            buffer_puntos.setEnabled(True)
-            buffer_puntos.setSize(0.5)
-            buffer_puntos.setColor(QColor(255, 255, 255))
-            formato_texto_puntos.setBuffer(buffer_puntos)
-            etiquetas_puntos.setFormat(formato_texto_puntos)
-            etiquetas_puntos.placement = QgsPalLayerSettings.AroundPoint
-            etiquetas_puntos.quadOffset = QgsPalLayerSettings.QuadrantAboveRight
-            etiquetas_puntos.dist = 1.0
-            capa_puntos.setLabeling(QgsVectorLayerSimpleLabeling(etiquetas_puntos))
-            capa_puntos.setLabelsEnabled(True)
+            if not capa_poligonos or capa_poligonos.geometryType() != QgsWkbTypes.PolygonGeometry:
+                QgsMessageLog.logMessage("La capa seleccionada no es válida o no es de tipo polígono.", "YF Tools", Qgis.Critical)
+                return False
             
-            # Agregar las capas al proyecto QGIS
-            QgsProject.instance().addMapLayer(capa_polilineas)
-            QgsProject.instance().addMapLayer(capa_puntos)
+            if opciones['capas_virtuales']:
+                # Las capas virtuales no materializan resultados
+                self.last_results = None
+                if opciones['segmentos_por_parcela']:
+                    QgsMessageLog.logMessage(
+                        "Las capas virtuales calculan un segmento por lado: se ignora la salida por parcela.",
+                        "YF Tools",
+                        Qgis.Info
+                    )
+                    opciones['segmentos_por_parcela'] = False
+                return self.segment_polygon_virtual(capa_poligonos, opciones, perfil)
+            
+            if opciones['poblado_progresivo']:
+                # Las capas se ven desde el inicio y se redibujan por lotes
+                refresco = ProgressiveRefresh()
+                try:
+                    capa_polilineas, capa_puntos, num_poligonos = self.segmentar_capa(
+                        capa_poligonos, opciones, perfil, refresco
+                    )
+                except Exception:
+                    refresco.discard()
+                    raise
+            else:
+                capa_polilineas, capa_puntos, num_poligonos = self.segmentar_capa(capa_poligonos, opciones, perfil)
+                
+                # Agregar las capas al proyecto QGIS
+                with perfil.stage('agregar_proyecto'):
+                    QgsProject.instance().addMapLayer(capa_polilineas)
+                    QgsProject.instance().addMapLayer(capa_puntos)
             
             QgsMessageLog.logMessage(
-                f"Segmentación completada. Procesados {id_poligono - 1} polígono(s).", 
+                f"Segmentación completada. Procesados {num_poligonos} polígono(s).", 
                 "YF Tools", 
                 Qgis.Success
             )
@@ -304,4 +758,60 @@ class Segmentator:
                 "YF Tools", 
                 Qgis.Critical
             )
-            raise Exception(f"Error al segmentar polígono: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error al segmentar polígono: {str(e)}")
+        finally:
+            perfil.finish()
+    
+    def segment_polygon_virtual(self, capa_poligonos, opciones, perfil=None):
+        """
+        Crea capas de segmentos y vértices de solo lectura que se calculan bajo
+        demanda desde la capa de polígonos (sin copiar entidades)
+        
+        :param capa_poligonos: Capa de polígonos de origen (debe estar en el proyecto)
+        :type capa_poligonos: QgsVectorLayer
+        
+        :param opciones: Opciones de segmentación completas
+        :type opciones: dict
+        
+        :param perfil: Medición por etapas en curso (opcional)
+        :type perfil: RunProfiler
+        
+        :returns: True si las capas virtuales son válidas
+        :rtype: bool
+        """
+        # Importación diferida: el proveedor reutiliza esta clase para sus cálculos
+        from .segment_provider import SegmentProvider
+        
+        if not QgsProject.instance().mapLayer(capa_poligonos.id()):
+            QgsMessageLog.logMessage("La capa de polígonos debe estar en el proyecto para crear capas virtuales.", "YF Tools", Qgis.Critical)
+            return False
+        
+        perfil = perfil or RunProfiler('Segmentar polígonos (virtual)')
+        
+        SegmentProvider.register()
+        with perfil.stage('capas_virtuales'):
+            capa_polilineas = QgsVectorLayer(
+                SegmentProvider.build_uri(capa_poligonos, 'segmentos', opciones), "Segmentos", SegmentProvider.providerKey()
+            )
+            capa_puntos = QgsVectorLayer(
+                SegmentProvider.build_uri(capa_poligonos, 'vertices', opciones), "Vertices", SegmentProvider.providerKey()
+            )
+        if not capa_polilineas.isValid() or not capa_puntos.isValid():
+            QgsMessageLog.logMessage("No se pudieron crear las capas virtuales.", "YF Tools", Qgis.Critical)
+            return False
+        
+        with perfil.stage('estilo'):
+            self.estilizar_capas(capa_polilineas, capa_puntos, opciones)
+            if opciones['perfil_renderizado']:
+                self.aplicar_perfil(capa_polilineas, capa_puntos, capa_poligonos.featureCount(), opciones)
+        
+        with perfil.stage('agregar_proyecto'):
+            QgsProject.instance().addMapLayer(capa_polilineas)
+            QgsProject.instance().addMapLayer(capa_puntos)
+        
+        QgsMessageLog.logMessage(
+            f"Capas virtuales creadas sobre '{capa_poligonos.name()}' ({capa_poligonos.featureCount()} polígono(s)).", 
+            "YF Tools", 
+            Qgis.Success
+        )
+        return True
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ SheetWorker
+                                 A QGIS plugin
+ Conversión de hojas a CSV en procesos de trabajo (sin dependencias de QGIS)
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import os
+import sys
+import shutil
+import pandas as pd
+
+# Libro abierto por el proceso de trabajo (uno por proceso, ver open_workbook)
+_WORKBOOK = None
+
+
+def python_executable():
+    """
+    Intérprete de Python para lanzar procesos de trabajo. Dentro de QGIS
+    sys.executable es el propio QGIS, que no debe lanzarse como trabajador.
+
+    :returns: Ruta del intérprete, o None si no se encuentra
+    :rtype: str
+    """
+    executable = sys.executable or ''
+    if os.path.basename(executable).lower().startswith('python'):
+        return executable
+    candidates = [
+        os.path.join(sys.exec_prefix, 'python.exe'),
+        os.path.join(sys.exec_prefix, 'pythonw.exe'),
+        os.path.join(sys.exec_prefix, 'bin', 'python3'),
+        os.path.join(os.path.dirname(executable), 'bin', 'python3'),
+        shutil.which('python3')
+    ]
+    for candidate in candidates:
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def open_workbook(excel_path):
+    """Inicializador de cada proceso: abre el libro una sola vez."""
+    global _WORKBOOK
+    _WORKBOOK = pd.ExcelFile(excel_path)
+
+
+def convert_sheet(sheet_name, csv_path, encoding='UTF-8'):
+    """
+    Convierte una hoja del libro abierto por open_workbook
+
+    :returns: (hoja, filas escritas)
+    :rtype: tuple
+    """
+    df = _WORKBOOK.parse(sheet_name)
+    df.to_csv(csv_path, index=False, encoding=encoding)
+    return sheet_name, len(df)
+
+
+def close_workbook():
+    """Cierra el libro del proceso (conversión sin procesos de trabajo)."""
+    global _WORKBOOK
+    if _WORKBOOK is not None:
+        _WORKBOOK.close()
+        _WORKBOOK = None
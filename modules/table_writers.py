@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ TableWriters
+                                 A QGIS plugin
+ Lectura de atributos por bloques y escritores de tablas en streaming
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import csv
+import os
+import re
+from qgis.core import QgsFeatureRequest, NULL
+from PyQt5.QtCore import QDate, QDateTime, QTime, QVariant
+
+# Filas por bloque entre lectores y escritor
+BATCH_SIZE = 2000
+
+
+def python_value(value):
+    """Convierte un valor de atributo de QGIS a un tipo de Python escribible."""
+    if value is None or value == NULL:
+        return None
+    if isinstance(value, QDateTime):
+        return value.toPyDateTime()
+    if isinstance(value, QDate):
+        return value.toPyDate()
+    if isinstance(value, QTime):
+        return value.toPyTime()
+    return value
+
+
+# Tipo de columna por tipo de campo de QGIS (el resto se exporta como texto)
+_FIELD_KINDS = {
+    QVariant.Int: 'int', QVariant.UInt: 'int', QVariant.LongLong: 'int', QVariant.ULongLong: 'int',
+    QVariant.Double: 'float', QVariant.Bool: 'bool',
+    QVariant.Date: 'date', QVariant.DateTime: 'datetime'
+}
+
+
+def field_kind(field):
+    """Tipo de columna de un QgsField: 'int', 'float', 'bool', 'date', 'datetime' o 'str'."""
+    return _FIELD_KINDS.get(field.type(), 'str')
+
+
+def field_kinds(fields, field_indexes):
+    """
+    Tipo de columna de cada campo para los formatos tipados (Parquet/Arrow)
+
+    :param fields: Campos de la capa
+    :type fields: QgsFields
+
+    :returns: Lista con 'int', 'float', 'bool', 'date', 'datetime' o 'str'
+    :rtype: list of str
+    """
+    return [field_kind(fields.at(i)) for i in field_indexes]
+
+
+def read_batches(source, field_indexes, request=None, batch_size=BATCH_SIZE):
+    """
+    Recorre una fuente de entidades y devuelve los atributos por bloques de filas.
+    Usar con una QgsVectorLayerFeatureSource para poder leer desde otro hilo.
+
+    :param source: Fuente de entidades
+    :type source: QgsAbstractFeatureSource
+
+    :param field_indexes: Índices de los campos a leer, en orden
+    :type field_indexes: list of int
+
+    :param request: Petición base (filtro); se le quita la geometría
+    :type request: QgsFeatureRequest
+
+    :returns: Generador de listas de filas
+    """
+    request = QgsFeatureRequest(request) if request is not None else QgsFeatureRequest()
+    request.setFlags(request.flags() | QgsFeatureRequest.NoGeometry)
+    request.setSubsetOfAttributes(field_indexes)
+
+    batch = []
+    for feature in source.getFeatures(request):
+        attributes = feature.attributes()
+        batch.append([python_value(attributes[i]) for i in field_indexes])
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def partition_file_name(stem, value, extension, used):
+    """
+    Nombre de archivo para una partición (<stem>_<valor><extension>), único dentro de used
+
+    :param used: Nombres ya asignados (en minúsculas); se actualiza
+    :type used: set
+
+    :rtype: str
+    """
+    text = 'SIN_VALOR' if value is None else str(value).strip() or 'SIN_VALOR'
+    text = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', text).rstrip('. ')[:100]
+    candidate, suffix = f"{stem}_{text}{extension}", 2
+    while candidate.lower() in used:
+        candidate = f"{stem}_{text} ({suffix}){extension}"
+        suffix += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+class XlsxTableWriter:
+    """Libro XLSX escrito en streaming (openpyxl en modo write_only), una hoja por tabla"""
+
+    # Caracteres no válidos en nombres de hoja y longitud máxima
+    INVALID_SHEET_CHARS = re.compile(r'[\[\]:*?/\\]')
+    MAX_SHEET_NAME = 31
+
+    def __init__(self, path):
+        """
+        Constructor.
+
+        :param path: Ruta del libro de salida
+        :type path: str
+        """
+        from openpyxl import Workbook
+
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.sheets = []
+        self.rows = 0
+
+    def sheet_name(self, name):
+        """Nombre de hoja válido y único a partir del nombre de la capa."""
+        base = self.INVALID_SHEET_CHARS.sub('_', name).strip("'")[:self.MAX_SHEET_NAME] or 'Hoja'
+        existing = {sheet.title.lower() for sheet in self.sheets}
+        candidate, suffix = base, 2
+        while candidate.lower() in existing:
+            tail = f" ({suffix})"
+            candidate = base[:self.MAX_SHEET_NAME - len(tail)] + tail
+            suffix += 1
+        return candidate
+
+    def add_table(self, name, header, kinds=None):
+        """
+        Crea una hoja con su fila de cabecera
+
+        :returns: Identificador de la hoja para write_rows
+        :rtype: int
+        """
+        sheet = self.workbook.create_sheet(self.sheet_name(name))
+        sheet.append(list(header))
+        self.sheets.append(sheet)
+        return len(self.sheets) - 1
+
+    def write_rows(self, table, rows):
+        """Añade filas a una hoja. Las hojas pueden recibir filas intercaladas."""
+        sheet = self.sheets[table]
+        for row in rows:
+            sheet.append(row)
+        self.rows += len(rows)
+
+    def close(self):
+        """Guarda el libro."""
+        if not self.sheets:
+            self.workbook.create_sheet('Hoja')
+        self.workbook.save(self.path)
+
+
+class CsvTableWriter:
+    """CSV escrito en streaming, en UTF-8 con BOM para que Excel lo abra con tildes correctas"""
+
+    def __init__(self, path):
+        """
+        Constructor.
+
+        :param path: Ruta del CSV de salida
+        :type path: str
+        """
+        self.path = path
+        self.file = open(path, 'w', encoding='utf-8-sig', newline='')
+        self.writer = csv.writer(self.file)
+        self.tables = 0
+        self.rows = 0
+
+    def add_table(self, name, header, kinds=None):
+        """Escribe la cabecera. Un CSV solo admite una tabla."""
+        if self.tables:
+            raise Exception("El formato CSV admite una sola tabla por archivo")
+        self.writer.writerow(header)
+        self.tables = 1
+        return 0
+
+    def write_rows(self, table, rows):
+        """Añade filas al CSV."""
+        self.writer.writerows(rows)
+        self.rows += len(rows)
+
+    def close(self):
+        """Cierra el archivo."""
+        self.file.close()
+
+
+class ArrowTableWriter:
+    """Tabla columnar Arrow (IPC/Feather) escrita por bloques; requiere pyarrow"""
+
+    # Tipos de pyarrow por tipo de columna (ver field_kinds)
+    ARROW_TYPES = {
+        'int': 'int64', 'float': 'float64', 'bool': 'bool_',
+        'date': 'date32', 'datetime': 'timestamp', 'str': 'string'
+    }
+
+    def __init__(self, path):
+        """
+        Constructor.
+
+        :param path: Ruta del archivo de salida
+        :type path: str
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise Exception(
+                "El formato Parquet/Arrow requiere la librería pyarrow "
+                "(instálela en el Python de QGIS: pip install pyarrow)"
+            )
+        self.pa = pyarrow
+        self.path = path
+        self.schema = None
+        self.kinds = None
+        self.sink = None
+        self.rows = 0
+
+    def arrow_type(self, kind):
+        """Tipo de pyarrow de una columna."""
+        name = self.ARROW_TYPES.get(kind, 'string')
+        return self.pa.timestamp('ms') if name == 'timestamp' else getattr(self.pa, name)()
+
+    def open_sink(self):
+        """Abre el escritor de bloques (ver ParquetTableWriter)."""
+        return self.pa.ipc.new_file(self.path, self.schema)
+
+    def add_table(self, name, header, kinds=None):
+        """Define el esquema. Un archivo columnar solo admite una tabla."""
+        if self.schema is not None:
+            raise Exception("Los formatos Parquet/Arrow admiten una sola tabla por archivo")
+        self.kinds = list(kinds or ['str'] * len(header))
+        self.schema = self.pa.schema([
+            (name, self.arrow_type(kind)) for name, kind in zip(header, self.kinds)
+        ])
+        self.sink = self.open_sink()
+        return 0
+
+    def write_rows(self, table, rows):
+        """Convierte un bloque de filas en columnas y lo añade como un lote."""
+        if not rows:
+            return
+        columns = []
+        for column, kind in zip(zip(*rows), self.kinds):
+            if kind == 'str':
+                column = [None if value is None else str(value) for value in column]
+            columns.append(column)
+        batch = self.pa.RecordBatch.from_arrays(
+            [self.pa.array(column, type=field.type) for column, field in zip(columns, self.schema)],
+            schema=self.schema
+        )
+        self.write_batch(batch)
+        self.rows += len(rows)
+
+    def write_columns(self, table, columns):
+        """
+        Añade un bloque dado por columnas (listas o arreglos tipados de array),
+        sin pasar por filas: los arreglos numéricos se convierten sin copia.
+        """
+        import numpy as np
+
+        arrays = []
+        for column, field in zip(columns, self.schema):
+            if hasattr(column, 'typecode'):
+                column = np.frombuffer(column, dtype='int64' if column.typecode == 'q' else 'float64')
+            elif field.type == self.pa.string():
+                column = [None if value is None else str(value) for value in column]
+            arrays.append(self.pa.array(column, type=field.type))
+        batch = self.pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        self.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def write_batch(self, batch):
+        """Añade un lote al archivo."""
+        self.sink.write_batch(batch)
+
+    def close(self):
+        """Cierra el archivo."""
+        if self.sink is None:
+            self.add_table('Hoja', [])
+        self.sink.close()
+
+
+class ParquetTableWriter(ArrowTableWriter):
+    """Tabla Parquet escrita por grupos de filas; requiere pyarrow"""
+
+    def open_sink(self):
+        import pyarrow.parquet
+        return pyarrow.parquet.ParquetWriter(self.path, self.schema)
+
+    def write_batch(self, batch):
+        self.sink.write_table(self.pa.Table.from_batches([batch]))
+
+
+# Formatos de exportación: clave → (descripción, extensión, escritor)
+FORMATS = {
+    'xlsx': ('Excel (XLSX)', '.xlsx', XlsxTableWriter),
+    'csv': ('CSV (UTF-8 con BOM)', '.csv', CsvTableWriter),
+    'parquet': ('Parquet', '.parquet', ParquetTableWriter),
+    'arrow': ('Arrow / Feather', '.arrow', ArrowTableWriter)
+}
+
+
+def output_with_extension(path, fmt):
+    """Ruta con la extensión del formato (reemplaza la de otro formato conocido)."""
+    extension = FORMATS[fmt][1]
+    root, current = os.path.splitext(path)
+    if current.lower() == extension:
+        return path
+    if current.lower() in {ext for _, ext, _ in FORMATS.values()}:
+        return root + extension
+    return path + extension
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ VertexOrderer
+                                 A QGIS plugin
+ Reconstrucción del orden del contorno a partir de vértices desordenados
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+from math import atan2, hypot, pi
+from qgis.core import QgsSpatialIndex, QgsFeature, QgsGeometry
+
+
+class VertexOrderer:
+    """Clase para ordenar vértices de un contorno entregados en cualquier orden (p. ej. por código o cota)"""
+
+    # Modos de PolygonCreator.DEFAULT_OPTIONS['vertex_order']
+    AUTO = 'auto'        # Solo si el polígono en el orden del archivo se autointersecta
+    ALWAYS = 'always'
+    NEVER = 'never'
+
+    def __init__(self):
+        """Constructor."""
+        # Método usado en la última llamada a order ('archivo', 'vecino_mas_cercano' o 'barrido_angular')
+        self.method = 'archivo'
+        self.duplicates = 0
+
+    @staticmethod
+    def is_simple_ring(points):
+        """
+        Indica si los puntos, en ese orden, forman un anillo sin autointersecciones.
+        Solo se mira el cruce de lados: otros defectos de validez (p. ej. un
+        anillo mal orientado) no justifican reordenar el archivo.
+        """
+        if len(points) < 3:
+            return False
+        ring = list(points)
+        if not ring[0].compare(ring[-1], 1e-9):
+            ring.append(ring[0])
+        return QgsGeometry.fromPolylineXY(ring).isSimple()
+
+    @staticmethod
+    def perimeter(points):
+        """Perímetro del anillo cerrado."""
+        return sum(
+            hypot(b.x() - a.x(), b.y() - a.y())
+            for a, b in zip(points, points[1:] + points[:1])
+        )
+
+    @staticmethod
+    def unique_points(points):
+        """Puntos sin coordenadas repetidas (p. ej. el cierre del anillo), en su orden original."""
+        seen = set()
+        result = []
+        for point in points:
+            key = (point.x(), point.y())
+            if key not in seen:
+                seen.add(key)
+                result.append(point)
+        return result
+
+    @staticmethod
+    def nearest_neighbour_order(points):
+        """
+        Encadena los vértices por vecino más cercano con un índice espacial,
+        empezando por el vértice más al norte. O(n log n).
+
+        :rtype: list of QgsPointXY
+        """
+        index = QgsSpatialIndex()
+        for i, point in enumerate(points):
+            feature = QgsFeature(i)
+            feature.setGeometry(QgsGeometry.fromPointXY(point))
+            index.addFeature(feature)
+
+        current = max(range(len(points)), key=lambda i: (points[i].y(), -points[i].x()))
+        order = [current]
+        for _ in range(len(points) - 1):
+            # El vértice visitado sale del índice: el siguiente vecino es siempre uno pendiente
+            feature = QgsFeature(current)
+            feature.setGeometry(QgsGeometry.fromPointXY(points[current]))
+            index.deleteFeature(feature)
+            current = index.nearestNeighbor(points[current], 1)[0]
+            order.append(current)
+        return [points[i] for i in order]
+
+    @staticmethod
+    def angular_order(points):
+        """
+        Ordena los vértices por ángulo alrededor del centroide (barrido angular),
+        en sentido horario empezando por el norte. Correcto para contornos en
+        estrella respecto al centroide. O(n log n).
+
+        :rtype: list of QgsPointXY
+        """
+        cx = sum(p.x() for p in points) / len(points)
+        cy = sum(p.y() for p in points) / len(points)
+        # Rumbo desde el centroide (0 = norte, creciente en sentido horario),
+        # como la numeración de vértices del segmentador
+        return sorted(points, key=lambda p: (
+            atan2(p.x() - cx, p.y() - cy) % (2 * pi), hypot(p.x() - cx, p.y() - cy)
+        ))
+
+    def order(self, points, mode=AUTO):
+        """
+        Devuelve los vértices en orden de contorno
+
+        :param points: Vértices en el orden del archivo
+        :type points: list of QgsPointXY
+
+        :param mode: AUTO (solo si el orden del archivo se autointersecta), ALWAYS o NEVER
+        :type mode: str
+
+        :returns: Vértices ordenados (los originales si no hace falta reordenar)
+        :rtype: list of QgsPointXY
+        """
+        self.method = 'archivo'
+        self.duplicates = 0
+        if mode == self.NEVER or len(points) < 4:
+            return points
+        if mode == self.AUTO and self.is_simple_ring(points):
+            return points
+
+        unique = self.unique_points(points)
+        self.duplicates = len(points) - len(unique)
+        if len(unique) < 4:
+            return unique
+
+        chained = self.nearest_neighbour_order(unique)
+        if self.is_simple_ring(chained):
+            self.method = 'vecino_mas_cercano'
+            return chained
+
+        # El encadenamiento falla con espaciados muy irregulares: barrido angular
+        swept = self.angular_order(unique)
+        if self.is_simple_ring(swept):
+            self.method = 'barrido_angular'
+            return swept
+
+        # Ninguno es válido: el contorno más corto es el más plausible
+        if self.perimeter(chained) <= self.perimeter(swept):
+            self.method = 'vecino_mas_cercano'
+            return chained
+        self.method = 'barrido_angular'
+        return swept
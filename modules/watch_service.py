@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ WatchService
+                                 A QGIS plugin
+ Servicio que vigila una carpeta de entregas y procesa cada archivo al llegar
+                             -------------------
+        begin                : 2025-04-21
+        copyright            : (C) 2025 by Yuri Caller
+        email                : yuricaller@gmail.com
+ ***************************************************************************/
+"""
+
+import argparse
+import os
+import signal
+import sys
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from qgis.core import QgsMessageLog, Qgis
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+
+from .delivery_pipeline import DeliveryPipeline
+from .batch_manifest import BatchManifest
+from .conversion_cache import file_hash
+
+
+class WatchService(QObject):
+    """
+    Vigila una carpeta y pasa cada Excel/CSV nuevo o modificado por el flujo
+    completo (Excel → CSV → polígono → segmentos → tabla de vértices), con las
+    salidas junto al archivo de entrada.
+
+    Los hilos de trabajo y sus herramientas se crean una sola vez y se
+    reutilizan: el coste por archivo es solo el del cálculo. Una ráfaga de
+    archivos se encola y se procesa con un máximo de `workers` a la vez.
+    Necesita un bucle de eventos de Qt (el de QGIS o QgsApplication.exec_()).
+    """
+
+    # Señal emitida en el hilo principal con el resultado de cada archivo
+    file_processed = pyqtSignal(dict)
+
+    # Revisión periódica (las carpetas de red no siempre notifican cambios)
+    POLL_MS = 5000
+
+    # Espera tras un aviso de cambio antes de revisar la carpeta
+    DEBOUNCE_MS = 500
+
+    # Sufijo de la tabla de vértices que escribe el flujo (no es una entrega)
+    OUTPUT_SUFFIX = '_vertices.xlsx'
+
+    # Opciones del flujo propias del servicio: CSV intermedio y salidas junto a la entrada
+    SERVICE_OPTIONS = {'keep_csv': True, 'export': True, 'output_dir': None}
+
+    # Señal interna para volver al hilo principal desde los hilos de trabajo
+    _finished = pyqtSignal(str, str, dict)
+
+    def __init__(self, folder, options=None, pattern=None, workers=2, parent=None):
+        """
+        Constructor.
+
+        :param folder: Carpeta de entregas a vigilar
+        :type folder: str
+
+        :param options: Opciones del flujo (ver DeliveryPipeline.DEFAULT_OPTIONS)
+        :type options: dict
+
+        :param pattern: Patrones de archivo separados por ';' (ver DeliveryPipeline.list_inputs)
+        :type pattern: str
+
+        :param workers: Archivos procesados a la vez como máximo
+        :type workers: int
+        """
+        super(WatchService, self).__init__(parent)
+        self.folder = folder
+        self.options = dict(options or {}, **self.SERVICE_OPTIONS)
+        self.pattern = pattern
+        self.workers = max(1, workers)
+        self.manifest = BatchManifest(os.path.join(folder, BatchManifest.FILE_NAME))
+        if self.manifest.load_error:
+            QgsMessageLog.logMessage(
+                f"Manifiesto ilegible, se empieza de cero: {self.manifest.load_error}",
+                "YF Tools Plus",
+                Qgis.Warning
+            )
+
+        # Estado de cada archivo: firma (tamaño, fecha) vista en la última revisión
+        self.seen = {}
+        # Firma ya procesada (o en proceso) de cada archivo
+        self.handled = {}
+        self.pending = deque()
+        self.running = set()
+        self.processed = 0
+        self.failed = 0
+
+        self.executor = None
+        self.local = threading.local()
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.schedule_scan)
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.timeout.connect(self.scan)
+        self.poll = QTimer(self)
+        self.poll.timeout.connect(self.scan)
+        self._finished.connect(self.on_finished)
+
+    def is_active(self):
+        """Indica si el servicio está en marcha."""
+        return self.executor is not None
+
+    def start(self):
+        """Empieza a vigilar la carpeta y procesa lo pendiente."""
+        if self.is_active():
+            return
+        if not os.path.isdir(self.folder):
+            raise Exception(f"La carpeta '{self.folder}' no existe")
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='yf_watch')
+        self.watcher.addPath(self.folder)
+        self.poll.start(self.POLL_MS)
+        QgsMessageLog.logMessage(
+            f"Vigilando {self.folder} ({self.workers} hilo(s) de trabajo)",
+            "YF Tools Plus",
+            Qgis.Info
+        )
+        self.scan()
+
+    def stop(self, wait=False):
+        """
+        Deja de vigilar. Los archivos en proceso terminan; los encolados se descartan.
+
+        :param wait: Esperar a que terminen los archivos en proceso
+        :type wait: bool
+        """
+        if not self.is_active():
+            return
+        self.poll.stop()
+        self.debounce.stop()
+        self.watcher.removePath(self.folder)
+        self.pending.clear()
+        self.executor.shutdown(wait=wait)
+        self.executor = None
+        QgsMessageLog.logMessage(
+            f"Servicio detenido: {self.processed} archivo(s) procesado(s), {self.failed} con error",
+            "YF Tools Plus",
+            Qgis.Info
+        )
+
+    def schedule_scan(self, *args):
+        """Agrupa los avisos de cambio seguidos en una sola revisión."""
+        self.debounce.start(self.DEBOUNCE_MS)
+
+    def is_output(self, path, names):
+        """
+        Indica si el archivo es una salida del propio flujo
+
+        :param names: Nombres (en minúsculas) presentes en la carpeta
+        :type names: set
+        """
+        name = os.path.basename(path).lower()
+        if name.endswith(self.OUTPUT_SUFFIX):
+            return True
+        stem, extension = os.path.splitext(name)
+        # CSV intermedio escrito junto a su libro
+        return extension == '.csv' and bool({stem + '.xlsx', stem + '.xls'} & names)
+
+    def scan(self):
+        """Revisa la carpeta y encola los archivos nuevos o modificados que ya terminaron de copiarse."""
+        if not self.is_active():
+            return
+        try:
+            inputs = DeliveryPipeline.list_inputs(self.folder, self.pattern)
+        except OSError as e:
+            QgsMessageLog.logMessage(f"No se pudo leer la carpeta vigilada: {str(e)}", "YF Tools Plus", Qgis.Warning)
+            return
+        names = {os.path.basename(path).lower() for path in inputs}
+
+        current = {}
+        for path in inputs:
+            if self.is_output(path, names):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            current[path] = signature
+            # Un archivo que aún se está copiando cambia entre revisiones: se espera
+            # a que su firma se repita antes de procesarlo
+            if self.seen.get(path) != signature or self.handled.get(path) == signature:
+                continue
+            if path in self.running or path in self.pending:
+                continue
+            self.handled[path] = signature
+            self.pending.append(path)
+
+        if any(self.seen.get(path) != signature for path, signature in current.items()):
+            # Hay archivos a medio copiar: revisar de nuevo en breve
+            self.debounce.start(self.DEBOUNCE_MS * 2)
+        self.seen = current
+        self.dispatch()
+
+    def dispatch(self):
+        """Envía trabajo a los hilos hasta ocupar todos."""
+        while self.pending and len(self.running) < self.workers:
+            path = self.pending.popleft()
+            self.running.add(path)
+            self.executor.submit(self.process, path)
+
+    def process(self, path):
+        """Procesa un archivo en un hilo de trabajo (con las herramientas de ese hilo ya creadas)."""
+        result = {'input': path, 'output': None, 'ok': False, 'error': None, 'layers': [], 'profile': None}
+        digest = ''
+        try:
+            digest = file_hash(path)
+            if self.manifest.is_done(digest):
+                result.update(ok=True, skipped=True, output=self.manifest.entries[digest]['output'])
+            else:
+                pipeline = getattr(self.local, 'pipeline', None)
+                if pipeline is None:
+                    pipeline = self.local.pipeline = DeliveryPipeline()
+                result = pipeline.run(path, self.options)
+                # Las capas no se añaden al proyecto: solo cuentan las salidas en disco
+                result['layers'] = []
+                self.manifest.record(digest, result)
+        except Exception as e:
+            result['error'] = str(e)
+            QgsMessageLog.logMessage(
+                f"Error al procesar {path}: {str(e)}\n{traceback.format_exc()}",
+                "YF Tools Plus",
+                Qgis.Critical
+            )
+        self._finished.emit(path, digest, result)
+
+    def on_finished(self, path, digest, result):
+        """Recibe el resultado de un archivo en el hilo principal y continúa con la cola."""
+        self.running.discard(path)
+        if not result.get('skipped'):
+            if result['ok']:
+                self.processed += 1
+                seconds = result['profile'].total_seconds() if result['profile'] else 0.0
+                QgsMessageLog.logMessage(
+                    f"✓ {os.path.basename(path)} → {result['output']} ({seconds:.2f} s)",
+                    "YF Tools Plus",
+                    Qgis.Success
+                )
+            else:
+                self.failed += 1
+        self.file_processed.emit(result)
+        if self.is_active():
+            self.dispatch()
+
+
+def main(argv=None):
+    """
+    Servicio sin interfaz. Desde la carpeta del plugin, con el Python de QGIS:
+
+        python -m modules.watch_service C:/entregas --workers 2 --crs EPSG:32718
+    """
+    parser = argparse.ArgumentParser(description="Vigila una carpeta de entregas y las procesa al llegar")
+    parser.add_argument('folder')
+    parser.add_argument('--pattern', default=DeliveryPipeline.DEFAULT_PATTERN)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--field-x', default=DeliveryPipeline.DEFAULT_OPTIONS['field_x'])
+    parser.add_argument('--field-y', default=DeliveryPipeline.DEFAULT_OPTIONS['field_y'])
+    parser.add_argument('--crs', default=DeliveryPipeline.DEFAULT_OPTIONS['crs'])
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from qgis.core import QgsApplication
+    app = QgsApplication([], False)
+    app.initQgis()
+
+    # Los mensajes del registro se muestran en la consola
+    QgsApplication.messageLog().messageReceived.connect(
+        lambda message, tag, level: print(f"[{tag}] {message}", flush=True)
+    )
+
+    service = WatchService(
+        args.folder,
+        {'field_x': args.field_x, 'field_y': args.field_y, 'crs': args.crs},
+        args.pattern,
+        args.workers
+    )
+    service.start()
+
+    # Ctrl+C detiene el servicio; el temporizador deja a Python atender la señal
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    heartbeat = QTimer()
+    heartbeat.timeout.connect(lambda: None)
+    heartbeat.start(500)
+
+    code = app.exec_()
+    service.stop(wait=True)
+    app.exitQgis()
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
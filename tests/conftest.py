@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la lógica pura de los módulos (sin QGIS).
+
+Los módulos se importan como paquete `modules` desde la raíz del plugin;
+las pruebas que necesitan QGIS se omiten si no está disponible.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+
+from modules.batch_manifest import BatchManifest
+from modules.run_profiler import RunProfiler
+
+
+def result(tmp_path, name, ok=True):
+    profiler = RunProfiler(name)
+    with profiler.stage('lectura'):
+        pass
+    profiler.finish()
+    output = tmp_path / f'{name}.gpkg'
+    if ok:
+        output.write_bytes(b'')
+    return {
+        'input': str(tmp_path / f'{name}.xlsx'),
+        'ok': ok,
+        'output': str(output) if ok else None,
+        'error': None if ok else 'sin columnas X/Y',
+        'profile': profiler
+    }
+
+
+def test_resume_skips_finished_files(tmp_path):
+    path = str(tmp_path / BatchManifest.FILE_NAME)
+    manifest = BatchManifest(path)
+    manifest.record('aaa', result(tmp_path, 'a'))
+    manifest.record('bbb', result(tmp_path, 'b', ok=False))
+
+    resumed = BatchManifest(path)
+    assert resumed.load_error is None
+    assert resumed.is_done('aaa')
+    # Los fallidos y los desconocidos se vuelven a procesar
+    assert not resumed.is_done('bbb')
+    assert not resumed.is_done('ccc')
+    assert resumed.entries['bbb']['error'] == 'sin columnas X/Y'
+    assert 'lectura' in resumed.entries['aaa']['stages']
+
+
+def test_missing_output_is_processed_again(tmp_path):
+    path = str(tmp_path / BatchManifest.FILE_NAME)
+    manifest = BatchManifest(path)
+    entry = result(tmp_path, 'a')
+    manifest.record('aaa', entry)
+    os.remove(entry['output'])
+    assert not BatchManifest(path).is_done('aaa')
+
+
+def test_unreadable_manifest_starts_empty(tmp_path):
+    path = tmp_path / BatchManifest.FILE_NAME
+    path.write_text('{"entries": {', encoding='utf-8')
+    manifest = BatchManifest(str(path))
+    assert manifest.entries == {}
+    assert manifest.load_error
+
+
+def test_save_is_atomic_and_versioned(tmp_path):
+    path = str(tmp_path / BatchManifest.FILE_NAME)
+    BatchManifest(path).record('aaa', result(tmp_path, 'a'))
+    assert not os.path.exists(path + '.tmp')
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['version'] == 1
+
+
+def test_concurrent_records_are_all_kept(tmp_path):
+    path = str(tmp_path / BatchManifest.FILE_NAME)
+    manifest = BatchManifest(path)
+    threads = [
+        threading.Thread(target=manifest.record, args=(f'd{i}', result(tmp_path, f'f{i}')))
+        for i in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(BatchManifest(path).entries) == 10
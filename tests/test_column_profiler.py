@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from modules.column_profiler import ColumnProfiler
+
+
+def write(tmp_path, text, name='puntos.csv'):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_detect_utm_columns_by_range(tmp_path):
+    path = write(tmp_path, (
+        'ID;COTA;C1;C2\n'
+        '1;120,5;280123,45;8654321,10\n'
+        '2;121,0;280130,00;8654330,50\n'
+        '3;119,8;280150,25;8654310,75\n'
+    ))
+    result = ColumnProfiler().detect(path)
+    assert (result['x'], result['y'], result['kind']) == ('C1', 'C2', 'utm')
+
+
+def test_detect_geographic_columns_by_name(tmp_path):
+    path = write(tmp_path, 'punto,LAT,LON\nA,-12.0464,-77.0428\nB,-12.0470,-77.0431\nC,-12.0480,-77.0440\n')
+    result = ColumnProfiler().detect(path)
+    assert (result['x'], result['y'], result['kind']) == ('LON', 'LAT', 'geographic')
+
+
+def test_detect_geographic_columns_by_magnitude(tmp_path):
+    # Sin nombres útiles ni valores fuera de ±90: la longitud tiene mayor valor absoluto
+    path = write(tmp_path, 'a,b\n-12.0464,-77.0428\n-12.0470,-77.0431\n-12.0480,-77.0440\n')
+    result = ColumnProfiler().detect(path)
+    assert (result['x'], result['y']) == ('b', 'a')
+
+
+def test_identifier_columns_are_not_coordinates(tmp_path):
+    path = write(tmp_path, 'ID,NOMBRE\n1,a\n2,b\n3,c\n')
+    result = ColumnProfiler().detect(path)
+    assert result['x'] is None and result['y'] is None
+
+
+def test_sample_is_bounded(tmp_path):
+    rows = '\n'.join(f'{i},{280000 + i}.5,{8650000 + i}.5' for i in range(1000))
+    path = write(tmp_path, 'id,X,Y\n' + rows + '\n')
+    profiler = ColumnProfiler(sample_rows=50)
+    assert len(profiler.read_sample(path)) == 50
+    assert profiler.detect(path)['x'] == 'X'
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import os
+
+from modules.conversion_cache import ConversionCache, file_hash
+
+
+def writer(size):
+    def write(path):
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+    return write
+
+
+def touch(cache, key, when):
+    os.utime(cache.path_for(key), (when, when))
+
+
+def test_file_hash_reads_in_chunks(tmp_path):
+    path = tmp_path / 'libro.xlsx'
+    path.write_bytes(b'abc' * 1000)
+    assert file_hash(str(path), chunk_size=7) == file_hash(str(path))
+
+
+def test_make_key_depends_on_selection():
+    key = ConversionCache.make_key('d', 'Hoja1', ['X', 'Y'], 'utf-8')
+    assert key == ConversionCache.make_key('d', 'Hoja1', ('X', 'Y'), 'UTF-8')
+    assert key != ConversionCache.make_key('d', 'Hoja2', ['X', 'Y'], 'utf-8')
+    assert key != ConversionCache.make_key('d', 'Hoja1', None, 'utf-8')
+
+
+def test_lookup_counts_hits_and_misses(tmp_path):
+    cache = ConversionCache(str(tmp_path))
+    assert cache.lookup('a') is None
+    cache.store('a', writer(10))
+    assert cache.lookup('a') == cache.path_for('a')
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_store_leaves_no_temporary_file_on_error(tmp_path):
+    cache = ConversionCache(str(tmp_path))
+
+    def fail(path):
+        raise ValueError('hoja dañada')
+
+    try:
+        cache.store('a', fail)
+    except ValueError:
+        pass
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ConversionCache(str(tmp_path), max_bytes=250)
+    cache.store('a', writer(100))
+    touch(cache, 'a', 1000)
+    cache.store('b', writer(100))
+    touch(cache, 'b', 2000)
+    # Usar 'a' la vuelve la más reciente
+    touch(cache, 'a', 3000)
+    cache.store('c', writer(100))
+    assert os.path.exists(cache.path_for('a'))
+    assert not os.path.exists(cache.path_for('b'))
+    assert os.path.exists(cache.path_for('c'))
+    assert cache.size() == 200
+
+
+def test_keeps_new_entry_larger_than_limit(tmp_path):
+    cache = ConversionCache(str(tmp_path), max_bytes=50)
+    cache.store('a', writer(10))
+    cache.store('grande', writer(100))
+    assert not os.path.exists(cache.path_for('a'))
+    assert os.path.exists(cache.path_for('grande'))
+
+
+def test_clear(tmp_path):
+    cache = ConversionCache(str(tmp_path))
+    cache.store('a', writer(10))
+    cache.clear()
+    assert cache.size() == 0
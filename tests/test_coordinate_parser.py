@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+import pytest
+
+from modules.coordinate_parser import CoordinateParser
+
+
+def write(tmp_path, text, encoding='utf-8', name='puntos.csv'):
+    path = tmp_path / name
+    path.write_bytes(text.encode(encoding))
+    return str(path)
+
+
+def test_guess_decimal():
+    assert CoordinateParser.guess_decimal(['280.123,45', '1,5', 'x']) == ','
+    assert CoordinateParser.guess_decimal(['280,123.45', '1.5', '2,5']) == '.'
+    # Los espacios no separables de Excel no impiden reconocer el número
+    assert CoordinateParser.guess_decimal(['280\xa0123,45', '8 654 321,1']) == ','
+
+
+def test_to_numeric_comma_decimal():
+    series = pd.Series(['280.123,45', '280123,45', '1.234', '1\xa0234,5', 'abc', ''])
+    values = CoordinateParser().to_numeric(series, ',').tolist()
+    assert values[:4] == [280123.45, 280123.45, 1234.0, 1234.5]
+    assert pd.isna(values[4]) and pd.isna(values[5])
+
+
+def test_to_numeric_dot_decimal_and_detection():
+    series = pd.Series(['280,123.45', '280123.45', '1,234', '8 654 321.5'])
+    assert CoordinateParser().to_numeric(series).tolist() == [280123.45, 280123.45, 1234.0, 8654321.5]
+
+
+def test_to_numeric_keeps_numeric_columns():
+    series = pd.Series([1, 2, 3])
+    assert CoordinateParser().to_numeric(series).tolist() == [1.0, 2.0, 3.0]
+
+
+def test_sniff_semicolon_cp1252(tmp_path):
+    path = write(tmp_path, 'Código;Este;Norte\nV1;280123,45;8654321,10\nV2;280130,00;8654330,5\n', 'cp1252')
+    parser = CoordinateParser()
+    assert parser.sniff(path) == (';', ',')
+    assert parser.encoding == 'cp1252'
+    assert parser.read_header(path) == ['Código', 'Este', 'Norte']
+
+
+def test_read_coordinates_summarizes_rejected_rows(tmp_path):
+    path = write(tmp_path, 'id, X ,Y\n1,10.5,20.5\n2,,21\n3,11.5,n/d\n4,12,22\n')
+    xs, ys, summary = CoordinateParser().read_coordinates(path, 'X', 'Y')
+    assert xs.tolist() == [10.5, 12.0]
+    assert ys.tolist() == [20.5, 22.0]
+    assert summary['total'] == 4
+    assert summary['rejected'] == 2
+    assert summary['examples'] == [(3, '', '21'), (4, '11.5', 'n/d')]
+    assert CoordinateParser.describe(summary).startswith('2 de 4 fila(s)')
+
+
+def test_read_coordinates_missing_field(tmp_path):
+    path = write(tmp_path, 'X,Y\n1,2\n')
+    with pytest.raises(KeyError):
+        CoordinateParser().read_coordinates(path, 'Este', 'Y')
+
+
+def test_to_numeric_pyarrow_strings():
+    pytest.importorskip('pyarrow')
+    # Las columnas de texto de pyarrow usan RE2, que no admite los escapes \u
+    series = pd.Series(['280\xa0123,45', '1 234,5'], dtype='string[pyarrow]')
+    assert CoordinateParser().to_numeric(series, ',').tolist() == [280123.45, 1234.5]
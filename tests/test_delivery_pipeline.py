@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+# El flujo crea capas de QGIS: sin QGIS no se puede importar
+pytest.importorskip('qgis.core')
+
+from modules.delivery_pipeline import DeliveryPipeline  # noqa: E402
+
+
+@pytest.fixture(scope='module', autouse=True)
+def qgis_app():
+    from qgis.testing import start_app
+    return start_app()
+
+
+# Mismas claves que YF_Tools_PlusDialog.segment_options()
+DIALOG_SEGMENT_OPTIONS = {
+    'etiquetas_materializadas': False,
+    'formato_azimut': 'decimal',
+    'perfil_renderizado': False,
+    'modo_medicion': 'planar',
+    'correccion_terreno': False,
+    'altura_media': 0.0,
+    'capas_virtuales': True,
+    'simplificar': False,
+    'tolerancia_distancia': 0.01,
+    'tolerancia_angulo': 0.5,
+    'umbral_memoria_mb': 512,
+    'segmentos_por_parcela': False,
+    'poblado_progresivo': True
+}
+
+
+def test_run_with_dialog_segment_options(tmp_path):
+    path = tmp_path / 'parcela.csv'
+    path.write_text(
+        'ESTE,NORTE\n500000,8600000\n500100,8600000\n500100,8600100\n500000,8600100\n',
+        encoding='utf-8'
+    )
+    result = DeliveryPipeline().run(str(path), {
+        'export': False,
+        'segment_options': DIALOG_SEGMENT_OPTIONS
+    })
+    assert result['error'] is None
+    assert result['ok']
+    polygons, segments, vertices = result['layers']
+    assert segments.featureCount() == 4
+    assert vertices.featureCount() == 4
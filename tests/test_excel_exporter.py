@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+
+import pytest
+
+# El exportador trabaja con capas y tareas de QGIS: sin QGIS no se puede importar
+pytest.importorskip('qgis.core')
+
+from modules import excel_exporter  # noqa: E402
+from modules.excel_exporter import ExcelExporter  # noqa: E402
+
+
+class GeneratedExporter(ExcelExporter):
+    """Exportador que lee filas generadas en lugar de capas."""
+
+    QUEUE_BATCHES = 2
+
+    @staticmethod
+    def table_batches(table, read_indexes=None):
+        def batches():
+            for start in range(0, table['rows'], 10):
+                table['read'] += 1
+                yield [[i, f'fila {i}'] for i in range(start, min(start + 10, table['rows']))]
+        return batches(), None
+
+
+def specs(count, rows):
+    return [
+        {'name': f'Capa {n}', 'header': ['ID', 'NOMBRE'], 'field_indexes': [0, 1], 'rows': rows, 'read': 0}
+        for n in range(count)
+    ]
+
+
+def run_with_timeout(target, timeout=10):
+    """Ejecuta target en otro hilo; falla si no termina (bloqueo entre lectores y escritor)."""
+    outcome = {}
+
+    def call():
+        try:
+            outcome['result'] = target()
+        except Exception as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=call, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "write_layers quedó bloqueado"
+    return outcome
+
+
+def test_writes_every_row(tmp_path):
+    openpyxl = pytest.importorskip('openpyxl')
+    output = str(tmp_path / 'capas.xlsx')
+    outcome = run_with_timeout(lambda: GeneratedExporter().write_layers(specs(3, 95), output))
+    assert outcome['result'] == output
+    workbook = openpyxl.load_workbook(output, read_only=True)
+    assert workbook.sheetnames == ['Capa 0', 'Capa 1', 'Capa 2']
+    assert len(list(workbook['Capa 1'].iter_rows())) == 96
+
+
+def test_writer_error_does_not_block_readers(tmp_path, monkeypatch):
+    def fail(self, table, rows):
+        raise OSError('disco lleno')
+
+    monkeypatch.setattr(excel_exporter.XlsxTableWriter, 'write_rows', fail)
+    output = str(tmp_path / 'capas.xlsx')
+    tables = specs(4, 100000)
+    outcome = run_with_timeout(lambda: GeneratedExporter().write_layers(tables, output))
+    assert 'disco lleno' in str(outcome['error'])
+    assert not os.path.exists(output)
+    # Los lectores se detuvieron sin leer toda la tabla
+    assert all(table['read'] < 10000 for table in tables)
+
+
+def test_cancel_stops_readers(tmp_path):
+    output = str(tmp_path / 'capas.xlsx')
+    tables = specs(4, 100000)
+    written = []
+
+    def is_canceled():
+        written.append(True)
+        return len(written) > 3
+
+    outcome = run_with_timeout(lambda: GeneratedExporter().write_layers(tables, output, is_canceled))
+    assert outcome == {'result': None}
+    assert not os.path.exists(output)
+    assert all(table['read'] < 10000 for table in tables)
+
+
+def test_write_blocks_removes_partial_file(tmp_path):
+    def blocks():
+        yield [[1, 'uno'], [2, 'dos']]
+        raise OSError('lectura interrumpida')
+
+    output = str(tmp_path / 'tabla.csv')
+    with pytest.raises(Exception, match='lectura interrumpida'):
+        ExcelExporter().write_blocks('Tabla', ['ID', 'NOMBRE'], ['int', 'str'], blocks(), output, 'csv')
+    assert not os.path.exists(output)
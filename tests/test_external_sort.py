@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import random
+
+from modules.external_sort import ExternalSorter, parse_sort_spec
+
+
+def blocks(rows, size):
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+def flatten(batches):
+    return [row for batch in batches for row in batch]
+
+
+def test_parse_sort_spec():
+    assert parse_sort_spec('ID_Poligono, ID_Vertice DESC') == [('ID_Poligono', True), ('ID_Vertice', False)]
+    assert parse_sort_spec('"Nombre con espacios" asc') == [('Nombre con espacios', True)]
+    assert parse_sort_spec('Nombre con espacios') == [('Nombre con espacios', True)]
+    assert parse_sort_spec(' , ') == []
+    assert parse_sort_spec(None) == []
+
+
+def test_sort_in_memory_without_spilling():
+    rows = [[3, 'c'], [1, 'a'], [2, 'b']]
+    sorter = ExternalSorter([0])
+    assert flatten(sorter.sort(blocks(rows, 2))) == [[1, 'a'], [2, 'b'], [3, 'c']]
+    assert sorter.runs == 0
+
+
+def test_sort_spills_runs_and_merges():
+    random.seed(7)
+    rows = [[random.randint(0, 50), random.random(), i] for i in range(2500)]
+    sorter = ExternalSorter([0, 1], [True, False], run_rows=300)
+    result = flatten(sorter.sort(blocks(rows, 100)))
+    assert sorter.runs > 1
+    assert result == sorted(rows, key=lambda row: (row[0], -row[1]))
+
+
+def test_sort_is_stable_across_runs():
+    rows = [[i % 3, i] for i in range(1000)]
+    sorter = ExternalSorter([0], run_rows=128)
+    result = flatten(sorter.sort(blocks(rows, 50)))
+    assert sorter.runs > 1
+    # Dentro de cada clave se conserva el orden de entrada
+    assert result == sorted(rows, key=lambda row: row[0])
+
+
+def test_nulls_last_in_both_directions():
+    rows = [[None], [2], [1], [None], [3]]
+    assert flatten(ExternalSorter([0]).sort([rows])) == [[1], [2], [3], [None], [None]]
+    assert flatten(ExternalSorter([0], [False]).sort([rows])) == [[3], [2], [1], [None], [None]]
+
+
+def test_mixed_types_do_not_raise():
+    rows = [['b'], [10], ['a'], [2]]
+    result = flatten(ExternalSorter([0]).sort([rows]))
+    assert sorted(map(str, result)) == sorted(map(str, rows))
+    # Números entre sí se comparan como números
+    numbers = [row[0] for row in result if isinstance(row[0], int)]
+    assert numbers == [2, 10]
+
+
+def test_output_block_size():
+    rows = [[i] for i in range(1050)]
+    sorter = ExternalSorter([0], run_rows=200)
+    sizes = [len(batch) for batch in sorter.sort(blocks(rows, 100))]
+    assert sizes == [100] * 10 + [50]
+    sizes = [len(batch) for batch in ExternalSorter([0]).sort(blocks(rows, 100), batch_size=500)]
+    assert sizes == [500, 500, 50]
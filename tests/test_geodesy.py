@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+import math
+
+import numpy as np
+import pytest
+
+from modules.geodesy import GeodesicCalculator
+
+GRS80 = (6378137.0, 6378137.0 * (1 - 1 / 298.257222101))
+
+
+def dms(degrees, minutes, seconds):
+    sign = -1 if degrees < 0 else 1
+    return sign * (abs(degrees) + minutes / 60 + seconds / 3600)
+
+
+@pytest.fixture
+def grs80():
+    return GeodesicCalculator.from_axes(*GRS80, name='GRS80')
+
+
+def test_inverse_flinders_peak_buninyong(grs80):
+    # Ejemplo publicado por Geoscience Australia para la fórmula de Vincenty
+    distance, azimuth1, azimuth2 = grs80.inverse(
+        np.array([dms(144, 25, 29.52440)]), np.array([dms(-37, 57, 3.72030)]),
+        np.array([dms(143, 55, 35.38390)]), np.array([dms(-37, 39, 10.15610)])
+    )
+    assert distance[0] == pytest.approx(54972.271, abs=1e-3)
+    assert azimuth1[0] == pytest.approx(dms(306, 52, 5.37), abs=1e-5)
+    # Azimut de llegada = azimut inverso publicado + 180°
+    assert azimuth2[0] == pytest.approx(dms(127, 10, 25.07) + 180, abs=1e-5)
+
+
+def test_inverse_is_elementwise(grs80):
+    lon1 = np.array([0.0, -70.0, 10.0])
+    lat1 = np.array([0.0, -12.0, 45.0])
+    lon2 = np.array([1.0, -70.0, 10.5])
+    lat2 = np.array([0.0, -11.0, 45.5])
+    together = grs80.inverse(lon1, lat1, lon2, lat2)
+    for i in range(3):
+        alone = grs80.inverse(lon1[i:i + 1], lat1[i:i + 1], lon2[i:i + 1], lat2[i:i + 1])
+        for a, b in zip(together, alone):
+            # Solo cambia el número de iteraciones: diferencias submilimétricas
+            assert a[i] == pytest.approx(b[0], abs=1e-6)
+
+
+def test_inverse_along_equator_and_meridian(grs80):
+    distance, azimuth1, _ = grs80.inverse(
+        np.array([0.0, 0.0]), np.array([0.0, 0.0]), np.array([1.0, 0.0]), np.array([0.0, 1.0])
+    )
+    assert distance[0] == pytest.approx(GRS80[0] * math.pi / 180, abs=1e-6)
+    assert azimuth1[0] == pytest.approx(90.0)
+    assert distance[1] == pytest.approx(110574.389, abs=1e-2)
+    assert azimuth1[1] == pytest.approx(0.0)
+
+
+def test_inverse_coincident_points(grs80):
+    distance, azimuth1, azimuth2 = grs80.inverse(
+        np.array([-77.0]), np.array([-12.0]), np.array([-77.0]), np.array([-12.0])
+    )
+    assert distance[0] == 0.0
+    assert azimuth1[0] == azimuth2[0] == 0.0
+
+
+def test_ring_measures_close_the_ring(grs80):
+    lon = np.array([0.0, 1.0, 1.0, 0.0])
+    lat = np.array([0.0, 0.0, 1.0, 1.0])
+    distance, azimuth1, _ = grs80.ring_measures(None, lonlat=(lon, lat))
+    assert len(distance) == 4
+    assert distance[3] == pytest.approx(110574.389, abs=1e-2)
+    assert azimuth1[3] == pytest.approx(180.0)
+
+
+def test_ring_area_octant_of_sphere():
+    radius = 6371000.0
+    sphere = GeodesicCalculator.from_axes(radius, radius)
+    lonlat = (np.array([0.0, 90.0, 0.0]), np.array([0.0, 0.0, 90.0]))
+    assert sphere.ring_area(None, lonlat=lonlat) == pytest.approx(4 * math.pi * radius ** 2 / 8)
+
+
+def test_ring_area_ignores_orientation_and_antimeridian(grs80):
+    lon = np.array([179.5, -179.5, -179.5, 179.5])
+    lat = np.array([-10.0, -10.0, -9.0, -9.0])
+    area = grs80.ring_area(None, lonlat=(lon, lat))
+    assert area == pytest.approx(grs80.ring_area(None, lonlat=(lon[::-1], lat[::-1])))
+    shifted = grs80.ring_area(None, lonlat=(lon - 179.5 + (lon < 0) * 360, lat))
+    assert area == pytest.approx(shifted)
+    # Aproximadamente 1° x 1° cerca de los 10° S
+    assert area == pytest.approx(110600 * 109600, rel=0.01)
+
+
+def test_ground_factor(grs80):
+    lonlat = (np.array([0.0, 1.0]), np.array([-12.0, -12.0]))
+    assert grs80.ground_factor(None, 0.0, lonlat=lonlat) == 1.0
+    assert grs80.ground_factor(None, 3000.0, lonlat=lonlat) == pytest.approx(1 + 3000 / 6.37e6, rel=1e-3)
+
+
+def test_scale_factor_without_projection(grs80):
+    assert grs80.scale_factor((np.array([0.0]), np.array([0.0]))) is None
+
+
+class InvalidFactorsCrs:
+    """CRS cuyo cálculo de factores falla en PROJ."""
+
+    class Factors:
+        def isValid(self):
+            return False
+
+    def factors(self, point):
+        self.point = point
+        return self.Factors()
+
+
+def test_scale_factor_utm():
+    qgis_core = pytest.importorskip('qgis.core')
+    from qgis.testing import start_app
+    start_app()
+    calculator = GeodesicCalculator(qgis_core.QgsCoordinateReferenceSystem('EPSG:32718'))
+    # En el meridiano central de la zona 18 el factor es k0 = 0.9996
+    lonlat = (np.array([-75.0, -75.0]), np.array([-12.1, -11.9]))
+    assert calculator.scale_factor(lonlat) == pytest.approx(0.9996, abs=1e-6)
+    # A unos 3° del meridiano central la escala ya supera 1
+    assert calculator.scale_factor((np.array([-72.0]), np.array([-12.0]))) > 1
+
+
+def test_scale_factor_invalid_factors(grs80):
+    qgis_core = pytest.importorskip('qgis.core')
+    grs80.crs = InvalidFactorsCrs()
+    grs80._transform = object()
+    assert grs80.scale_factor((np.array([-75.0, -74.0]), np.array([-12.0, -13.0]))) is None
+    assert isinstance(grs80.crs.point, qgis_core.QgsPoint)
+    assert (grs80.crs.point.x(), grs80.crs.point.y()) == (-74.5, -12.5)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+# table_writers convierte tipos de QGIS: sin QGIS no se puede importar
+pytest.importorskip('qgis.core')
+
+from modules.table_writers import partition_file_name  # noqa: E402
+
+
+def test_value_in_name():
+    assert partition_file_name('vertices', 12, '.csv', set()) == 'vertices_12.csv'
+
+
+def test_empty_values():
+    used = set()
+    assert partition_file_name('vertices', None, '.csv', used) == 'vertices_SIN_VALOR.csv'
+    assert partition_file_name('vertices', '  ', '.csv', used) == 'vertices_SIN_VALOR (2).csv'
+
+
+def test_invalid_characters_are_replaced():
+    name = partition_file_name('v', 'Lote 3/4: "A"?.', '.xlsx', set())
+    assert name == 'v_Lote 3_4_ _A__.xlsx'
+
+
+def test_long_values_are_truncated():
+    assert len(partition_file_name('v', 'x' * 300, '.csv', set())) == len('v_') + 100 + len('.csv')
+
+
+def test_names_are_unique_ignoring_case():
+    used = set()
+    names = [partition_file_name('v', value, '.csv', used) for value in ('Norte', 'NORTE', 'norte')]
+    assert names == ['v_Norte.csv', 'v_NORTE (2).csv', 'v_norte (3).csv']
+    assert used == {name.lower() for name in names}
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import numpy as np
+
+from modules.ring_simplifier import RingSimplifier
+
+
+class Point:
+    """Punto con la interfaz de QgsPointXY que usa simplify."""
+
+    def __init__(self, x, y):
+        self._x, self._y = x, y
+
+    def x(self):
+        return self._x
+
+    def y(self):
+        return self._y
+
+
+def keep(simplifier, coords):
+    coords = np.asarray(coords, dtype=float)
+    return list(simplifier.keep_indices(coords[:, 0], coords[:, 1]))
+
+
+def test_removes_collinear_vertices():
+    square = [(0, 0), (5, 0), (10, 0), (10, 10), (0, 10)]
+    assert keep(RingSimplifier(), square) == [0, 2, 3, 4]
+
+
+def test_removes_straight_run_completely():
+    line = [(x, 0) for x in range(11)] + [(10, 10), (0, 10)]
+    assert keep(RingSimplifier(), line) == [0, 10, 11, 12]
+
+
+def test_removes_micro_segment():
+    square = [(0, 0), (10, 0), (10, 0.001), (10, 10), (0, 10)]
+    assert len(keep(RingSimplifier(distance_tolerance=0.01), square)) == 4
+
+
+def test_keeps_real_corners_and_triangles():
+    square = [(0, 0), (10, 0), (10, 10), (0, 10)]
+    assert keep(RingSimplifier(), square) == [0, 1, 2, 3]
+    # Todos los lados por debajo de la tolerancia: queda al menos un triángulo
+    tiny = [(0, 0), (0.001, 0), (0.002, 0.001), (0.001, 0.002), (0, 0.001)]
+    assert len(keep(RingSimplifier(distance_tolerance=1.0), tiny)) == 3
+
+
+def test_zero_tolerances_keep_everything():
+    line = [(0, 0), (5, 0), (10, 0), (10, 10), (0, 10)]
+    assert keep(RingSimplifier(distance_tolerance=0, angle_tolerance=0), line) == [0, 1, 2, 3, 4]
+
+
+def test_smooth_arc_is_not_erased():
+    angles = np.radians(np.arange(0, 360, 1.0))
+    circle = np.column_stack([100 * np.cos(angles), 100 * np.sin(angles)])
+    # Desvío de 1° por vértice, por encima de la tolerancia
+    assert len(keep(RingSimplifier(angle_tolerance=0.5), circle)) == 360
+
+
+def test_simplify_returns_same_point_objects():
+    points = [Point(0, 0), Point(5, 0), Point(10, 0), Point(10, 10), Point(0, 10)]
+    kept = RingSimplifier().simplify(points)
+    assert kept == [points[0], points[2], points[3], points[4]]
+
+
+def test_counters_and_summary():
+    simplifier = RingSimplifier()
+    square = [(0, 0), (5, 0), (10, 0), (10, 10), (0, 10)]
+    threads = [threading.Thread(target=keep, args=(simplifier, square)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (simplifier.rings, simplifier.removed) == (8, 8)
+    assert simplifier.summary('m') == (
+        "Simplificación: 8 vértice(s) eliminado(s) en 8 anillo(s) (tolerancias 0.01 m / 0.5°)."
+    )
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import json
+import time
+import tracemalloc
+
+import pytest
+
+from modules.run_profiler import RunProfiler
+
+
+def test_stages_accumulate_time_calls_and_items():
+    profiler = RunProfiler('Prueba')
+    for _ in range(3):
+        with profiler.stage('anillos', 'anillos') as stage:
+            stage.items += 2
+            time.sleep(0.01)
+    with profiler.stage('estilo'):
+        pass
+    profiler.finish()
+
+    anillos = profiler.stages['anillos']
+    assert (anillos.calls, anillos.items, anillos.unit) == (3, 6, 'anillos')
+    assert anillos.seconds >= 0.03
+    assert anillos.rate() == pytest.approx(6 / anillos.seconds)
+    assert profiler.stages['estilo'].rate() is None
+    assert profiler.total_seconds() >= anillos.seconds
+    # Tras finish el total queda fijo
+    assert profiler.total_seconds() == profiler.finish().total_seconds()
+
+
+def test_stage_time_counts_on_error():
+    profiler = RunProfiler('Prueba')
+    with pytest.raises(ValueError):
+        with profiler.stage('lectura'):
+            raise ValueError('archivo dañado')
+    assert profiler.stages['lectura'].calls == 1
+
+
+def test_to_dict_and_json(tmp_path):
+    profiler = RunProfiler('Prueba')
+    with profiler.stage('lectura', 'filas') as stage:
+        stage.items = 10
+    profiler.finish()
+
+    data = profiler.to_dict()
+    assert data['tool'] == 'Prueba'
+    assert data['trace_memory'] is False
+    assert [stage['name'] for stage in data['stages']] == ['lectura']
+    assert data['stages'][0]['items'] == 10
+    assert data['stages'][0]['unit'] == 'filas'
+    assert data['stages'][0]['peak_bytes'] is None
+
+    path = tmp_path / 'perfil.json'
+    profiler.write_json(str(path))
+    assert json.loads(path.read_text(encoding='utf-8')) == data
+    assert profiler.report().startswith('⏱ Prueba:')
+
+
+def test_nested_stage_keeps_outer_peak():
+    profiler = RunProfiler('Prueba', trace_memory=True)
+    try:
+        with profiler.stage('total'):
+            block = bytearray(4 * 1024 * 1024)
+            del block
+            with profiler.stage('interna'):
+                pass
+    finally:
+        profiler.finish()
+    assert profiler.stages['total'].peak_bytes >= 4 * 1024 * 1024
+    assert profiler.stages['interna'].peak_bytes < 4 * 1024 * 1024
+    assert not tracemalloc.is_tracing()
+
+
+def test_only_one_run_measures_memory_at_a_time():
+    first = RunProfiler('Primera', trace_memory=True)
+    second = RunProfiler('Segunda', trace_memory=True)
+    try:
+        with second.stage('lectura'):
+            pass
+        assert first.measures_memory and not second.measures_memory
+        assert second.stages['lectura'].peak_bytes is None
+        assert second.to_dict()['trace_memory'] is False
+    finally:
+        second.finish()
+        first.finish()
+    # Terminada la primera, la siguiente ejecución puede medir memoria
+    third = RunProfiler('Tercera', trace_memory=True)
+    third.finish()
+    assert third.measures_memory
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+# El segmentador trabaja con geometrías de QGIS: sin QGIS no se puede importar
+qgis_core = pytest.importorskip('qgis.core')
+
+from modules.segmentator import Segmentator  # noqa: E402
+
+
+def test_formatear_azimut():
+    segmentator = Segmentator()
+    assert segmentator.formatear_azimut(123.4567) == "123.5°"
+    assert segmentator.formatear_azimut(123.4567, 'dms') == "123°27'24\""
+    # 359°59'59.9" se redondea a 0° y no a 360° o 60"
+    assert segmentator.formatear_azimut(359.99999, 'dms') == "0°00'00\""
+
+
+def test_dms_labels_use_unrounded_azimuth():
+    segmentator = Segmentator()
+    # Lado de (0, 0) a (1, 3): azimut 18.4349488°
+    vertices = [qgis_core.QgsPointXY(0, 0), qgis_core.QgsPointXY(1, 3), qgis_core.QgsPointXY(3, 0)]
+    filas, _ = segmentator.calcular_anillo(vertices)
+    opciones = dict(Segmentator.OPCIONES_DEFECTO, etiquetas_materializadas=True, formato_azimut='dms')
+    atributos = segmentator.atributos_segmento(filas[0], 1, 1, opciones)
+    assert atributos[4] == 18.4
+    assert atributos[-1].endswith("18°26'06\"")
@@ -15,7 +15,7 @@ import os.path
 from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication, QObject
 from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtWidgets import QAction, QToolBar
-from qgis.core import QgsApplication, QgsMessageLog, Qgis, QgsVectorLayer
+from qgis.core import QgsApplication, QgsMessageLog, Qgis, QgsVectorLayer, QgsProject
 
 # Inicializar la traducción de QGIS
 class YF_Tools_Plus(QObject):
@@ -34,6 +34,7 @@ class YF_Tools_Plus(QObject):
         # Importar el exportador de Excel para la acción rápida
         from .modules.excel_exporter import ExcelExporter
         self.excel_exporter = ExcelExporter()
+        self.quick_export_task = None
 
         # Inicializar acciones
         self.actions = []
@@ -95,6 +96,14 @@ class YF_Tools_Plus(QObject):
     def initGui(self):
         """Crea los elementos de la interfaz de usuario."""
         
+        # Proveedor de capas virtuales de segmentos (necesario al reabrir proyectos)
+        from .modules.segment_provider import SegmentProvider
+        SegmentProvider.register()
+        
+        # GeoPackages temporales de capas grandes: se borran al cerrar el proyecto
+        from .modules.output_backend import OutputBackend
+        QgsProject.instance().cleared.connect(OutputBackend.remove_temp_dirs)
+        
         # Acción única para abrir el diálogo principal
         icon_path = os.path.join(self.plugin_dir, 'icon.png')
         self.action_main_dialog = self.add_action(
@@ -104,9 +113,22 @@ class YF_Tools_Plus(QObject):
             parent=self.iface.mainWindow(),
             status_tip=self.tr(u'Herramientas para Excel, Polígonos y Segmentación'),
             add_to_toolbar=True)
+        
+        # Exportación rápida de la capa activa en el formato elegido en el panel
+        self.action_quick_export = self.add_action(
+            os.path.join(self.plugin_dir, 'icon_export.png'),
+            text=self.tr(u'Exportar capa activa (un clic)'),
+            callback=self.quick_export,
+            parent=self.iface.mainWindow(),
+            status_tip=self.tr(u'Exporta la tabla de la capa activa y la abre'),
+            add_to_toolbar=True)
 
     def unload(self):
         """Elimina los elementos de la interfaz de usuario."""
+        self.dialog.stop_watch_service()
+        from .modules.output_backend import OutputBackend
+        QgsProject.instance().cleared.disconnect(OutputBackend.remove_temp_dirs)
+        OutputBackend.remove_temp_dirs()
         for action in self.actions:
             self.iface.removeToolBarIcon(action)
             self.iface.removePluginMenu(self.tr(u'&YF Tools Plus'), action)
@@ -115,4 +137,43 @@ class YF_Tools_Plus(QObject):
 
     def run(self):
         """Muestra el diálogo principal del plugin."""
-        self.dialog.show()
\ No newline at end of file
+        self.dialog.show()
+
+    def quick_export(self):
+        """Exporta la capa activa en segundo plano a la carpeta del usuario y abre el archivo."""
+        from .modules.excel_exporter import ExportTask
+        from .modules.table_writers import FORMATS
+
+        layer = self.iface.activeLayer()
+        if not isinstance(layer, QgsVectorLayer) or not layer.isValid():
+            self.iface.messageBar().pushMessage(
+                "YF Tools Plus", "Seleccione una capa vectorial en el panel de capas",
+                level=Qgis.Warning, duration=3
+            )
+            return
+        if self.quick_export_task is not None:
+            return
+
+        fmt = self.dialog.export_format()
+        output_file = os.path.join(
+            os.path.expanduser("~"), f"{layer.name().replace(' ', '_')}_atributos{FORMATS[fmt][1]}"
+        )
+        try:
+            self.quick_export_task = ExportTask(
+                self.excel_exporter, layer, output_file, fmt,
+                open_file=True, on_finished=self.quick_export_finished
+            )
+        except Exception as e:
+            QgsMessageLog.logMessage(f"Error en exportación rápida: {str(e)}", "YF Tools Plus", Qgis.Critical)
+            return
+        QgsApplication.taskManager().addTask(self.quick_export_task)
+
+    def quick_export_finished(self, output_file, error):
+        """Informa del resultado de la exportación rápida."""
+        self.quick_export_task = None
+        if error:
+            self.iface.messageBar().pushMessage("YF Tools Plus", error, level=Qgis.Critical, duration=5)
+        elif output_file:
+            self.iface.messageBar().pushMessage(
+                "YF Tools Plus", f"✓ Exportado a {output_file}", level=Qgis.Success, duration=3
+            )
\ No newline at end of file
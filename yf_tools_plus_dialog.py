@@ -13,20 +13,30 @@
 
 import os
 import json
+from datetime import datetime
 from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication, QSize
 from qgis.PyQt.QtWidgets import QDialog, QMessageBox, QFileDialog
 from qgis.PyQt import uic
 from qgis.core import (
     QgsMessageLog, Qgis, QgsProject, QgsMapLayerProxyModel, 
-    QgsVectorLayer, QgsCoordinateReferenceSystem
+    QgsVectorLayer, QgsCoordinateReferenceSystem, QgsApplication
 )
 from qgis.utils import iface
 
 # Importar las clases de módulos
-from .modules.excel_to_csv import ExcelToCsv
+from .modules.excel_to_csv import ExcelToCsv, ConvertSheetsTask
 from .modules.polygon_creator import PolygonCreator
 from .modules.segmentator import Segmentator
-from .modules.excel_exporter import ExcelExporter
+from .modules.parcel_qa import ParcelQA
+from .modules.layout_tables import LayoutTableBuilder
+from .modules.excel_exporter import ExcelExporter, ExportTask, LayersExportTask, PartitionedExportTask
+from .modules.table_writers import FORMATS
+from .modules.external_sort import parse_sort_spec
+from .modules.delivery_pipeline import DeliveryPipeline, PipelineTask
+from .modules.batch_runner import BatchTask
+from .modules.watch_service import WatchService
+from .modules.conversion_cache import ConversionCache
+from .modules.column_profiler import ColumnProfiler
 
 # Cargar el archivo .ui
 FORM_CLASS, _ = uic.loadUiType(os.path.join(
@@ -47,27 +57,86 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
         self.excel_to_csv = ExcelToCsv()
         self.polygon_creator = PolygonCreator()
         self.segmentator = Segmentator()
+        self.parcel_qa = ParcelQA()
+        self.layout_tables = LayoutTableBuilder()
         self.excel_exporter = ExcelExporter()
         
+        # Tareas en segundo plano (se conserva la referencia)
+        self.pipeline_task = None
+        self.export_task = None
+        self.convert_task = None
+        
+        # Servicio de vigilancia de la carpeta de entregas (se conserva mientras viva el diálogo)
+        self.watch_service = None
+        
+        # Resultados en columnas de las capas creadas en esta sesión (id de capa → ResultTable)
+        self.result_tables = {}
+        
         # Conectar señales
         self.pushButton_convert_csv.clicked.connect(self.run_excel_to_csv)
         self.pushButton_create_polygon.clicked.connect(self.run_create_polygon)
         self.pushButton_segment_polygon.clicked.connect(self.run_segmentator)
+        self.pushButton_parcel_qa.clicked.connect(self.run_parcel_qa)
         self.pushButton_export_excel.clicked.connect(self.run_export_excel)
+        self.pushButton_layout_tables.clicked.connect(self.run_layout_tables)
+        self.pushButton_run_pipeline.clicked.connect(self.run_pipeline)
+        self.pushButton_run_pipeline_batch.clicked.connect(self.run_pipeline_batch)
+        self.pushButton_watch_folder.toggled.connect(self.toggle_watch_service)
+        self.pushButton_clear_cache.clicked.connect(self.clear_conversion_cache)
         self.pushButton_save_config.clicked.connect(self.save_config)
         self.pushButton_refresh_layers.clicked.connect(self.refresh_layer_comboboxes)
         
         # Conectar cambio de archivo CSV para actualizar campos
         self.mFileWidget_csv_polygon.fileChanged.connect(self.update_csv_fields)
+        self.mFileWidget_excel_input.fileChanged.connect(self.update_excel_sheets)
+        self.mFileWidget_pipeline_input.fileChanged.connect(self.update_pipeline_fields)
+        
+        # El campo de partición se elige entre los de la capa a exportar
+        self.mLayerComboBox_export.layerChanged.connect(self.mFieldComboBox_export_partition.setLayer)
+        self.mLayerComboBox_export.layerChanged.connect(self.update_export_fields)
+        
+        # Formatos de exportación (todos comparten campos, filtro y segundo plano)
+        for fmt, (description, _, _) in FORMATS.items():
+            self.comboBox_export_format.addItem(description, fmt)
+        
+        # Con todas las hojas se usa el patrón en lugar de la hoja elegida
+        self.checkBox_all_sheets.toggled.connect(self.lineEdit_sheet_pattern.setEnabled)
+        self.checkBox_all_sheets.toggled.connect(lambda checked: self.comboBox_excel_sheet.setEnabled(not checked))
+        self.lineEdit_sheet_pattern.setEnabled(self.checkBox_all_sheets.isChecked())
+        
+        # El tamaño de la caché solo aplica con la caché activada
+        self.checkBox_conversion_cache.toggled.connect(self.spinBox_cache_size.setEnabled)
+        self.spinBox_cache_size.setEnabled(self.checkBox_conversion_cache.isChecked())
+        
+        # El formato de azimut solo aplica a etiquetas materializadas
+        self.checkBox_materialize_labels.toggled.connect(self.comboBox_azimuth_format.setEnabled)
+        self.comboBox_azimuth_format.setEnabled(self.checkBox_materialize_labels.isChecked())
+        
+        # La altura media solo aplica con corrección a terreno
+        self.checkBox_ground_correction.toggled.connect(self.doubleSpinBox_mean_height.setEnabled)
+        self.doubleSpinBox_mean_height.setEnabled(self.checkBox_ground_correction.isChecked())
+        self.checkBox_ground_correction_polygon.toggled.connect(self.doubleSpinBox_mean_height_polygon.setEnabled)
+        self.doubleSpinBox_mean_height_polygon.setEnabled(self.checkBox_ground_correction_polygon.isChecked())
+        
+        # Las tolerancias solo aplican con la limpieza activada
+        self.checkBox_simplify.toggled.connect(self.doubleSpinBox_distance_tolerance.setEnabled)
+        self.checkBox_simplify.toggled.connect(self.doubleSpinBox_angle_tolerance.setEnabled)
+        self.doubleSpinBox_distance_tolerance.setEnabled(self.checkBox_simplify.isChecked())
+        self.doubleSpinBox_angle_tolerance.setEnabled(self.checkBox_simplify.isChecked())
         
         # Configuración inicial de widgets
         try:
             # Configurar CRS selector
             self.mCrsSelector_polygon.setCrs(QgsProject.instance().crs())
+            self.mCrsSelector_pipeline.setCrs(QgsProject.instance().crs())
             
             # Configurar filtros de capas
             self.mLayerComboBox_polygon.setFilters(QgsMapLayerProxyModel.PolygonLayer)
             self.mLayerComboBox_export.setFilters(QgsMapLayerProxyModel.VectorLayer)
+            self.update_export_groups()
+            self.mFieldComboBox_export_partition.setAllowEmptyFieldName(True)
+            self.mFieldComboBox_export_partition.setLayer(self.mLayerComboBox_export.currentLayer())
+            self.update_export_fields(self.mLayerComboBox_export.currentLayer())
         except Exception as e:
             QgsMessageLog.logMessage(
                 f"Error al configurar widgets: {str(e)}", 
@@ -121,37 +190,11 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
             self.comboBox_x_field.addItems(fields)
             self.comboBox_y_field.addItems(fields)
             
-            # Intentar restaurar valores anteriores o detectar automáticamente
-            x_set = False
-            y_set = False
-            
-            # Primero intentar restaurar valores anteriores
-            if current_x:
-                index = self.comboBox_x_field.findText(current_x)
-                if index >= 0:
-                    self.comboBox_x_field.setCurrentIndex(index)
-                    x_set = True
-            
-            if current_y:
-                index = self.comboBox_y_field.findText(current_y)
-                if index >= 0:
-                    self.comboBox_y_field.setCurrentIndex(index)
-                    y_set = True
-            
-            # Si no se restauraron, intentar detección automática
-            if not x_set:
-                for i, field in enumerate(fields):
-                    field_upper = field.upper()
-                    if any(keyword in field_upper for keyword in ['X', 'ESTE', 'EAST', 'LON', 'EASTING', 'E']):
-                        self.comboBox_x_field.setCurrentIndex(i)
-                        break
-            
-            if not y_set:
-                for i, field in enumerate(fields):
-                    field_upper = field.upper()
-                    if any(keyword in field_upper for keyword in ['Y', 'NORTE', 'NORTH', 'LAT', 'NORTHING', 'N']):
-                        self.comboBox_y_field.setCurrentIndex(i)
-                        break
+            # Columnas propuestas por el contenido de las primeras filas;
+            # si no hay propuesta se restauran los valores anteriores
+            self.apply_coordinate_fields(
+                filepath, self.comboBox_x_field, self.comboBox_y_field, current_x, current_y
+            )
             
             QgsMessageLog.logMessage(
                 f"✓ Campos detectados: {', '.join(fields)}", 
@@ -166,6 +209,62 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
                 Qgis.Warning
             )
 
+    def apply_coordinate_fields(self, filepath, combo_x, combo_y, current_x="", current_y=""):
+        """
+        Selecciona en los ComboBox las columnas X/Y detectadas con una muestra
+        acotada del archivo (nunca se lee el archivo completo)
+        
+        :param filepath: Ruta del CSV o libro Excel
+        :type filepath: str
+        """
+        suggestion = {'x': None, 'y': None, 'kind': None}
+        try:
+            suggestion = ColumnProfiler().detect(filepath)
+        except Exception as e:
+            QgsMessageLog.logMessage(
+                f"No se pudieron analizar las columnas: {str(e)}", 
+                "YF Tools Plus", 
+                Qgis.Warning
+            )
+        
+        for combo, detected, previous in ((combo_x, suggestion['x'], current_x), (combo_y, suggestion['y'], current_y)):
+            for name in (detected, previous):
+                index = combo.findText(name) if name else -1
+                if index >= 0:
+                    combo.setCurrentIndex(index)
+                    break
+        
+        if suggestion['x'] and suggestion['y']:
+            kind = "UTM" if suggestion['kind'] == 'utm' else "geográficas"
+            QgsMessageLog.logMessage(
+                f"Coordenadas {kind} detectadas: X='{suggestion['x']}', Y='{suggestion['y']}'", 
+                "YF Tools Plus", 
+                Qgis.Info
+            )
+
+    def update_pipeline_fields(self, filepath):
+        """Rellena los campos X/Y de la pestaña Flujo Completo a partir del archivo de entrega."""
+        if not filepath or not os.path.exists(filepath):
+            return
+        try:
+            fields = [str(s['name']) for s in ColumnProfiler().detect(filepath)['columns']]
+        except Exception as e:
+            QgsMessageLog.logMessage(
+                f"No se pudieron leer los campos de la entrega: {str(e)}", 
+                "YF Tools Plus", 
+                Qgis.Warning
+            )
+            return
+        current_x = self.comboBox_pipeline_x_field.currentText()
+        current_y = self.comboBox_pipeline_y_field.currentText()
+        self.comboBox_pipeline_x_field.clear()
+        self.comboBox_pipeline_y_field.clear()
+        self.comboBox_pipeline_x_field.addItems(fields)
+        self.comboBox_pipeline_y_field.addItems(fields)
+        self.apply_coordinate_fields(
+            filepath, self.comboBox_pipeline_x_field, self.comboBox_pipeline_y_field, current_x, current_y
+        )
+
     def refresh_layer_comboboxes(self):
         """Fuerza la actualización de los QgsMapLayerComboBox."""
         try:
@@ -173,6 +272,7 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
             self.mLayerComboBox_polygon.setCurrentIndex(0)
             self.mLayerComboBox_export.setLayer(None)
             self.mLayerComboBox_export.setCurrentIndex(0)
+            self.update_export_groups()
             
             self.iface.messageBar().pushMessage(
                 "YF Tools Plus",
@@ -187,6 +287,116 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
                 Qgis.Warning
             )
 
+    def update_excel_sheets(self, filepath):
+        """Lista las hojas del libro seleccionado (sin leer sus datos)."""
+        self.comboBox_excel_sheet.clear()
+        if not filepath or not os.path.exists(filepath):
+            return
+        try:
+            import pandas as pd
+            with pd.ExcelFile(filepath) as workbook:
+                self.comboBox_excel_sheet.addItems([str(name) for name in workbook.sheet_names])
+        except Exception as e:
+            QgsMessageLog.logMessage(
+                f"No se pudieron leer las hojas del libro: {str(e)}", 
+                "YF Tools Plus", 
+                Qgis.Warning
+            )
+
+    def conversion_cache(self):
+        """Caché de conversiones según las opciones de la pestaña Excel a CSV (o None)."""
+        if not self.checkBox_conversion_cache.isChecked():
+            return None
+        return ConversionCache(max_bytes=self.spinBox_cache_size.value() * 1024 * 1024)
+
+    def clear_conversion_cache(self):
+        """Vacía la caché de conversiones."""
+        ConversionCache().clear()
+        self.iface.messageBar().pushMessage(
+            "YF Tools Plus",
+            "✓ Caché de conversiones vaciada",
+            level=Qgis.Success,
+            duration=2
+        )
+
+    def prepare_profiling(self, tool):
+        """Aplica la opción de medición de memoria a la herramienta antes de ejecutarla."""
+        tool.trace_memory = self.checkBox_profile_memory.isChecked()
+
+    def report_profile(self, tool):
+        """
+        Registra los tiempos por etapa de la última ejecución de la herramienta
+        y, si se pidió, los guarda en JSON.
+        
+        :returns: Informe de tiempos para añadir al mensaje de resultado
+        :rtype: str
+        """
+        return self.log_profile(tool.last_profile, type(tool).__name__.lower())
+
+    def log_profile(self, profile, name):
+        """
+        Registra un informe de tiempos y, si se pidió, lo guarda como
+        <name>_<fecha>.json.
+        
+        :rtype: str
+        """
+        if profile is None:
+            return ""
+        
+        report = profile.report()
+        QgsMessageLog.logMessage(report, "YF Tools Plus", Qgis.Info)
+        
+        if self.checkBox_profile_json.isChecked():
+            try:
+                output_dir = os.path.join(os.path.expanduser("~"), "yf_tools_plus_perfiles")
+                os.makedirs(output_dir, exist_ok=True)
+                stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                path = os.path.join(output_dir, f"{name}_{stamp}.json")
+                profile.write_json(path)
+                report += f"\n\nPerfil guardado en:\n{path}"
+            except Exception as e:
+                QgsMessageLog.logMessage(
+                    f"No se pudo guardar el perfil: {str(e)}", 
+                    "YF Tools Plus", 
+                    Qgis.Warning
+                )
+        return report
+
+    def polygon_style_params(self):
+        """Parámetros de estilo de la pestaña Crear Polígono."""
+        return dict(
+            PolygonCreator.DEFAULT_STYLE,
+            materialize_labels=self.checkBox_materialize_labels_polygon.isChecked()
+        )
+
+    def polygon_options(self):
+        """Opciones de medición de la pestaña Crear Polígono."""
+        return {
+            'measure_mode': 'ellipsoidal' if self.comboBox_measure_mode_polygon.currentIndex() == 1 else 'planar',
+            'ground_correction': self.checkBox_ground_correction_polygon.isChecked(),
+            'mean_height': self.doubleSpinBox_mean_height_polygon.value(),
+            'memory_threshold_mb': self.spinBox_memory_threshold.value(),
+            'vertex_order': ('auto', 'always', 'never')[self.comboBox_vertex_order.currentIndex()]
+        }
+
+    def segment_options(self):
+        """Opciones de la pestaña Segmentador."""
+        return {
+            'etiquetas_materializadas': self.checkBox_materialize_labels.isChecked(),
+            'formato_azimut': 'dms' if self.comboBox_azimuth_format.currentIndex() == 1 else 'decimal',
+            'perfil_renderizado': self.checkBox_render_profile.isChecked(),
+            'modo_medicion': 'elipsoidal' if self.comboBox_measure_mode.currentIndex() == 1 else 'planar',
+            'correccion_terreno': self.checkBox_ground_correction.isChecked(),
+            'altura_media': self.doubleSpinBox_mean_height.value(),
+            'capas_virtuales': self.checkBox_virtual_layers.isChecked(),
+            'simplificar': self.checkBox_simplify.isChecked(),
+            'tolerancia_distancia': self.doubleSpinBox_distance_tolerance.value(),
+            'tolerancia_angulo': self.doubleSpinBox_angle_tolerance.value(),
+            'umbral_memoria_mb': self.spinBox_memory_threshold.value(),
+            'segmentos_por_parcela': self.checkBox_segments_per_parcel.isChecked(),
+            'poblado_progresivo': self.checkBox_progressive_layers.isChecked()
+        }
+
     def run_excel_to_csv(self):
         """Ejecuta la conversión de Excel a CSV."""
         try:
@@ -207,13 +417,22 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
                 Qgis.Info
             )
             
-            result = self.excel_to_csv.convert(input_file, output_file)
+            sheet_name = self.comboBox_excel_sheet.currentText().strip() or 0
+            self.excel_to_csv.cache = self.conversion_cache()
+            self.prepare_profiling(self.excel_to_csv)
+            
+            if self.checkBox_all_sheets.isChecked():
+                self.start_convert_sheets(input_file, output_file)
+                return
+            
+            result = self.excel_to_csv.convert(input_file, output_file, sheet_name=sheet_name)
+            report = self.report_profile(self.excel_to_csv)
             
             if result:
                 QMessageBox.information(
                     self, 
                     "Éxito", 
-                    f"✓ Archivo convertido exitosamente a:\n{output_file}"
+                    f"✓ Archivo convertido exitosamente a:\n{output_file}\n\n{report}"
                 )
             else:
                 QMessageBox.warning(
@@ -234,6 +453,41 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
                 Qgis.Critical
             )
 
+    def start_convert_sheets(self, input_file, output_file):
+        """Convierte en segundo plano todas las hojas del libro (o las del patrón)."""
+        if self.convert_task is not None:
+            QMessageBox.warning(self, "Advertencia", "Ya hay una conversión de hojas en curso.")
+            return
+        
+        pattern = self.lineEdit_sheet_pattern.text().strip() or None
+        # Conversor propio: la pestaña puede seguir convirtiendo hojas sueltas mientras tanto
+        converter = ExcelToCsv()
+        converter.cache = self.excel_to_csv.cache
+        self.prepare_profiling(converter)
+        self.convert_task = ConvertSheetsTask(
+            converter, input_file, output_file, pattern, on_finished=self.convert_sheets_finished
+        )
+        QgsApplication.taskManager().addTask(self.convert_task)
+        self.iface.messageBar().pushMessage(
+            "YF Tools Plus",
+            f"Convirtiendo hojas de {os.path.basename(input_file)} en segundo plano...",
+            level=Qgis.Info,
+            duration=3
+        )
+
+    def convert_sheets_finished(self, outputs, error):
+        """Muestra el resultado de la conversión de hojas en segundo plano."""
+        task, self.convert_task = self.convert_task, None
+        if error:
+            QMessageBox.critical(self, "Error", f"Error al convertir archivo:\n{error}")
+            return
+        report = self.report_profile(task.converter)
+        QMessageBox.information(
+            self, 
+            "Éxito", 
+            f"✓ {len(outputs)} hoja(s) convertida(s) en:\n{os.path.dirname(os.path.abspath(task.csv_path))}\n\n{report}"
+        )
+
     def run_create_polygon(self):
         """Ejecuta la creación de polígonos desde CSV."""
         try:
@@ -264,29 +518,24 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
                 Qgis.Info
             )
             
-            # Crear parámetros de estilo por defecto
-            style_params = {
-                'polygon_color': '#ffffff',
-                'border_color': '#ff340b',
-                'border_width': '0.26',
-                'label_font': 'Arial',
-                'label_size': '9',
-                'label_color': '#ff340b'
-            }
-            
+            self.prepare_profiling(self.polygon_creator)
             result = self.polygon_creator.create_polygon(
                 csv_file, 
                 x_field, 
                 y_field, 
                 crs.authid(), 
-                style_params
+                self.polygon_style_params(),
+                self.polygon_options()
             )
             
+            report = self.report_profile(self.polygon_creator)
+            
             if result:
+                self.remember_results(self.polygon_creator.last_results)
                 QMessageBox.information(
                     self, 
                     "Éxito", 
-                    "✓ Polígono creado exitosamente"
+                    f"✓ Polígono creado exitosamente\n{self.polygon_creator.last_backend.describe()}\n\n{report}"
                 )
                 self.refresh_layer_comboboxes()
             else:
@@ -324,13 +573,24 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
                 Qgis.Info
             )
             
-            result = self.segmentator.segment_polygon(layer)
+            self.prepare_profiling(self.segmentator)
+            # Con resultados parciales se atienden eventos durante el proceso:
+            # el diálogo entero queda inactivo para no lanzar otra herramienta a la vez
+            self.setEnabled(False)
+            try:
+                result = self.segmentator.segment_polygon(layer, self.segment_options())
+            finally:
+                self.setEnabled(True)
+            report = self.report_profile(self.segmentator)
             
             if result:
+                self.remember_results(self.segmentator.last_results)
+                if self.segmentator.last_backend is not None and not self.checkBox_virtual_layers.isChecked():
+                    report = f"{self.segmentator.last_backend.describe()}\n\n{report}"
                 QMessageBox.information(
                     self, 
                     "Éxito", 
-                    "✓ Polígono segmentado exitosamente\n\nCapas creadas:\n• Segmentos\n• Vertices"
+                    f"✓ Polígono segmentado exitosamente\n\nCapas creadas:\n• Segmentos\n• Vertices\n\n{report}"
                 )
             else:
                 QMessageBox.warning(
@@ -351,6 +611,256 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
                 Qgis.Critical
             )
 
+    def run_parcel_qa(self):
+        """Revisa solapes y huecos entre las parcelas de la capa de polígonos."""
+        try:
+            layer = self.mLayerComboBox_polygon.currentLayer()
+            
+            if not layer or not layer.isValid():
+                QMessageBox.warning(
+                    self, 
+                    "Advertencia", 
+                    "Debe seleccionar una capa de polígono válida."
+                )
+                return
+            
+            self.prepare_profiling(self.parcel_qa)
+            errors, overlaps, gaps = self.parcel_qa.check(
+                layer, {'max_gap_area': self.doubleSpinBox_qa_max_gap_area.value()}
+            )
+            report = self.report_profile(self.parcel_qa)
+            
+            if not overlaps and not gaps:
+                QMessageBox.information(
+                    self, 
+                    "Éxito", 
+                    f"✓ Sin solapes ni huecos entre parcelas\n\n{report}"
+                )
+                return
+            
+            QgsProject.instance().addMapLayer(errors)
+            QMessageBox.warning(
+                self, 
+                "Revisión de parcelas", 
+                f"Se encontraron {overlaps} solape(s) y {gaps} hueco(s).\n"
+                f"Capa creada: {errors.name()}\n\n{report}"
+            )
+                
+        except Exception as e:
+            QMessageBox.critical(
+                self, 
+                "Error", 
+                f"Error al revisar las parcelas:\n{str(e)}"
+            )
+            QgsMessageLog.logMessage(
+                f"Error en ParcelQA: {str(e)}", 
+                "YF Tools Plus", 
+                Qgis.Critical
+            )
+
+    def update_export_groups(self, current=None):
+        """
+        Rellena la lista de grupos del proyecto para la exportación de varias capas
+        
+        :param current: Grupo a seleccionar (por defecto, el seleccionado actualmente)
+        :type current: str
+        """
+        if current is None:
+            current = self.comboBox_export_group.currentText()
+        self.comboBox_export_group.clear()
+        self.comboBox_export_group.addItem("(solo la capa seleccionada)")
+        root = QgsProject.instance().layerTreeRoot()
+        self.comboBox_export_group.addItems([group.name() for group in root.findGroups(True)])
+        index = self.comboBox_export_group.findText(current)
+        self.comboBox_export_group.setCurrentIndex(max(index, 0))
+
+    def remember_results(self, results):
+        """
+        Guarda los resultados en columnas de las capas recién creadas para que
+        su exportación escriba los arreglos directamente. Se descartan si la
+        capa se edita o se elimina.
+        
+        :param results: Resultados por nombre (ver Segmentator.last_results)
+        :type results: dict
+        """
+        for table in (results or {}).values():
+            layer = QgsProject.instance().mapLayer(table.layer_id)
+            if layer is None:
+                continue
+            self.result_tables[layer.id()] = table
+            forget = lambda layer_id=layer.id(): self.result_tables.pop(layer_id, None)
+            layer.dataChanged.connect(forget)
+            layer.willBeDeleted.connect(forget)
+
+    def result_for(self, layer):
+        """Resultado en columnas con el contenido exacto de la capa, o None."""
+        table = self.result_tables.get(layer.id())
+        if table is None or layer.isEditable() or layer.subsetString() or len(table) != layer.featureCount():
+            return None
+        return table
+
+    def update_export_fields(self, layer):
+        """Rellena la lista de campos a exportar y el filtro con los de la capa seleccionada."""
+        self.mFieldsComboBox_export.clear()
+        self.mExpressionLineEdit_export_filter.setLayer(layer)
+        if isinstance(layer, QgsVectorLayer):
+            self.mFieldsComboBox_export.addItems(layer.fields().names())
+
+    def export_format(self):
+        """Clave del formato de exportación seleccionado (ver FORMATS)."""
+        return self.comboBox_export_format.currentData() or 'xlsx'
+
+    def export_selection(self):
+        """
+        Campos, filtro y selección elegidos en la pestaña de exportación
+        
+        :returns: (campos o None = todos, expresión o None, solo seleccionadas)
+        :rtype: tuple
+        """
+        fields = self.mFieldsComboBox_export.checkedItems() or None
+        expression = self.mExpressionLineEdit_export_filter.expression().strip() or None
+        return fields, expression, self.checkBox_export_selected.isChecked()
+
+    def export_order(self):
+        """Orden de filas de la pestaña de exportación, lista de (campo, ascendente) o None."""
+        return parse_sort_spec(self.lineEdit_export_order.text()) or None
+
+    def start_export(self, layer, output_path, open_file):
+        """Exporta una capa en segundo plano en el formato seleccionado."""
+        if self.export_task is not None:
+            QMessageBox.warning(self, "Advertencia", "Ya hay una exportación en curso.")
+            return
+        
+        fmt = self.export_format()
+        fields, expression, selected_only = self.export_selection()
+        order_by = self.export_order()
+        if not output_path:
+            output_path = os.path.join(
+                os.path.expanduser("~"), f"{layer.name().replace(' ', '_')}_atributos{FORMATS[fmt][1]}"
+            )
+        
+        QgsMessageLog.logMessage(
+            f"Exportando capa: {layer.name()} ({FORMATS[fmt][0]})",
+            "YF Tools Plus",
+            Qgis.Info
+        )
+        
+        # Capa recién creada por el plugin: se escriben sus columnas sin recorrer la capa
+        result = None if expression or selected_only or order_by else self.result_for(layer)
+        
+        self.prepare_profiling(self.excel_exporter)
+        self.export_task = ExportTask(
+            self.excel_exporter, layer, output_path, fmt, fields, expression,
+            selected_only, open_file, self.export_finished, result, order_by
+        )
+        QgsApplication.taskManager().addTask(self.export_task)
+        self.iface.messageBar().pushMessage(
+            "YF Tools Plus",
+            f"Exportando {layer.name()} en segundo plano...",
+            level=Qgis.Info,
+            duration=3
+        )
+
+    def export_finished(self, output_path, error):
+        """Muestra el resultado de la exportación en segundo plano."""
+        task, self.export_task = self.export_task, None
+        open_file = task.open_file
+        if error:
+            QMessageBox.critical(self, "Error", f"Error al exportar:\n{error}")
+            return
+        if not output_path:
+            self.iface.messageBar().pushMessage(
+                "YF Tools Plus", "Exportación cancelada", level=Qgis.Warning, duration=3
+            )
+            return
+        
+        if isinstance(task, PartitionedExportTask):
+            msg = f"✓ Exportación completada: {len(task.paths)} archivo(s) en\n{output_path}"
+            if open_file:
+                msg += "\n\n(Carpeta abierta automáticamente)"
+        else:
+            msg = f"✓ Exportación completada:\n{output_path}"
+            if open_file:
+                msg += "\n\n(Archivo abierto automáticamente)"
+        msg += f"\n\n{self.report_profile(self.excel_exporter)}"
+        QMessageBox.information(self, "Éxito", msg)
+
+    def run_export_group(self, group_name, output_path, open_file):
+        """Exporta en segundo plano todas las capas de un grupo a un libro, una hoja por capa."""
+        if self.export_task is not None:
+            QMessageBox.warning(self, "Advertencia", "Ya hay una exportación en curso.")
+            return
+        
+        if self.export_format() != 'xlsx':
+            QgsMessageLog.logMessage(
+                "La exportación de un grupo genera un libro XLSX con una hoja por capa",
+                "YF Tools Plus",
+                Qgis.Info
+            )
+        layers = self.excel_exporter.group_layers(group_name)
+        if not layers:
+            QMessageBox.warning(
+                self,
+                "Advertencia",
+                f"El grupo '{group_name}' no contiene capas vectoriales."
+            )
+            return
+        
+        if not output_path:
+            output_path = os.path.join(os.path.expanduser("~"), f"{group_name.replace(' ', '_')}_atributos.xlsx")
+        
+        QgsMessageLog.logMessage(
+            f"Exportando {len(layers)} capa(s) del grupo: {group_name}",
+            "YF Tools Plus",
+            Qgis.Info
+        )
+        
+        self.prepare_profiling(self.excel_exporter)
+        fields, expression, selected_only = self.export_selection()
+        self.export_task = LayersExportTask(
+            self.excel_exporter, layers, output_path, None, fields, expression,
+            selected_only, self.export_order(), open_file, self.export_finished
+        )
+        QgsApplication.taskManager().addTask(self.export_task)
+        self.iface.messageBar().pushMessage(
+            "YF Tools Plus",
+            f"Exportando el grupo {group_name} en segundo plano...",
+            level=Qgis.Info,
+            duration=3
+        )
+
+    def run_export_partitioned(self, layer, field_name, output_path, open_folder):
+        """Exporta en segundo plano un archivo por cada valor de un campo de la capa."""
+        if self.export_task is not None:
+            QMessageBox.warning(self, "Advertencia", "Ya hay una exportación en curso.")
+            return
+        
+        fmt = self.export_format()
+        fields, expression, selected_only = self.export_selection()
+        if not output_path:
+            output_path = os.path.join(
+                os.path.expanduser("~"), f"{layer.name().replace(' ', '_')}_atributos{FORMATS[fmt][1]}"
+            )
+        
+        QgsMessageLog.logMessage(
+            f"Exportando capa {layer.name()} por valores de '{field_name}'",
+            "YF Tools Plus",
+            Qgis.Info
+        )
+        
+        self.prepare_profiling(self.excel_exporter)
+        self.export_task = PartitionedExportTask(
+            self.excel_exporter, layer, field_name, output_path, fmt, fields, expression,
+            selected_only, self.export_order(), open_folder, self.export_finished
+        )
+        QgsApplication.taskManager().addTask(self.export_task)
+        self.iface.messageBar().pushMessage(
+            "YF Tools Plus",
+            f"Exportando {layer.name()} por valores de '{field_name}' en segundo plano...",
+            level=Qgis.Info,
+            duration=3
+        )
+
     def run_export_excel(self):
         """Ejecuta la exportación a Excel desde el diálogo."""
         try:
@@ -358,6 +868,15 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
             output_path = self.mFileWidget_excel_output.filePath()
             open_file = self.checkBox_auto_open.isChecked()
             
+            if self.comboBox_export_group.currentIndex() > 0:
+                self.run_export_group(self.comboBox_export_group.currentText(), output_path, open_file)
+                return
+            
+            partition_field = self.mFieldComboBox_export_partition.currentField()
+            if partition_field and layer and layer.isValid():
+                self.run_export_partitioned(layer, partition_field, output_path, open_file)
+                return
+            
             if not layer or not layer.isValid():
                 QMessageBox.warning(
                     self, 
@@ -366,37 +885,244 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
                 )
                 return
             
-            if not output_path:
-                layer_name = layer.name().replace(" ", "_")
-                output_dir = os.path.expanduser("~")
-                output_path = os.path.join(output_dir, f"{layer_name}_atributos.xlsx")
+            self.start_export(layer, output_path, open_file)
             
+        except Exception as e:
+            QMessageBox.critical(
+                self, 
+                "Error", 
+                f"Error al exportar a Excel:\n{str(e)}"
+            )
             QgsMessageLog.logMessage(
-                f"Exportando capa: {layer.name()}", 
+                f"Error en ExcelExporter: {str(e)}", 
                 "YF Tools Plus", 
-                Qgis.Info
+                Qgis.Critical
             )
+
+    def run_layout_tables(self):
+        """Crea el atlas con las tablas de vértices paginadas de la capa seleccionada."""
+        try:
+            layer = self.mLayerComboBox_export.currentLayer()
             
-            self.excel_exporter.export_to_excel(layer, output_path, open_file)
+            if not layer or not layer.isValid():
+                QMessageBox.warning(
+                    self, 
+                    "Advertencia", 
+                    "Debe seleccionar la capa de vértices creada por el segmentador."
+                )
+                return
             
-            msg = f"✓ Exportación completada:\n{output_path}"
-            if open_file:
-                msg += "\n\n(Archivo abierto automáticamente)"
+            self.prepare_profiling(self.layout_tables)
+            layout, parcels, sheets = self.layout_tables.build(layer, self.spinBox_layout_rows.value())
+            report = self.report_profile(self.layout_tables)
             
-            QMessageBox.information(self, "Éxito", msg)
+            QMessageBox.information(
+                self, 
+                "Éxito", 
+                f"✓ Composición '{layout.name()}' creada\n\n"
+                f"{parcels} parcela(s) en {sheets} lámina(s)\n"
+                f"Ábrala desde Proyecto > Composiciones para ver o exportar el atlas.\n\n{report}"
+            )
             
         except Exception as e:
             QMessageBox.critical(
                 self, 
                 "Error", 
-                f"Error al exportar a Excel:\n{str(e)}"
+                f"Error al crear las tablas para el atlas:\n{str(e)}"
             )
             QgsMessageLog.logMessage(
-                f"Error en ExcelExporter: {str(e)}", 
+                f"Error en LayoutTableBuilder: {str(e)}", 
                 "YF Tools Plus", 
                 Qgis.Critical
             )
 
+    def pipeline_options(self):
+        """Opciones del flujo completo a partir de todas las pestañas."""
+        return {
+            'field_x': self.comboBox_pipeline_x_field.currentText().strip(),
+            'field_y': self.comboBox_pipeline_y_field.currentText().strip(),
+            'crs': self.mCrsSelector_pipeline.crs().authid(),
+            'output_dir': self.mFileWidget_pipeline_output.filePath() or None,
+            'keep_csv': self.checkBox_pipeline_keep_csv.isChecked(),
+            'cache': self.conversion_cache(),
+            'style_params': self.polygon_style_params(),
+            'polygon_options': self.polygon_options(),
+            'segment_options': self.segment_options()
+        }
+
+    def start_pipeline(self, inputs, folder=None):
+        """
+        Lanza el flujo completo en segundo plano: un archivo con PipelineTask
+        o una carpeta con BatchTask (hilos de trabajo y manifiesto).
+        """
+        if self.pipeline_task is not None:
+            QMessageBox.warning(
+                self, 
+                "Advertencia", 
+                "Ya hay un flujo completo en ejecución."
+            )
+            return
+        
+        options = self.pipeline_options()
+        if not options['field_x'] or not options['field_y']:
+            QMessageBox.warning(
+                self, 
+                "Advertencia", 
+                "Debe especificar los campos X e Y."
+            )
+            return
+        
+        if folder is None:
+            self.pipeline_task = PipelineTask(
+                inputs,
+                options,
+                add_layers=self.checkBox_pipeline_add_layers.isChecked(),
+                on_finished=lambda results, canceled: self.pipeline_finished(results, [], canceled)
+            )
+            self.pipeline_task.pipeline.trace_memory = self.checkBox_profile_memory.isChecked()
+        else:
+            self.pipeline_task = BatchTask(
+                inputs,
+                options,
+                workers=self.spinBox_pipeline_workers.value(),
+                combined=self.comboBox_pipeline_output_mode.currentIndex() == 1,
+                resume=self.checkBox_pipeline_resume.isChecked(),
+                manifest_dir=options['output_dir'] or folder,
+                add_layers=self.checkBox_pipeline_add_layers.isChecked(),
+                on_finished=self.pipeline_finished
+            )
+            self.pipeline_task.trace_memory = self.checkBox_profile_memory.isChecked()
+        QgsApplication.taskManager().addTask(self.pipeline_task)
+        
+        self.iface.messageBar().pushMessage(
+            "YF Tools Plus",
+            f"Flujo completo iniciado en segundo plano ({len(inputs)} archivo(s))",
+            level=Qgis.Info,
+            duration=3
+        )
+
+    def pipeline_finished(self, results, skipped, canceled):
+        """Resume el resultado del flujo completo (se llama en el hilo principal)."""
+        self.pipeline_task = None
+        ok = [r for r in results if r['ok']]
+        failed = [r for r in results if not r['ok']]
+        
+        for item in results:
+            stem = os.path.splitext(os.path.basename(item['input']))[0]
+            self.log_profile(item['profile'], f"flujo_{stem}")
+            if item['ok']:
+                QgsMessageLog.logMessage(f"✓ {item['output']}", "YF Tools Plus", Qgis.Success)
+            else:
+                QgsMessageLog.logMessage(f"✗ {item['input']}: {item['error']}", "YF Tools Plus", Qgis.Warning)
+        
+        msg = f"Flujo completo: {len(ok)} entrega(s) procesada(s)"
+        if skipped:
+            msg += f", {len(skipped)} ya terminada(s) según el manifiesto"
+        if failed:
+            msg += f", {len(failed)} con errores (ver registro de mensajes)"
+        if canceled:
+            msg += " (cancelado)"
+        self.iface.messageBar().pushMessage(
+            "YF Tools Plus",
+            msg,
+            level=Qgis.Warning if failed or canceled else Qgis.Success,
+            duration=5
+        )
+        self.refresh_layer_comboboxes()
+
+    def run_pipeline(self):
+        """Ejecuta el flujo completo sobre un archivo."""
+        input_file = self.mFileWidget_pipeline_input.filePath()
+        if not input_file or not os.path.exists(input_file):
+            QMessageBox.warning(
+                self, 
+                "Advertencia", 
+                "Debe seleccionar un archivo de entrega."
+            )
+            return
+        self.start_pipeline([input_file])
+
+    def run_pipeline_batch(self):
+        """Ejecuta el flujo completo sobre todas las entregas de una carpeta."""
+        folder = self.mFileWidget_pipeline_folder.filePath()
+        if not folder or not os.path.isdir(folder):
+            QMessageBox.warning(
+                self, 
+                "Advertencia", 
+                "Debe seleccionar una carpeta de entregas."
+            )
+            return
+        
+        inputs = DeliveryPipeline.list_inputs(folder, self.lineEdit_pipeline_pattern.text())
+        if not inputs:
+            QMessageBox.warning(
+                self, 
+                "Advertencia", 
+                "La carpeta no contiene archivos que coincidan con el patrón."
+            )
+            return
+        self.start_pipeline(inputs, folder)
+
+    def toggle_watch_service(self, checked):
+        """Inicia o detiene la vigilancia de la carpeta de entregas."""
+        if not checked:
+            self.stop_watch_service()
+            return
+        
+        folder = self.mFileWidget_pipeline_folder.filePath()
+        options = self.pipeline_options()
+        if not folder or not os.path.isdir(folder) or not options['field_x'] or not options['field_y']:
+            QMessageBox.warning(
+                self, 
+                "Advertencia", 
+                "Debe seleccionar una carpeta de entregas y los campos X e Y."
+            )
+            self.pushButton_watch_folder.setChecked(False)
+            return
+        
+        self.watch_service = WatchService(
+            folder, options, self.lineEdit_pipeline_pattern.text(), self.spinBox_pipeline_workers.value(), self
+        )
+        self.watch_service.file_processed.connect(self.watch_file_processed)
+        try:
+            self.watch_service.start()
+        except Exception as e:
+            self.watch_service = None
+            self.pushButton_watch_folder.setChecked(False)
+            QMessageBox.critical(self, "Error", f"No se pudo iniciar la vigilancia:\n{str(e)}")
+            return
+        self.pushButton_watch_folder.setText("⏹ Detener Vigilancia")
+        self.iface.messageBar().pushMessage(
+            "YF Tools Plus",
+            f"Vigilando {folder}: las entregas se procesan al llegar",
+            level=Qgis.Info,
+            duration=5
+        )
+
+    def stop_watch_service(self):
+        """Detiene la vigilancia (los archivos en proceso terminan en segundo plano)."""
+        if self.watch_service is not None:
+            self.watch_service.stop()
+            self.watch_service = None
+        self.pushButton_watch_folder.blockSignals(True)
+        self.pushButton_watch_folder.setChecked(False)
+        self.pushButton_watch_folder.blockSignals(False)
+        self.pushButton_watch_folder.setText("👁 Vigilar Carpeta")
+
+    def watch_file_processed(self, result):
+        """Avisa en la barra de mensajes de cada entrega procesada por el servicio."""
+        if result.get('skipped'):
+            return
+        name = os.path.basename(result['input'])
+        if result['ok']:
+            self.iface.messageBar().pushMessage(
+                "YF Tools Plus", f"✓ {name} procesado", level=Qgis.Success, duration=3
+            )
+        else:
+            self.iface.messageBar().pushMessage(
+                "YF Tools Plus", f"✗ {name}: {result['error']}", level=Qgis.Critical, duration=8
+            )
+
     def save_config(self):
         """Guarda la configuración actual."""
         config = {
@@ -408,6 +1134,50 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
             "crs_authid": self.mCrsSelector_polygon.crs().authid(),
             "excel_output_path": self.mFileWidget_excel_output.filePath(),
             "auto_open": self.checkBox_auto_open.isChecked(),
+            "layout_rows_per_page": self.spinBox_layout_rows.value(),
+            "export_group": self.comboBox_export_group.currentText() if self.comboBox_export_group.currentIndex() > 0 else "",
+            "export_partition_field": self.mFieldComboBox_export_partition.currentField(),
+            "export_format": self.export_format(),
+            "export_selected": self.checkBox_export_selected.isChecked(),
+            "export_order": self.lineEdit_export_order.text(),
+            "materialize_labels_polygon": self.checkBox_materialize_labels_polygon.isChecked(),
+            "materialize_labels": self.checkBox_materialize_labels.isChecked(),
+            "azimuth_format": self.comboBox_azimuth_format.currentIndex(),
+            "render_profile": self.checkBox_render_profile.isChecked(),
+            "measure_mode_polygon": self.comboBox_measure_mode_polygon.currentIndex(),
+            "ground_correction_polygon": self.checkBox_ground_correction_polygon.isChecked(),
+            "mean_height_polygon": self.doubleSpinBox_mean_height_polygon.value(),
+            "measure_mode": self.comboBox_measure_mode.currentIndex(),
+            "ground_correction": self.checkBox_ground_correction.isChecked(),
+            "mean_height": self.doubleSpinBox_mean_height.value(),
+            "virtual_layers": self.checkBox_virtual_layers.isChecked(),
+            "simplify": self.checkBox_simplify.isChecked(),
+            "distance_tolerance": self.doubleSpinBox_distance_tolerance.value(),
+            "angle_tolerance": self.doubleSpinBox_angle_tolerance.value(),
+            "profile_memory": self.checkBox_profile_memory.isChecked(),
+            "profile_json": self.checkBox_profile_json.isChecked(),
+            "memory_threshold_mb": self.spinBox_memory_threshold.value(),
+            "vertex_order": self.comboBox_vertex_order.currentIndex(),
+            "qa_max_gap_area": self.doubleSpinBox_qa_max_gap_area.value(),
+            "segments_per_parcel": self.checkBox_segments_per_parcel.isChecked(),
+            "progressive_layers": self.checkBox_progressive_layers.isChecked(),
+            "excel_sheet": self.comboBox_excel_sheet.currentText(),
+            "conversion_cache": self.checkBox_conversion_cache.isChecked(),
+            "all_sheets": self.checkBox_all_sheets.isChecked(),
+            "sheet_pattern": self.lineEdit_sheet_pattern.text(),
+            "cache_size_mb": self.spinBox_cache_size.value(),
+            "pipeline_input_path": self.mFileWidget_pipeline_input.filePath(),
+            "pipeline_folder": self.mFileWidget_pipeline_folder.filePath(),
+            "pipeline_output_dir": self.mFileWidget_pipeline_output.filePath(),
+            "pipeline_x_field": self.comboBox_pipeline_x_field.currentText(),
+            "pipeline_y_field": self.comboBox_pipeline_y_field.currentText(),
+            "pipeline_crs_authid": self.mCrsSelector_pipeline.crs().authid(),
+            "pipeline_keep_csv": self.checkBox_pipeline_keep_csv.isChecked(),
+            "pipeline_add_layers": self.checkBox_pipeline_add_layers.isChecked(),
+            "pipeline_pattern": self.lineEdit_pipeline_pattern.text(),
+            "pipeline_workers": self.spinBox_pipeline_workers.value(),
+            "pipeline_output_mode": self.comboBox_pipeline_output_mode.currentIndex(),
+            "pipeline_resume": self.checkBox_pipeline_resume.isChecked(),
             "current_tab": self.tabWidget.currentIndex()
         }
         
@@ -438,6 +1208,7 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
                 config = json.load(f)
             
             self.mFileWidget_excel_input.setFilePath(config.get("excel_input_path", ""))
+            self.update_excel_sheets(config.get("excel_input_path", ""))
             self.mFileWidget_csv_output.setFilePath(config.get("csv_output_path", ""))
             
             csv_path = config.get("csv_polygon_path", "")
@@ -461,6 +1232,54 @@ class YF_Tools_PlusDialog(QDialog, FORM_CLASS):
             
             self.mFileWidget_excel_output.setFilePath(config.get("excel_output_path", ""))
             self.checkBox_auto_open.setChecked(config.get("auto_open", True))
+            self.spinBox_layout_rows.setValue(config.get("layout_rows_per_page", LayoutTableBuilder.ROWS_PER_PAGE))
+            self.update_export_groups(config.get("export_group", ""))
+            self.mFieldComboBox_export_partition.setField(config.get("export_partition_field", ""))
+            self.comboBox_export_format.setCurrentIndex(
+                max(self.comboBox_export_format.findData(config.get("export_format", "xlsx")), 0)
+            )
+            self.checkBox_export_selected.setChecked(config.get("export_selected", False))
+            self.lineEdit_export_order.setText(config.get("export_order", ""))
+            self.checkBox_materialize_labels_polygon.setChecked(config.get("materialize_labels_polygon", False))
+            self.checkBox_materialize_labels.setChecked(config.get("materialize_labels", False))
+            self.comboBox_azimuth_format.setCurrentIndex(config.get("azimuth_format", 0))
+            self.checkBox_render_profile.setChecked(config.get("render_profile", False))
+            self.comboBox_measure_mode_polygon.setCurrentIndex(config.get("measure_mode_polygon", 0))
+            self.checkBox_ground_correction_polygon.setChecked(config.get("ground_correction_polygon", False))
+            self.doubleSpinBox_mean_height_polygon.setValue(config.get("mean_height_polygon", 0.0))
+            self.comboBox_measure_mode.setCurrentIndex(config.get("measure_mode", 0))
+            self.checkBox_ground_correction.setChecked(config.get("ground_correction", False))
+            self.doubleSpinBox_mean_height.setValue(config.get("mean_height", 0.0))
+            self.checkBox_virtual_layers.setChecked(config.get("virtual_layers", False))
+            self.checkBox_simplify.setChecked(config.get("simplify", False))
+            self.doubleSpinBox_distance_tolerance.setValue(config.get("distance_tolerance", 0.01))
+            self.doubleSpinBox_angle_tolerance.setValue(config.get("angle_tolerance", 0.5))
+            self.checkBox_profile_memory.setChecked(config.get("profile_memory", False))
+            self.checkBox_profile_json.setChecked(config.get("profile_json", False))
+            self.spinBox_memory_threshold.setValue(config.get("memory_threshold_mb", 256))
+            self.comboBox_vertex_order.setCurrentIndex(config.get("vertex_order", 0))
+            self.doubleSpinBox_qa_max_gap_area.setValue(config.get("qa_max_gap_area", 0.0))
+            self.checkBox_segments_per_parcel.setChecked(config.get("segments_per_parcel", False))
+            self.checkBox_progressive_layers.setChecked(config.get("progressive_layers", True))
+            self.comboBox_excel_sheet.setEditText(config.get("excel_sheet", ""))
+            self.checkBox_conversion_cache.setChecked(config.get("conversion_cache", False))
+            self.checkBox_all_sheets.setChecked(config.get("all_sheets", False))
+            self.lineEdit_sheet_pattern.setText(config.get("sheet_pattern", ""))
+            self.spinBox_cache_size.setValue(config.get("cache_size_mb", 256))
+            self.mFileWidget_pipeline_input.setFilePath(config.get("pipeline_input_path", ""))
+            self.mFileWidget_pipeline_folder.setFilePath(config.get("pipeline_folder", ""))
+            self.mFileWidget_pipeline_output.setFilePath(config.get("pipeline_output_dir", ""))
+            self.comboBox_pipeline_x_field.setEditText(config.get("pipeline_x_field", "ESTE"))
+            self.comboBox_pipeline_y_field.setEditText(config.get("pipeline_y_field", "NORTE"))
+            pipeline_crs = QgsCoordinateReferenceSystem(config.get("pipeline_crs_authid", ""))
+            if pipeline_crs.isValid():
+                self.mCrsSelector_pipeline.setCrs(pipeline_crs)
+            self.checkBox_pipeline_keep_csv.setChecked(config.get("pipeline_keep_csv", False))
+            self.checkBox_pipeline_add_layers.setChecked(config.get("pipeline_add_layers", True))
+            self.lineEdit_pipeline_pattern.setText(config.get("pipeline_pattern", DeliveryPipeline.DEFAULT_PATTERN))
+            self.spinBox_pipeline_workers.setValue(config.get("pipeline_workers", 4))
+            self.comboBox_pipeline_output_mode.setCurrentIndex(config.get("pipeline_output_mode", 0))
+            self.checkBox_pipeline_resume.setChecked(config.get("pipeline_resume", True))
             self.tabWidget.setCurrentIndex(config.get("current_tab", 0))
             
         except Exception as e: